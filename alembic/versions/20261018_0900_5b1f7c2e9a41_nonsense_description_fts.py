@@ -0,0 +1,47 @@
+"""nonsense description fts
+
+Revision ID: 5b1f7c2e9a41
+Revises: d021bd4763a5
+Create Date: 2026-10-18 09:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = '5b1f7c2e9a41'
+down_revision = 'd021bd4763a5'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column(
+        'nonsense',
+        sa.Column(
+            'description_tsv',
+            postgresql.TSVECTOR(),
+            sa.Computed("to_tsvector('english', coalesce(description, ''))", persisted=True),
+            nullable=True,
+        ),
+        schema='happy_hog',
+    )
+    op.create_index(
+        'ix_nonsense_description_tsv',
+        'nonsense',
+        ['description_tsv'],
+        unique=False,
+        schema='happy_hog',
+        postgresql_using='gin',
+    )
+
+
+def downgrade():
+    op.drop_index(
+        'ix_nonsense_description_tsv',
+        table_name='nonsense',
+        schema='happy_hog',
+        postgresql_using='gin',
+    )
+    op.drop_column('nonsense', 'description_tsv', schema='happy_hog')
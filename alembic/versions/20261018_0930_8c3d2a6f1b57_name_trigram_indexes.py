@@ -0,0 +1,41 @@
+"""name trigram indexes
+
+Revision ID: 8c3d2a6f1b57
+Revises: 5b1f7c2e9a41
+Create Date: 2026-10-18 09:30:00.000000
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '8c3d2a6f1b57'
+down_revision = '5b1f7c2e9a41'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    op.create_index(
+        'ix_stuff_name_trgm',
+        'stuff',
+        ['name'],
+        unique=False,
+        schema='happy_hog',
+        postgresql_using='gin',
+        postgresql_ops={'name': 'gin_trgm_ops'},
+    )
+    op.create_index(
+        'ix_nonsense_name_trgm',
+        'nonsense',
+        ['name'],
+        unique=False,
+        schema='happy_hog',
+        postgresql_using='gin',
+        postgresql_ops={'name': 'gin_trgm_ops'},
+    )
+
+
+def downgrade():
+    op.drop_index('ix_nonsense_name_trgm', table_name='nonsense', schema='happy_hog')
+    op.drop_index('ix_stuff_name_trgm', table_name='stuff', schema='happy_hog')
@@ -0,0 +1,66 @@
+"""import ledger
+
+Revision ID: 2e7a9d4c6f13
+Revises: 8c3d2a6f1b57
+Create Date: 2026-10-18 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = '2e7a9d4c6f13'
+down_revision = '8c3d2a6f1b57'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'import_ledger',
+        sa.Column('id', sa.UUID(), server_default=sa.text('gen_random_uuid()'), nullable=False),
+        sa.Column('target', sa.String(), nullable=False),
+        sa.Column('fingerprint', sa.String(length=64), nullable=False),
+        sa.Column('sha256', sa.String(length=64), nullable=False),
+        sa.Column('source', sa.String(), nullable=True),
+        sa.Column('rows', sa.Integer(), nullable=False),
+        sa.Column('report', postgresql.JSONB(astext_type=sa.Text()), nullable=False),
+        sa.Column(
+            'created_at',
+            sa.TIMESTAMP(timezone=True),
+            server_default=sa.text('now()'),
+            nullable=False,
+        ),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('target', 'fingerprint'),
+        schema='happy_hog',
+    )
+    op.create_index(
+        op.f('ix_happy_hog_import_ledger_sha256'),
+        'import_ledger',
+        ['sha256'],
+        unique=False,
+        schema='happy_hog',
+    )
+    op.create_index(
+        op.f('ix_happy_hog_import_ledger_source'),
+        'import_ledger',
+        ['source'],
+        unique=False,
+        schema='happy_hog',
+    )
+
+
+def downgrade():
+    op.drop_index(
+        op.f('ix_happy_hog_import_ledger_source'),
+        table_name='import_ledger',
+        schema='happy_hog',
+    )
+    op.drop_index(
+        op.f('ix_happy_hog_import_ledger_sha256'),
+        table_name='import_ledger',
+        schema='happy_hog',
+    )
+    op.drop_table('import_ledger', schema='happy_hog')
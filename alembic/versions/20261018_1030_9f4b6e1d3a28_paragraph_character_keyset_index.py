@@ -0,0 +1,32 @@
+"""paragraph character keyset index
+
+Revision ID: 9f4b6e1d3a28
+Revises: 2e7a9d4c6f13
+Create Date: 2026-10-18 10:30:00.000000
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '9f4b6e1d3a28'
+down_revision = '2e7a9d4c6f13'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index(
+        'ix_paragraph_character_work_num',
+        'paragraph',
+        ['character_id', 'work_id', 'paragraph_num'],
+        unique=False,
+        schema='shakespeare',
+    )
+
+
+def downgrade():
+    op.drop_index(
+        'ix_paragraph_character_work_num',
+        table_name='paragraph',
+        schema='shakespeare',
+    )
@@ -0,0 +1,47 @@
+"""paragraph text fts
+
+Revision ID: c71e5a0b8d94
+Revises: 9f4b6e1d3a28
+Create Date: 2026-10-18 11:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = 'c71e5a0b8d94'
+down_revision = '9f4b6e1d3a28'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column(
+        'paragraph',
+        sa.Column(
+            'text_tsv',
+            postgresql.TSVECTOR(),
+            sa.Computed("to_tsvector('english', coalesce(plain_text, ''))", persisted=True),
+            nullable=True,
+        ),
+        schema='shakespeare',
+    )
+    op.create_index(
+        'ix_paragraph_text_tsv',
+        'paragraph',
+        ['text_tsv'],
+        unique=False,
+        schema='shakespeare',
+        postgresql_using='gin',
+    )
+
+
+def downgrade():
+    op.drop_index(
+        'ix_paragraph_text_tsv',
+        table_name='paragraph',
+        schema='shakespeare',
+        postgresql_using='gin',
+    )
+    op.drop_column('paragraph', 'text_tsv', schema='shakespeare')
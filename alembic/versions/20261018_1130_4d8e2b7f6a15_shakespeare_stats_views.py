@@ -0,0 +1,85 @@
+"""shakespeare stats views
+
+Revision ID: 4d8e2b7f6a15
+Revises: c71e5a0b8d94
+Create Date: 2026-10-18 11:30:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '4d8e2b7f6a15'
+down_revision = 'c71e5a0b8d94'
+branch_labels = None
+depends_on = None
+
+VIEWS = {
+    'character_act_stats': (
+        """
+        SELECT p.work_id, p.character_id, c.name AS character_name, p.section_number,
+               count(*) AS paragraphs,
+               sum(p.word_count)::bigint AS words,
+               sum(p.char_count)::bigint AS chars
+        FROM shakespeare.paragraph p
+        JOIN shakespeare.character c ON c.id = p.character_id
+        GROUP BY p.work_id, p.character_id, c.name, p.section_number
+        """,
+        'work_id, character_id, section_number',
+    ),
+    'work_stats': (
+        """
+        SELECT w.id AS work_id, w.title, w.genre_type, w.year,
+               count(DISTINCT p.section_number) AS acts,
+               count(DISTINCT p.character_id) AS characters,
+               count(p.id) AS paragraphs,
+               coalesce(sum(p.word_count), 0)::bigint AS words,
+               coalesce(sum(p.char_count), 0)::bigint AS chars
+        FROM shakespeare.work w
+        LEFT JOIN shakespeare.paragraph p ON p.work_id = w.id
+        GROUP BY w.id
+        """,
+        'work_id',
+    ),
+    'genre_stats': (
+        """
+        SELECT w.genre_type,
+               count(DISTINCT w.id) AS works,
+               count(p.id) AS paragraphs,
+               coalesce(sum(p.word_count), 0)::bigint AS words,
+               coalesce(sum(p.char_count), 0)::bigint AS chars
+        FROM shakespeare.work w
+        LEFT JOIN shakespeare.paragraph p ON p.work_id = w.id
+        GROUP BY w.genre_type
+        """,
+        'genre_type',
+    ),
+}
+
+
+def upgrade():
+    op.create_table(
+        'stats_refresh',
+        sa.Column('view', sa.String(length=64), nullable=False),
+        sa.Column('generation', sa.BigInteger(), nullable=False),
+        sa.Column('source_version', sa.BigInteger(), nullable=False),
+        sa.Column('seconds', sa.Float(), nullable=False),
+        sa.Column(
+            'refreshed_at',
+            sa.TIMESTAMP(timezone=True),
+            server_default=sa.text('now()'),
+            nullable=False,
+        ),
+        sa.PrimaryKeyConstraint('view'),
+        schema='shakespeare',
+    )
+    for view, (query, key) in VIEWS.items():
+        op.execute(f'CREATE MATERIALIZED VIEW shakespeare.{view} AS {query}')
+        # REFRESH ... CONCURRENTLY requires a unique index over all rows
+        op.execute(f'CREATE UNIQUE INDEX ix_{view}_key ON shakespeare.{view} ({key})')
+
+
+def downgrade():
+    for view in VIEWS:
+        op.execute(f'DROP MATERIALIZED VIEW IF EXISTS shakespeare.{view}')
+    op.drop_table('stats_refresh', schema='shakespeare')
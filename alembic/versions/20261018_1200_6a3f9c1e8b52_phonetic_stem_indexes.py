@@ -0,0 +1,53 @@
+"""phonetic stem indexes
+
+Revision ID: 6a3f9c1e8b52
+Revises: 4d8e2b7f6a15
+Create Date: 2026-10-18 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '6a3f9c1e8b52'
+down_revision = '4d8e2b7f6a15'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # metaphone() normalizes spellings missing from shakespeare.wordform
+    op.execute('CREATE EXTENSION IF NOT EXISTS fuzzystrmatch')
+    for column in ('plain_text', 'phonetic_text', 'stem_text'):
+        op.create_index(
+            f'ix_wordform_{column}',
+            'wordform',
+            [column],
+            unique=False,
+            schema='shakespeare',
+        )
+    op.create_index(
+        'ix_paragraph_phonetic_terms',
+        'paragraph',
+        [sa.text("string_to_array(phonetic_text, ' ')")],
+        unique=False,
+        schema='shakespeare',
+        postgresql_using='gin',
+    )
+    op.create_index(
+        'ix_paragraph_stem_terms',
+        'paragraph',
+        [sa.text("string_to_array(stem_text, ' ')")],
+        unique=False,
+        schema='shakespeare',
+        postgresql_using='gin',
+    )
+
+
+def downgrade():
+    op.drop_index('ix_paragraph_stem_terms', table_name='paragraph', schema='shakespeare')
+    op.drop_index(
+        'ix_paragraph_phonetic_terms', table_name='paragraph', schema='shakespeare'
+    )
+    for column in ('stem_text', 'phonetic_text', 'plain_text'):
+        op.drop_index(f'ix_wordform_{column}', table_name='wordform', schema='shakespeare')
@@ -0,0 +1,49 @@
+"""cascade stuff nonsense links
+
+Revision ID: 3e9b7d1a5c60
+Revises: 6a3f9c1e8b52
+Create Date: 2026-10-18 12:30:00.000000
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '3e9b7d1a5c60'
+down_revision = '6a3f9c1e8b52'
+branch_labels = None
+depends_on = None
+
+# Postgres default name of the unnamed constraint created by the init revision
+CONSTRAINT = 'stuff_full_of_nonsense_stuff_id_fkey'
+
+
+def upgrade():
+    # A Stuff deleted with a single DELETE takes its links to Nonsense with it
+    op.drop_constraint(
+        CONSTRAINT, 'stuff_full_of_nonsense', schema='happy_hog', type_='foreignkey'
+    )
+    op.create_foreign_key(
+        CONSTRAINT,
+        'stuff_full_of_nonsense',
+        'stuff',
+        ['stuff_id'],
+        ['id'],
+        source_schema='happy_hog',
+        referent_schema='happy_hog',
+        ondelete='CASCADE',
+    )
+
+
+def downgrade():
+    op.drop_constraint(
+        CONSTRAINT, 'stuff_full_of_nonsense', schema='happy_hog', type_='foreignkey'
+    )
+    op.create_foreign_key(
+        CONSTRAINT,
+        'stuff_full_of_nonsense',
+        'stuff',
+        ['stuff_id'],
+        ['id'],
+        source_schema='happy_hog',
+        referent_schema='happy_hog',
+    )
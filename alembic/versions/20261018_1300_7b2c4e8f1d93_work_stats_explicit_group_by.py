@@ -0,0 +1,45 @@
+"""work stats explicit group by
+
+Revision ID: 7b2c4e8f1d93
+Revises: 3e9b7d1a5c60
+Create Date: 2026-10-18 13:00:00.000000
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '7b2c4e8f1d93'
+down_revision = '3e9b7d1a5c60'
+branch_labels = None
+depends_on = None
+
+QUERY = """
+        SELECT w.id AS work_id, w.title, w.genre_type, w.year,
+               count(DISTINCT p.section_number) AS acts,
+               count(DISTINCT p.character_id) AS characters,
+               count(p.id) AS paragraphs,
+               coalesce(sum(p.word_count), 0)::bigint AS words,
+               coalesce(sum(p.char_count), 0)::bigint AS chars
+        FROM shakespeare.work w
+        LEFT JOIN shakespeare.paragraph p ON p.work_id = w.id
+        GROUP BY {group_by}
+        """
+
+
+def _recreate(group_by):
+    op.execute('DROP MATERIALIZED VIEW IF EXISTS shakespeare.work_stats')
+    op.execute(
+        'CREATE MATERIALIZED VIEW shakespeare.work_stats AS '
+        + QUERY.format(group_by=group_by)
+    )
+    op.execute('CREATE UNIQUE INDEX ix_work_stats_key ON shakespeare.work_stats (work_id)')
+
+
+def upgrade():
+    # Grouped by the primary key alone the view depended on work_pkey, which the seed
+    # loader drops while it copies shakespeare.work
+    _recreate('w.id, w.title, w.genre_type, w.year')
+
+
+def downgrade():
+    _recreate('w.id')
@@ -5,6 +5,7 @@ from pydantic import EmailStr
 from rotoger import get_logger
 from starlette.concurrency import run_in_threadpool
 
+from app.services.cache import cache_stats
 from app.services.smtp import SMTPEmailService
 
 logger = get_logger()
@@ -43,6 +44,35 @@ async def redis_check(
     return redis_info
 
 
+@router.get("/database", status_code=status.HTTP_200_OK)
+async def database_check(request: Request):
+    """
+    Endpoint to report the shared Postgres connection pool statistics.
+
+    Args:
+        request (Request): The incoming HTTP request. Used to access the application's pool.
+
+    Returns:
+        dict: Pool size, checked-out and idle connections, overflow, checkout wait times and
+            per-route connection hold times.
+    """
+    return request.app.postgres_pool.status()
+
+
+@router.get("/cache", status_code=status.HTTP_200_OK)
+async def cache_check():
+    """
+    Endpoint to report read-through cache hit/miss counters.
+
+    Counters are kept per worker process, so the response includes the worker `pid`;
+    sample several times to cover every worker when sizing the cache.
+
+    Returns:
+        dict: The worker pid and the TTL, hits, misses and hit ratio of each cache.
+    """
+    return cache_stats()
+
+
 @router.post("/email", status_code=status.HTTP_200_OK)
 async def smtp_check(
     request: Request,
@@ -1,156 +1,638 @@
-import io
+from pathlib import Path
+from typing import Annotated, Literal
 
-import polars as pl
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, status
-from sqlalchemy.exc import SQLAlchemyError
+from asyncpg import PostgresError
+from fastapi import (
+    APIRouter,
+    Depends,
+    File,
+    HTTPException,
+    Query,
+    Request,
+    UploadFile,
+    WebSocket,
+    WebSocketDisconnect,
+    status,
+)
+from fastapi.responses import FileResponse, Response, StreamingResponse
+from fastexcel import FastExcelError
+from pyarrow import ArrowException
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.database import get_db
+from app.database import get_db, get_driver_connection
 from app.models.nonsense import Nonsense
-from app.schemas.nnonsense import NonsenseResponse, NonsenseSchema
+from app.schemas.bulk import ImportJobStatus, ImportReport, IngestReport
+from app.schemas.export import ExportParams
+from app.schemas.nnonsense import (
+    NonsensePage,
+    NonsenseResponse,
+    NonsenseSchema,
+    NonsenseSearchHit,
+)
+from app.schemas.search import NameMatch
+from app.services.bulk import NDJSON_MEDIA_TYPE, StagedCopy, ingest_ndjson
+from app.services.cache import nonsense_cache, nonsense_prefixes
+from app.services.export import ExportFormat, columnar_export, stream_json_array
+from app.services.imports import (
+    FILE_FORMATS,
+    ImportSource,
+    detect_format,
+    import_arrow_batches,
+    parse_column_map,
+    spool_upload,
+)
+from app.services.jobs import import_jobs
+from app.services.ledger import find_import, record_import
+from app.services.search import DebouncedSearch
+from app.services.validation import FrameRules, rejects_path
+from app.utils.pagination import decode_cursor, encode_cursor
+from app.utils.statements import like_prefix, statement_registry
 
 router = APIRouter(prefix="/v1/nonsense")
 
+nonsense_loader = StagedCopy(
+    table=Nonsense.__table__,
+    columns=("id", "name", "description"),
+    key="name",
+    generated={"id": "gen_random_uuid()"},
+    # NonsenseSchema requires both fields; imported files are checked against the same rules
+    rules=FrameRules(
+        required=("name", "description"),
+        max_length={"name": 255, "description": 10_000},
+        unique=("name",),
+    ),
+)
+
 
 @router.post("/", status_code=status.HTTP_201_CREATED, response_model=NonsenseResponse)
 async def create_nonsense(
-    payload: NonsenseSchema, db_session: AsyncSession = Depends(get_db)
+    payload: NonsenseSchema,
+    db_session: AsyncSession = Depends(get_db, scope="function"),
 ):
-    nonsense = Nonsense(**payload.model_dump())
-    await nonsense.save(db_session)
-    return nonsense
+    return await Nonsense.insert_returning(db_session, payload.model_dump())
 
 
 @router.get("/", response_model=NonsenseResponse)
 async def get_nonsense(
+    request: Request,
     name: str,
-    db_session: AsyncSession = Depends(get_db),
+    db_session: AsyncSession = Depends(get_db, scope="function"),
 ):
-    nonsense = await Nonsense.get_by_name(db_session, name)
-    return nonsense
+    payload = await nonsense_cache.get_or_load(
+        request.app.cache, name, lambda: Nonsense.get_by_name(db_session, name)
+    )
+    if payload is None:
+        return None
+    return Response(content=payload, media_type="application/json")
+
+
+@router.get("/page", response_model=NonsensePage)
+async def list_nonsense(
+    cursor: Annotated[
+        str | None,
+        Query(description="Token returned as `next_cursor` by the previous page"),
+    ] = None,
+    limit: Annotated[int, Query(ge=1, le=1_000, description="Page size")] = 100,
+    db_session: AsyncSession = Depends(get_db, scope="function"),
+):
+    """
+    List Nonsense rows ordered by name, one keyset page at a time.
+
+    Args:
+        cursor (str | None): Opaque token of the page to continue after; omit for the first page.
+        limit (int): The maximum number of rows to return.
+        db_session (AsyncSession): The database session to use for the query.
+
+    Returns:
+        dict: The page items and the cursor of the next page, if any.
+    """
+    items, last = await Nonsense.keyset_page(db_session, decode_cursor(cursor), limit)
+    return {"items": items, "next_cursor": encode_cursor(last)}
+
+
+@router.get("/export")
+async def export_nonsense(
+    request: Request,
+    chunk_size: Annotated[
+        int, Query(ge=1, le=50_000, description="Rows fetched and sent per chunk")
+    ] = 5_000,
+):
+    """
+    Stream every Nonsense row as a chunked JSON array read from a server-side cursor.
+
+    Args:
+        request (Request): The incoming request. Used to access the application's connection pool.
+        chunk_size (int): Number of rows fetched from Postgres and sent per chunk.
+
+    Returns:
+        StreamingResponse: A JSON array of all rows ordered by name.
+    """
+    return StreamingResponse(
+        stream_json_array(request.app.postgres_pool, "nonsense.export", chunk_size),
+        media_type="application/json",
+    )
+
+
+@router.get("/export/{file_format}")
+async def export_nonsense_columnar(
+    request: Request,
+    file_format: ExportFormat,
+    params: Annotated[ExportParams, Query()],
+):
+    """
+    Stream Nonsense rows as a Parquet, Arrow IPC stream or CSV file.
+
+    Args:
+        request (Request): The incoming request. Used to access the application's connection pool.
+        file_format (ExportFormat): Output format.
+        params (ExportParams): Columns to project, `column:op:value` filters and chunk size.
+
+    Returns:
+        StreamingResponse: The file, written one record batch per chunk of rows.
+    """
+    return columnar_export(
+        request.app.postgres_pool, Nonsense.__table__, file_format, params
+    )
 
 
 @router.delete("/")
-async def delete_nonsense(name: str, db_session: AsyncSession = Depends(get_db)):
-    nonsense = await Nonsense.find(db_session, name)
-    return await nonsense.delete(nonsense, db_session)
+async def delete_nonsense(
+    request: Request,
+    name: str,
+    db_session: AsyncSession = Depends(get_db, scope="function"),
+):
+    deleted = await Nonsense.delete_by_key_returning(db_session, name)
+    if deleted is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Nonsense with name {name} not found.",
+        )
+    await db_session.commit()
+    await nonsense_cache.invalidate(request.app.cache, name)
+    return True
 
 
 @router.patch("/", response_model=NonsenseResponse)
 async def update_nonsense(
+    request: Request,
     payload: NonsenseSchema,
     name: str,
-    db_session: AsyncSession = Depends(get_db),
+    db_session: AsyncSession = Depends(get_db, scope="function"),
 ):
-    nonsense = await Nonsense.find(db_session, name)
-    await nonsense.update(db_session, **payload.model_dump())
+    nonsense = await Nonsense.update_by_key_returning(
+        db_session, name, payload.model_dump()
+    )
+    await db_session.commit()
+    await nonsense_cache.invalidate(request.app.cache, name, payload.name)
     return nonsense
 
 
 @router.post("/", response_model=NonsenseResponse)
 async def merge_nonsense(
+    request: Request,
     payload: NonsenseSchema,
-    db_session: AsyncSession = Depends(get_db),
+    db_session: AsyncSession = Depends(get_db, scope="function"),
 ):
     nonsense = Nonsense(**payload.model_dump())
-    await nonsense.save_or_update(db_session)
+    nonsense = await nonsense.save_or_update(db_session)
+    await db_session.commit()
+    await nonsense_cache.invalidate(request.app.cache, payload.name)
     return nonsense
 
 
+@router.post("/merge_many")
+async def merge_many_nonsense(
+    request: Request,
+    payload: list[NonsenseSchema],
+    db_session: AsyncSession = Depends(get_db, scope="function"),
+):
+    """
+    Insert or update many Nonsense rows by name with a single upsert statement.
+
+    Args:
+        request (Request): The incoming request. Used to access the application's cache.
+        payload (list[NonsenseSchema]): The rows to upsert; a repeated name keeps its last entry.
+        db_session (AsyncSession): The database session to use for the statement.
+
+    Returns:
+        dict: The number of rows inserted or updated.
+    """
+    upserted = await Nonsense.upsert_many(
+        db_session, [row.model_dump() for row in payload]
+    )
+    await db_session.commit()
+    await nonsense_cache.invalidate(request.app.cache, *{row.name for row in payload})
+    return {"upserted": upserted}
+
+
+@router.post(
+    "/ingest", status_code=status.HTTP_201_CREATED, response_model=IngestReport
+)
+async def ingest_nonsense(
+    request: Request,
+    batch_size: Annotated[
+        int, Query(ge=1, le=50_000, description="Rows flushed to Postgres per batch")
+    ] = 1_000,
+    db_session: AsyncSession = Depends(get_db, scope="function"),
+):
+    """
+    Stream an `application/x-ndjson` body of Nonsense rows into the database.
+
+    Lines are decoded and validated against `NonsenseSchema` as the upload arrives and flushed
+    to Postgres in batches of `batch_size`, so memory use does not grow with the payload.
+
+    Args:
+        request (Request): The incoming request whose body is streamed.
+        batch_size (int): Number of rows flushed to Postgres at a time.
+        db_session (AsyncSession): The database session whose connection is used for COPY.
+
+    Returns:
+        IngestReport: Progress counters and the line numbers of rejected rows.
+
+    Raises:
+        HTTPException: If the body is not NDJSON or Postgres rejects a batch as a whole.
+    """
+    if request.headers.get("content-type", "").split(";")[0] != NDJSON_MEDIA_TYPE:
+        raise HTTPException(
+            status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            detail=f"Expected {NDJSON_MEDIA_TYPE} body.",
+        )
+    try:
+        connection = await get_driver_connection(db_session)
+        return await ingest_ndjson(
+            request.stream(), connection, nonsense_loader, NonsenseSchema, batch_size
+        )
+    except PostgresError as ex:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=repr(ex)
+        ) from ex
+
+
+async def spooled_import(
+    xlsx: Annotated[
+        UploadFile,
+        File(description="Excel, CSV, Parquet or Arrow IPC file with Nonsense rows"),
+    ],
+    file_format: Annotated[
+        Literal[FILE_FORMATS] | None,
+        Query(description="Format of the file; detected from its content when omitted"),
+    ] = None,
+    sheet_name: Annotated[
+        str, Query(description="Worksheet to read from an Excel file")
+    ] = "New Nonsense",
+    mapping: Annotated[
+        list[str] | None,
+        Query(
+            description="Source column that fills a target column, as `source:target`"
+        ),
+    ] = None,
+    batch_size: Annotated[
+        int, Query(ge=1, le=500_000, description="Rows copied to Postgres per batch")
+    ] = 50_000,
+    source: Annotated[
+        str | None,
+        Query(description="Feed the file comes from; defaults to the file name"),
+    ] = None,
+    diff: Annotated[
+        bool,
+        Query(description="Also update existing rows whose description changed"),
+    ] = False,
+) -> ImportSource:
+    """
+    Spool an uploaded Nonsense file to disk and resolve its import options.
+
+    Args:
+        xlsx (UploadFile): The file uploaded by the client; the field keeps its original name.
+        file_format (str | None): Format of the file, or `None` to detect it.
+        sheet_name (str): The worksheet to read from an Excel file.
+        mapping (list[str] | None): `source:target` pairs for source columns named differently.
+        batch_size (int): Number of rows copied to Postgres at a time.
+        source (str | None): Feed the file comes from, recorded in the import ledger.
+        diff (bool): Update existing rows whose values changed instead of skipping them.
+
+    Returns:
+        ImportSource: The spooled file; the caller removes it once imported.
+
+    Raises:
+        HTTPException: If the column mapping is invalid.
+    """
+    try:
+        columns = parse_column_map(mapping or [], nonsense_loader.arrow_columns)
+    except ValueError as ex:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=repr(ex)
+        ) from ex
+    path, sha256 = await spool_upload(xlsx, suffix=Path(xlsx.filename or "").suffix)
+    try:
+        return ImportSource(
+            path=path,
+            filename=xlsx.filename,
+            file_format=file_format or detect_format(path),
+            columns=columns,
+            sheet_name=sheet_name,
+            batch_size=batch_size,
+            sha256=sha256,
+            source=source,
+            diff=diff,
+        )
+    except BaseException:
+        # Nobody owns the spooled file until the source is handed over
+        path.unlink(missing_ok=True)
+        raise
+
+
 @router.post(
     "/import",
     status_code=status.HTTP_201_CREATED,
+    response_model=ImportReport,
 )
 async def import_nonsense(
-    xlsx: UploadFile,
-    db_session: AsyncSession = Depends(get_db),
+    request: Request,
+    response: Response,
+    source: ImportSource = Depends(spooled_import),
+    db_session: AsyncSession = Depends(get_db, scope="function"),
 ):
     """
-    This function is a FastAPI route handler that imports data from an Excel file into a database.
+    Import Nonsense rows from an Excel, CSV, Parquet or Arrow IPC file with COPY.
+
+    The upload is spooled to disk and read into Arrow batches by a per-format reader:
+    calamine for Excel, a streaming reader for CSV, row groups of a memory-mapped Parquet
+    file, or zero-copy batches of a memory-mapped IPC file. Only the mapped columns are read,
+    and each batch is encoded as CSV and copied into Postgres; no Python object is built
+    per row. Rows are trimmed and validated batch by batch with polars expressions; rejects
+    are written to a file downloadable from `GET /import/rejects/{rejects_id}`, and valid rows
+    whose name already exists are skipped and counted. Large files should go through
+    `POST /import/jobs` instead.
+
+    The upload is hashed while it is spooled and every completed import is recorded in the
+    import ledger. A file already imported with the same options is answered with `200` and
+    the recorded report, without being read. With `diff`, rows whose name exists are
+    updated when their description differs and skipped when identical.
 
     Args:
-        xlsx (UploadFile): The Excel file that will be uploaded by the client.
-        db_session (AsyncSession): A SQLAlchemy session for interacting with the database.
+        request (Request): The incoming request. Used to access the application's cache.
+        response (Response): The outgoing response; its status is `200` for a duplicate file.
+        source (ImportSource): The spooled file and its import options.
+        db_session (AsyncSession): The database session whose connection is used for COPY.
 
     Returns:
-        dict: A dictionary containing the filename and the number of imported records.
+        ImportReport: Row counters, throughput and the worker's peak memory.
 
     Raises:
-        HTTPException: If an error occurs during the process (either a SQLAlchemy error or an HTTP exception),
-                       the function rolls back the session and raises an HTTP exception with a 422 status code.
+        HTTPException: If the file cannot be read or Postgres rejects a batch as a whole.
     """
     try:
-        # Read the uploaded file into bytes
-        file_bytes = await xlsx.read()
-
-        # Use the `polars` library to read the Excel data into a DataFrame
-        nonsense_data = pl.read_excel(
-            source=io.BytesIO(file_bytes),
-            sheet_name="New Nonsense",
-            engine="calamine",
+        connection = await get_driver_connection(db_session)
+        previous = await find_import(connection, nonsense_loader.target, source)
+        if previous is not None:
+            response.status_code = status.HTTP_200_OK
+            return previous
+        report = await import_arrow_batches(
+            source.batches(),
+            connection,
+            nonsense_loader,
+            ImportReport(filename=source.filename, sha256=source.sha256),
+            update=source.diff,
+            on_update=lambda names: nonsense_cache.invalidate(
+                request.app.cache, *names
+            ),
         )
-        # Iterate over the DataFrame rows and create a list of `Nonsense` objects
-        nonsense_records = [
-            Nonsense(
-                name=nonsense.get("name"),
-                description=nonsense.get("description"),
-            )
-            for nonsense in nonsense_data.to_dicts()
-        ]
-        # Add all the `Nonsense` objects to the SQLAlchemy session
-        db_session.add_all(nonsense_records)
-        # Commit the session to save the objects to the database
-        await db_session.commit()
-        # Return a JSON response containing the filename and the number of imported records
-        return {"filename": xlsx.filename, "nonsense_records": len(nonsense_records)}
-    except (SQLAlchemyError, HTTPException, ValueError) as ex:
-        # If an error occurs, roll back the session
-        await db_session.rollback()
-        # Raise an HTTP exception with a 422 status code
+        await record_import(connection, nonsense_loader.target, source, report)
+        return report
+    except (FastExcelError, ArrowException, PostgresError, ValueError) as ex:
         raise HTTPException(
             status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=repr(ex)
         ) from ex
     finally:
-        # Ensure that the database session is closed, regardless of whether an error occurred or not
-        await db_session.close()
-
-
-# TODO: add websocket to full text search postgres database for nonsense description
-
-# To add a WebSocket to full text search a PostgreSQL database for the `nonsense` description, you can use the `websockets` library in Python. Here's a step-by-step plan:
-#
-# 1. Install the `websockets` library if you haven't done so already.
-# 2. Create a new WebSocket route in your FastAPI application.
-# 3. In the WebSocket route, accept a search query from the client.
-# 4. Use the search query to perform a full text search on the `nonsense` table in your PostgreSQL database.
-# 5. Send the search results back to the client through the WebSocket connection.
-#
-# Here's how you can implement this:
-#
-# ```python
-# import websockets
-# from fastapi import WebSocket
-# from sqlalchemy import text
-#
-# router = APIRouter()
-#
-# @router.websocket("/ws/nonsense")
-# async def websocket_endpoint(websocket: WebSocket):
-#     await websocket.accept()
-#     while True:
-#         data = await websocket.receive_text()
-#         query = text(f"""
-#             SELECT * FROM nonsense
-#             WHERE to_tsvector('english', description) @@ plainto_tsquery('english', :q)
-#         """)
-#         result = await db_session.execute(query, {"q": data})
-#         await websocket.send_json(result.fetchall())
-# # ```
-#
-# This code creates a new WebSocket route at `/ws/nonsense`. When a client connects to this route and sends a message, the message is used as a search query in a full text search on the `nonsense` table. The search results are then sent back to the client through the WebSocket connection.
-#
-# Please note that this is a basic implementation and might need adjustments based on your specific needs. For example, you might want to add error handling, handle disconnections, or format the search results before sending them back to the client.
-#
-
-# TODO: https://medium.com/@amitosh/full-text-search-fts-with-postgresql-and-sqlalchemy-edc436330a0c
-# TODO: https://www.postgresql.org/docs/13/textsearch-intro.html
+        source.cleanup()
+
+
+@router.post(
+    "/import/jobs",
+    status_code=status.HTTP_202_ACCEPTED,
+    response_model=ImportJobStatus,
+)
+async def submit_nonsense_import(
+    request: Request, source: ImportSource = Depends(spooled_import)
+):
+    """
+    Queue a Nonsense file import as a background job and return immediately.
+
+    The file is spooled to disk within the request; reading and copying it happen in a
+    background task of this worker. Poll `GET /import/{job_id}` for progress.
+
+    Args:
+        request (Request): The incoming request. Used to access Redis and the connection pool.
+        source (ImportSource): The spooled file and its import options.
+
+    Returns:
+        ImportJobStatus: The queued job.
+    """
+    return await import_jobs.submit(
+        request.app.redis,
+        request.app.postgres_pool,
+        nonsense_loader,
+        source,
+        on_update=lambda names: nonsense_cache.invalidate(request.app.cache, *names),
+    )
+
+
+@router.get("/import/rejects/{rejects_id}", response_class=FileResponse)
+async def download_nonsense_rejects(rejects_id: str):
+    """
+    Download the rows an import rejected, as CSV with their row number and reasons.
+
+    Args:
+        rejects_id (str): The `rejects_id` reported by the import or job.
+
+    Returns:
+        FileResponse: The reject file.
+
+    Raises:
+        HTTPException: If the reject file is unknown or has expired.
+    """
+    try:
+        path = rejects_path(rejects_id)
+    except ValueError:
+        path = None
+    if path is None or not path.is_file():
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Rejects {rejects_id} not found.",
+        )
+    return FileResponse(
+        path, media_type="text/csv", filename=f"nonsense-rejects-{rejects_id}.csv"
+    )
+
+
+@router.get("/import/{job_id}", response_model=ImportJobStatus)
+async def get_nonsense_import(request: Request, job_id: str):
+    """
+    Report the progress of a background import: rows processed and rejected, throughput and ETA.
+
+    Args:
+        request (Request): The incoming request. Used to access Redis.
+        job_id (str): The job returned by `POST /import/jobs`.
+
+    Returns:
+        ImportJobStatus: The job status, with the final report once completed.
+
+    Raises:
+        HTTPException: If the job is unknown or has expired.
+    """
+    job = await import_jobs.status(request.app.redis, job_id)
+    if job is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Import job {job_id} not found.",
+        )
+    return job
+
+
+@router.delete("/import/{job_id}", response_model=ImportJobStatus)
+async def cancel_nonsense_import(request: Request, job_id: str):
+    """
+    Cancel a queued or running background import.
+
+    The job stops before its next batch; batches already copied stay committed.
+
+    Args:
+        request (Request): The incoming request. Used to access Redis.
+        job_id (str): The job returned by `POST /import/jobs`.
+
+    Returns:
+        ImportJobStatus: The job status at the time of the request.
+
+    Raises:
+        HTTPException: If the job is unknown or has expired.
+    """
+    job = await import_jobs.cancel(request.app.redis, job_id)
+    if job is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Import job {job_id} not found.",
+        )
+    return job
+
+
+@router.get("/similar", response_model=list[NameMatch])
+async def similar_nonsense(
+    request: Request,
+    q: Annotated[str, Query(min_length=1, max_length=255, description="Name to match")],
+    limit: Annotated[
+        int, Query(ge=1, le=50, description="Maximum number of matches")
+    ] = 10,
+):
+    """
+    Find Nonsense names similar to `q`, closest first, tolerating typos and reordering.
+
+    Args:
+        request (Request): The incoming request. Used to access the application's connection pool.
+        q (str): The name to match.
+        limit (int): The maximum number of matches to return.
+
+    Returns:
+        list[NameMatch]: Names whose trigram similarity reaches `pg_trgm.similarity_threshold`.
+    """
+    return await statement_registry.fetch(
+        request.app.postgres_pool, "nonsense.similar", q=q, limit=limit
+    )
+
+
+@router.get("/autocomplete", response_model=list[NameMatch])
+async def autocomplete_nonsense(
+    request: Request,
+    prefix: Annotated[
+        str, Query(min_length=1, max_length=255, description="Typed start of a name")
+    ],
+    limit: Annotated[
+        int, Query(ge=1, le=50, description="Maximum number of matches")
+    ] = 10,
+):
+    """
+    Complete a typed prefix to Nonsense names, case-insensitively.
+
+    Recently requested prefixes are answered from this worker's memory for a few seconds.
+
+    Args:
+        request (Request): The incoming request. Used to access the application's connection pool.
+        prefix (str): The start of the name.
+        limit (int): The maximum number of matches to return.
+
+    Returns:
+        list[NameMatch]: Names starting with `prefix`, most similar first.
+    """
+    return await nonsense_prefixes.get_or_load(
+        prefix,
+        limit,
+        lambda: statement_registry.fetch(
+            request.app.postgres_pool,
+            "nonsense.autocomplete",
+            prefix=prefix,
+            pattern=like_prefix(prefix),
+            limit=limit,
+        ),
+    )
+
+
+@router.get("/search", response_model=list[NonsenseSearchHit])
+async def search_nonsense(
+    request: Request,
+    q: Annotated[
+        str,
+        Query(
+            min_length=1,
+            max_length=256,
+            description='Web search syntax: words, `"phrases"`, `or` and `-excluded`',
+        ),
+    ],
+    limit: Annotated[
+        int, Query(ge=1, le=100, description="Maximum number of hits")
+    ] = 20,
+):
+    """
+    Full text search of Nonsense descriptions, best matches first.
+
+    The query is parsed with `websearch_to_tsquery` and matched against the stored
+    `description_tsv` column through its GIN index; hits are ranked with `ts_rank_cd`.
+
+    Args:
+        request (Request): The incoming request. Used to access the application's connection pool.
+        q (str): The search query.
+        limit (int): The maximum number of hits to return.
+
+    Returns:
+        list[NonsenseSearchHit]: The matching rows and their rank.
+    """
+    return await statement_registry.fetch(
+        request.app.postgres_pool, "nonsense.search", q=q, limit=limit
+    )
+
+
+@router.websocket("/ws/search")
+async def search_nonsense_live(
+    websocket: WebSocket,
+    limit: Annotated[int, Query(ge=1, le=100)] = 20,
+):
+    """
+    Search-as-you-type over Nonsense descriptions.
+
+    Each text message is a query; results are streamed back in chunks for the latest one
+    only. A query sent within the debounce delay of the previous one, or while it is still
+    running, cancels it.
+
+    Args:
+        websocket (WebSocket): The client connection.
+        limit (int): The maximum number of hits per query.
+    """
+    await websocket.accept()
+    search = DebouncedSearch(
+        websocket, websocket.app.postgres_pool, "nonsense.search", limit=limit
+    )
+    try:
+        while True:
+            search.submit(await websocket.receive_text())
+    except WebSocketDisconnect:
+        pass
+    finally:
+        await search.close()
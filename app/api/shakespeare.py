@@ -1,19 +1,467 @@
 from typing import Annotated
 
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
 from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.concurrency import run_in_threadpool
 
 from app.database import get_db
-from app.models.shakespeare import Paragraph
+from app.models.shakespeare import Paragraph, Wordform
+from app.schemas.export import ExportParams
+from app.schemas.shakespeare import (
+    CharacterActStats,
+    ConcordancePage,
+    ConcordanceStats,
+    FormCount,
+    GenreStats,
+    ParagraphField,
+    ParagraphPage,
+    ParagraphSearchHit,
+    RelatedMode,
+    RelatedWords,
+    WordFrequency,
+    WorkStats,
+)
+from app.services.auth import AuthBearer
+from app.services.concordance import concordance
+from app.services.export import ExportFormat, columnar_export
+from app.services.lookups import shakespeare_lookups
+from app.services.related import related_words
+from app.services.stats import not_modified, stats_refresher, view_etag
+from app.utils.pagination import decode_cursor, encode_cursor
+from app.utils.statements import statement_registry
 
 router = APIRouter(prefix="/v1/shakespeare")
 
+Word = Annotated[
+    str,
+    Query(min_length=1, max_length=64, pattern=r"^[A-Za-z']+$", description="A word"),
+]
+Stem = Annotated[
+    bool, Query(description="Match every form sharing the word's stem from `wordform`")
+]
 
-@router.get(
-    "/",
-)
+
+@router.get("/", response_model=ParagraphPage)
 async def find_paragraph(
+    request: Request,
     character: Annotated[str, Query(description="Character name")],
-    db_session: AsyncSession = Depends(get_db),
+    cursor: Annotated[
+        str | None,
+        Query(description="Token returned as `next_cursor` by the previous page"),
+    ] = None,
+    limit: Annotated[int, Query(ge=1, le=500, description="Page size")] = 100,
+    fields: Annotated[
+        list[ParagraphField] | None,
+        Query(description="Paragraph fields to return; all fields when omitted"),
+    ] = None,
+    db_session: AsyncSession = Depends(get_db, scope="function"),
+):
+    """
+    List a character's paragraphs ordered by work and paragraph number, one keyset page at a time.
+
+    The name is resolved to character ids from the in-memory lookups, and the works and
+    characters of the page are side-loaded from them instead of joined in SQL.
+
+    Args:
+        request (Request): The incoming request. Used to access the application's connection pool.
+        character (str): The character name.
+        cursor (str | None): Opaque token of the page to continue after; omit for the first page.
+        limit (int): The maximum number of paragraphs to return.
+        fields (list[ParagraphField] | None): Columns to select; `work_id` and
+            `paragraph_num` are always included.
+        db_session (AsyncSession): The database session to use for the query.
+
+    Returns:
+        dict: The page items, the cursor of the next page, if any, and the page's
+        characters and works.
+
+    Raises:
+        HTTPException: If the cursor is malformed.
+    """
+    after = decode_cursor(cursor)
+    if after is not None and not (
+        isinstance(after, list)
+        and len(after) == 2
+        and isinstance(after[0], str)
+        and isinstance(after[1], int)
+    ):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor."
+        )
+    catalog = await shakespeare_lookups.get(request.app.postgres_pool)
+    character_ids = catalog.character_ids.get(character)
+    if not character_ids:
+        return {"items": [], "next_cursor": None}
+    items, last = await Paragraph.find(
+        db_session=db_session,
+        character_ids=character_ids,
+        after=after,
+        limit=limit,
+        fields=fields,
+    )
+    return {
+        "items": items,
+        "next_cursor": encode_cursor(last),
+        **catalog.enrich(items),
+    }
+
+
+@router.get("/search", response_model=list[ParagraphSearchHit])
+async def search_paragraphs(
+    request: Request,
+    q: Annotated[
+        str,
+        Query(
+            min_length=1,
+            max_length=256,
+            description='Web search syntax: words, `"phrases"`, `or` and `-excluded`',
+        ),
+    ],
+    work_id: Annotated[str | None, Query(description="Only this work")] = None,
+    character: Annotated[
+        str | None, Query(description="Only paragraphs of this character")
+    ] = None,
+    genre: Annotated[
+        str | None,
+        Query(
+            max_length=1, description="Only works of this genre type, e.g. `t` or `c`"
+        ),
+    ] = None,
+    limit: Annotated[
+        int, Query(ge=1, le=100, description="Maximum number of hits")
+    ] = 20,
+):
+    """
+    Full text search of Shakespeare paragraphs, best matches first, with highlighted snippets.
+
+    The query is parsed with `websearch_to_tsquery` and matched against the stored
+    `text_tsv` column through its GIN index. Hits are ranked with `ts_rank_cd`, and
+    `ts_headline` snippets are built only for the returned page.
+
+    Args:
+        request (Request): The incoming request. Used to access the application's connection pool.
+        q (str): The search query.
+        work_id (str | None): Restrict the search to one work.
+        character (str | None): Restrict the search to one character, by name.
+        genre (str | None): Restrict the search to works of one genre type.
+        limit (int): The maximum number of hits to return.
+
+    Returns:
+        list[ParagraphSearchHit]: The matching paragraphs, their rank and snippet.
+    """
+    return await statement_registry.fetch(
+        request.app.postgres_pool,
+        "paragraph.search",
+        q=q,
+        work_id=work_id,
+        character=character,
+        genre=genre,
+        limit=limit,
+    )
+
+
+@router.get("/related", response_model=RelatedWords)
+async def find_related(
+    request: Request,
+    word: Word,
+    mode: Annotated[
+        RelatedMode,
+        Query(description="`sounds_like` matches phonetic codes, `same_root` stems"),
+    ],
+    limit: Annotated[
+        int, Query(ge=1, le=100, description="Maximum number of forms and paragraphs")
+    ] = 20,
+):
+    """
+    Find words that sound like a word or share its root, and the paragraphs using them.
+
+    Args:
+        request (Request): The incoming request. Used to access the application's connection pool.
+        word (str): The query word; spellings missing from the dataset are normalized too.
+        mode (RelatedMode): Match phonetic codes or stems.
+        limit (int): The maximum number of forms and of paragraphs to return.
+
+    Returns:
+        RelatedWords: The code the word normalizes to, the matching forms and paragraphs.
+    """
+    return await related_words(request.app.postgres_pool, word, mode, limit)
+
+
+@router.get("/concordance/frequency", response_model=WordFrequency)
+async def word_frequency(word: Word, stem: Stem = False):
+    """
+    Count the occurrences of a word in the in-memory concordance, without touching Postgres.
+
+    Args:
+        word (str): The word to count.
+        stem (bool): Count every form sharing the word's stem.
+
+    Returns:
+        WordFrequency: Occurrences per form, in total, and the number of paragraphs.
+
+    Raises:
+        HTTPException: If the concordance index is not ready yet.
+    """
+    return await run_in_threadpool(concordance.get().frequency, word, stem)
+
+
+@router.get("/concordance/kwic", response_model=ConcordancePage)
+async def keyword_in_context(
+    word: Word,
+    stem: Stem = False,
+    width: Annotated[
+        int, Query(ge=1, le=200, description="Characters of context on each side")
+    ] = 40,
+    limit: Annotated[int, Query(ge=1, le=500, description="Page size")] = 50,
+    offset: Annotated[int, Query(ge=0, description="Lines to skip")] = 0,
+):
+    """
+    Keyword-in-context lines of a word, in corpus order, from the in-memory concordance.
+
+    Args:
+        word (str): The keyword.
+        stem (bool): Match every form sharing the keyword's stem.
+        width (int): Characters of context on each side.
+        limit (int): The maximum number of lines to return.
+        offset (int): The number of lines to skip.
+
+    Returns:
+        dict: The number of occurrences and the requested lines.
+
+    Raises:
+        HTTPException: If the concordance index is not ready yet.
+    """
+    total, lines = await run_in_threadpool(
+        concordance.get().concordance, word, stem, width, limit, offset
+    )
+    return {"total": total, "lines": lines}
+
+
+@router.get("/concordance/cooccurrence", response_model=list[FormCount])
+async def cooccurrence(
+    word: Word,
+    stem: Stem = False,
+    window: Annotated[
+        int, Query(ge=1, le=20, description="Words considered on each side")
+    ] = 5,
+    limit: Annotated[
+        int, Query(ge=1, le=100, description="Maximum number of neighbours")
+    ] = 20,
+    skip_top: Annotated[
+        int,
+        Query(ge=0, le=1000, description="Ignore this many most frequent words"),
+    ] = 100,
+):
+    """
+    Words most often found near a word in the same paragraph, from the in-memory concordance.
+
+    Args:
+        word (str): The word.
+        stem (bool): Match every form sharing the word's stem.
+        window (int): Words considered on each side of every occurrence.
+        limit (int): The maximum number of neighbours to return.
+        skip_top (int): The number of most frequent corpus words to ignore.
+
+    Returns:
+        list[FormCount]: Neighbouring forms, most frequent first.
+
+    Raises:
+        HTTPException: If the concordance index is not ready yet.
+    """
+    return await run_in_threadpool(
+        concordance.get().cooccurrence, word, stem, window, limit, skip_top
+    )
+
+
+@router.get("/concordance/stats", response_model=ConcordanceStats)
+async def concordance_stats():
+    """
+    Report the size of the concordance index, its build or load time and peak memory.
+
+    Returns:
+        ConcordanceStats: The index statistics, or only `ready: false` while it loads.
+    """
+    return concordance.stats()
+
+
+@router.post(
+    "/concordance/rebuild",
+    response_model=ConcordanceStats,
+    dependencies=[Depends(AuthBearer())],
+)
+async def rebuild_concordance(request: Request):
+    """
+    Rebuild the concordance index from Postgres and save it for the other workers.
+
+    Other workers pick the new files up on their next start.
+
+    Args:
+        request (Request): The incoming request. Used to access the application's connection pool.
+
+    Returns:
+        ConcordanceStats: The statistics of the new index.
+    """
+    await concordance.rebuild(request.app.postgres_pool)
+    return concordance.stats()
+
+
+@router.get("/stats/works", response_model=list[WorkStats])
+async def work_stats(
+    request: Request,
+    response: Response,
+    genre: Annotated[
+        str | None,
+        Query(
+            max_length=1, description="Only works of this genre type, e.g. `t` or `c`"
+        ),
+    ] = None,
+):
+    """
+    Acts, speakers, paragraphs and words per work, from the `work_stats` materialized view.
+
+    Responses carry an ETag of the view's refresh generation; a request whose
+    `If-None-Match` holds it is answered with 304 without reading the view.
+
+    Args:
+        request (Request): The incoming request. Used to access the application's connection pool.
+        response (Response): The response the ETag header is set on.
+        genre (str | None): Restrict the statistics to works of one genre type.
+
+    Returns:
+        list[WorkStats]: The statistics of every work, ordered by work id.
+    """
+    pool = request.app.postgres_pool
+    if cached := not_modified(request, response, await view_etag(pool, "work_stats")):
+        return cached
+    return await statement_registry.fetch(pool, "stats.works", genre=genre)
+
+
+@router.get("/stats/works/{work_id}/characters", response_model=list[CharacterActStats])
+async def character_act_stats(request: Request, response: Response, work_id: str):
+    """
+    Lines and words per character per act of a work, from the `character_act_stats` view.
+
+    Responses carry an ETag of the view's refresh generation; a request whose
+    `If-None-Match` holds it is answered with 304 without reading the view.
+
+    Args:
+        request (Request): The incoming request. Used to access the application's connection pool.
+        response (Response): The response the ETag header is set on.
+        work_id (str): The work id.
+
+    Returns:
+        list[CharacterActStats]: One entry per character and act, ordered by character name.
+    """
+    pool = request.app.postgres_pool
+    etag = await view_etag(pool, "character_act_stats")
+    if cached := not_modified(request, response, etag):
+        return cached
+    return await statement_registry.fetch(pool, "stats.character_acts", work_id=work_id)
+
+
+@router.get("/stats/genres", response_model=list[GenreStats])
+async def genre_stats(request: Request, response: Response):
+    """
+    Works, paragraphs and words per genre, from the `genre_stats` materialized view.
+
+    Args:
+        request (Request): The incoming request. Used to access the application's connection pool.
+        response (Response): The response the ETag header is set on.
+
+    Returns:
+        list[GenreStats]: The statistics of every genre type.
+    """
+    pool = request.app.postgres_pool
+    if cached := not_modified(request, response, await view_etag(pool, "genre_stats")):
+        return cached
+    return await statement_registry.fetch(pool, "stats.genres")
+
+
+@router.post(
+    "/stats/refresh",
+    response_model=dict[str, int],
+    dependencies=[Depends(AuthBearer())],
+)
+async def refresh_stats(request: Request):
+    """
+    Refresh every statistics view now, without waiting for the schedule.
+
+    Args:
+        request (Request): The incoming request. Used to access the application's connection pool.
+
+    Returns:
+        dict[str, int]: The new generation of each view.
+
+    Raises:
+        HTTPException: If another worker is refreshing the views.
+    """
+    refreshed = await stats_refresher.refresh(request.app.postgres_pool, force=True)
+    if refreshed is None:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Statistics are being refreshed by another worker.",
+        )
+    return refreshed
+
+
+@router.post(
+    "/lookups/reload",
+    response_model=dict[str, int],
+    dependencies=[Depends(AuthBearer())],
+)
+async def reload_lookups(request: Request):
+    """
+    Reload the in-memory character and work lookups of this worker after the data changed.
+
+    Args:
+        request (Request): The incoming request. Used to access the application's connection pool.
+
+    Returns:
+        dict[str, int]: The number of characters and works loaded.
+    """
+    catalog = await shakespeare_lookups.reload(request.app.postgres_pool)
+    return {"characters": len(catalog.characters), "works": len(catalog.works)}
+
+
+@router.get("/paragraph/export/{file_format}")
+async def export_paragraphs(
+    request: Request,
+    file_format: ExportFormat,
+    params: Annotated[ExportParams, Query()],
+):
+    """
+    Stream paragraphs as a Parquet, Arrow IPC stream or CSV file.
+
+    Args:
+        request (Request): The incoming request. Used to access the application's connection pool.
+        file_format (ExportFormat): Output format.
+        params (ExportParams): Columns to project, `column:op:value` filters and chunk size.
+
+    Returns:
+        StreamingResponse: The file, written one record batch per chunk of rows.
+    """
+    return columnar_export(
+        request.app.postgres_pool, Paragraph.__table__, file_format, params
+    )
+
+
+@router.get("/wordform/export/{file_format}")
+async def export_wordforms(
+    request: Request,
+    file_format: ExportFormat,
+    params: Annotated[ExportParams, Query()],
 ):
-    return await Paragraph.find(db_session=db_session, character=character)
+    """
+    Stream word forms as a Parquet, Arrow IPC stream or CSV file.
+
+    Args:
+        request (Request): The incoming request. Used to access the application's connection pool.
+        file_format (ExportFormat): Output format.
+        params (ExportParams): Columns to project, `column:op:value` filters and chunk size.
+
+    Returns:
+        StreamingResponse: The file, written one record batch per chunk of rows.
+    """
+    return columnar_export(
+        request.app.postgres_pool, Wordform.__table__, file_format, params
+    )
@@ -1,16 +1,23 @@
-from collections.abc import Callable
 from typing import Annotated, Any
 
-from fastapi import APIRouter, Depends, HTTPException, Request, status
-from pydantic import ValidationError, WrapValidator
+from asyncpg import PostgresError
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from fastapi.responses import Response, StreamingResponse
 from rotoger import get_logger
-from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.database import get_db
+from app.database import get_db, get_driver_connection
 from app.models.stuff import RandomStuff, Stuff
+from app.schemas.bulk import BulkReport, IngestReport
+from app.schemas.export import ExportParams
+from app.schemas.search import NameMatch
 from app.schemas.stuff import RandomStuff as RandomStuffSchema
-from app.schemas.stuff import StuffResponse, StuffSchema
+from app.schemas.stuff import StuffPage, StuffResponse, StuffSchema
+from app.services.bulk import NDJSON_MEDIA_TYPE, StagedCopy, ingest_ndjson
+from app.services.cache import stuff_cache, stuff_prefixes
+from app.services.export import ExportFormat, columnar_export, stream_json_array
+from app.utils.pagination import decode_cursor, encode_cursor
+from app.utils.statements import like_prefix, statement_registry
 
 logger = get_logger()
 
@@ -19,116 +26,348 @@ router = APIRouter(prefix="/v1/stuff")
 
 @router.post("/random", status_code=status.HTTP_201_CREATED)
 async def create_random_stuff(
-    payload: RandomStuffSchema, db_session: AsyncSession = Depends(get_db)
+    payload: RandomStuffSchema,
+    db_session: AsyncSession = Depends(get_db, scope="function"),
 ) -> dict[str, str]:
-    random_stuff = RandomStuff(**payload.model_dump())
-    await random_stuff.save(db_session)
-    return {"id": str(random_stuff.id)}
+    random_stuff = await RandomStuff.insert_returning(db_session, payload.model_dump())
+    return {"id": str(random_stuff["id"])}
 
 
-failed_items: list[dict] = []  # Global or pass via context
+stuff_loader = StagedCopy(
+    table=Stuff.__table__, columns=("id", "name", "description"), key="name"
+)
 
-def catch_invalid(v: Any, handler: Callable[[Any], Any] ) -> Any:
-    try:
-        return handler(v)
-    except ValidationError:
-        failed_items.append(v)  # Intercept here!
-        return None  # Or raise if needed
 
-@router.post("/add_many", status_code=status.HTTP_201_CREATED)
+@router.post(
+    "/add_many", status_code=status.HTTP_201_CREATED, response_model=BulkReport
+)
 async def create_multi_stuff(
-    payload: list[Annotated[StuffSchema, WrapValidator(catch_invalid)]], db_session: AsyncSession = Depends(get_db)
+    payload: list[Any], db_session: AsyncSession = Depends(get_db, scope="function")
 ):
-    await logger.ainfo(f">>>{failed_items}")
+    """
+    Bulk insert Stuff rows with COPY and report every row that was not inserted.
+
+    Each row is validated against `StuffSchema` on its own, so one bad row does not fail the
+    request. Valid rows are streamed into `happy_hog.stuff` through a staging table; rows that
+    fail validation, repeat a name within the payload, or already exist are returned in the
+    request-scoped `rejected` list with the reason.
+
+    Args:
+        payload (list[Any]): Raw rows to insert.
+        db_session (AsyncSession): The database session whose connection is used for COPY.
+
+    Returns:
+        BulkReport: Number of inserted rows and the rejected rows.
+
+    Raises:
+        HTTPException: If Postgres rejects the load as a whole.
+    """
+    report = BulkReport()
     try:
-        await logger.ainfo(f">>>{failed_items}")
-        await logger.ainfo(f">>>{payload}")
-        stuff_instances = [
-            Stuff(**stuff.model_dump()) for stuff in payload if stuff is not None
-        ]
-        db_session.add_all(stuff_instances)
-        await db_session.commit()
-    except SQLAlchemyError as ex:
+        connection = await get_driver_connection(db_session)
+        await stuff_loader.ingest(connection, StuffSchema, enumerate(payload), report)
+    except PostgresError as ex:
         await logger.aerror(f"Error inserting instances of Stuff: {repr(ex)}")
         raise HTTPException(
             status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=repr(ex)
         ) from ex
-    else:
-        await logger.ainfo(
-            f"{len(stuff_instances)} Stuff instances inserted into the database."
+    await logger.ainfo(
+        f"{report.inserted} Stuff instances inserted into the database.",
+        rejected=len(report.rejected),
+    )
+    return report
+
+
+@router.post(
+    "/ingest", status_code=status.HTTP_201_CREATED, response_model=IngestReport
+)
+async def ingest_stuff(
+    request: Request,
+    batch_size: Annotated[
+        int, Query(ge=1, le=50_000, description="Rows flushed to Postgres per batch")
+    ] = 1_000,
+    db_session: AsyncSession = Depends(get_db, scope="function"),
+):
+    """
+    Stream an `application/x-ndjson` body of Stuff rows into the database.
+
+    Lines are decoded and validated against `StuffSchema` as the upload arrives and flushed
+    to Postgres in batches of `batch_size`, so memory use does not grow with the payload.
+
+    Args:
+        request (Request): The incoming request whose body is streamed.
+        batch_size (int): Number of rows flushed to Postgres at a time.
+        db_session (AsyncSession): The database session whose connection is used for COPY.
+
+    Returns:
+        IngestReport: Progress counters and the line numbers of rejected rows.
+
+    Raises:
+        HTTPException: If the body is not NDJSON or Postgres rejects a batch as a whole.
+    """
+    if request.headers.get("content-type", "").split(";")[0] != NDJSON_MEDIA_TYPE:
+        raise HTTPException(
+            status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            detail=f"Expected {NDJSON_MEDIA_TYPE} body.",
         )
-        return {"inserted": len(stuff_instances)}
-        return True
+    try:
+        connection = await get_driver_connection(db_session)
+        return await ingest_ndjson(
+            request.stream(), connection, stuff_loader, StuffSchema, batch_size
+        )
+    except PostgresError as ex:
+        await logger.aerror(f"Error ingesting instances of Stuff: {repr(ex)}")
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=repr(ex)
+        ) from ex
 
 
 @router.post("", status_code=status.HTTP_201_CREATED, response_model=StuffResponse)
 async def create_stuff(
-    payload: StuffSchema, db_session: AsyncSession = Depends(get_db)
+    payload: StuffSchema, db_session: AsyncSession = Depends(get_db, scope="function")
 ):
-    stuff = Stuff(**payload.model_dump())
-    await stuff.save(db_session)
-    return stuff
+    return await Stuff.insert_returning(db_session, payload.model_dump())
+
+
+@router.get("/page", response_model=StuffPage)
+async def list_stuff(
+    cursor: Annotated[
+        str | None,
+        Query(description="Token returned as `next_cursor` by the previous page"),
+    ] = None,
+    limit: Annotated[int, Query(ge=1, le=1_000, description="Page size")] = 100,
+    db_session: AsyncSession = Depends(get_db, scope="function"),
+):
+    """
+    List Stuff rows ordered by name, one keyset page at a time.
+
+    Args:
+        cursor (str | None): Opaque token of the page to continue after; omit for the first page.
+        limit (int): The maximum number of rows to return.
+        db_session (AsyncSession): The database session to use for the query.
+
+    Returns:
+        dict: The page items and the cursor of the next page, if any.
+    """
+    items, last = await Stuff.keyset_page(db_session, decode_cursor(cursor), limit)
+    return {"items": items, "next_cursor": encode_cursor(last)}
+
+
+@router.get("/export")
+async def export_stuff(
+    request: Request,
+    chunk_size: Annotated[
+        int, Query(ge=1, le=50_000, description="Rows fetched and sent per chunk")
+    ] = 5_000,
+):
+    """
+    Stream every Stuff row as a chunked JSON array read from a server-side cursor.
+
+    Args:
+        request (Request): The incoming request. Used to access the application's connection pool.
+        chunk_size (int): Number of rows fetched from Postgres and sent per chunk.
+
+    Returns:
+        StreamingResponse: A JSON array of all rows ordered by name.
+    """
+    return StreamingResponse(
+        stream_json_array(request.app.postgres_pool, "stuff.export", chunk_size),
+        media_type="application/json",
+    )
+
+
+@router.get("/export/{file_format}")
+async def export_stuff_columnar(
+    request: Request,
+    file_format: ExportFormat,
+    params: Annotated[ExportParams, Query()],
+):
+    """
+    Stream Stuff rows as a Parquet, Arrow IPC stream or CSV file.
+
+    Args:
+        request (Request): The incoming request. Used to access the application's connection pool.
+        file_format (ExportFormat): Output format.
+        params (ExportParams): Columns to project, `column:op:value` filters and chunk size.
+
+    Returns:
+        StreamingResponse: The file, written one record batch per chunk of rows.
+    """
+    return columnar_export(
+        request.app.postgres_pool, Stuff.__table__, file_format, params
+    )
+
+
+@router.get("/random/export/{file_format}")
+async def export_random_stuff_columnar(
+    request: Request,
+    file_format: ExportFormat,
+    params: Annotated[ExportParams, Query()],
+):
+    """
+    Stream RandomStuff rows as a Parquet, Arrow IPC stream or CSV file.
+
+    `chaos` is exported as JSON text.
+
+    Args:
+        request (Request): The incoming request. Used to access the application's connection pool.
+        file_format (ExportFormat): Output format.
+        params (ExportParams): Columns to project, `column:op:value` filters and chunk size.
+
+    Returns:
+        StreamingResponse: The file, written one record batch per chunk of rows.
+    """
+    return columnar_export(
+        request.app.postgres_pool, RandomStuff.__table__, file_format, params
+    )
+
+
+@router.get("/similar", response_model=list[NameMatch])
+async def similar_stuff(
+    request: Request,
+    q: Annotated[str, Query(min_length=1, max_length=255, description="Name to match")],
+    limit: Annotated[
+        int, Query(ge=1, le=50, description="Maximum number of matches")
+    ] = 10,
+):
+    """
+    Find Stuff names similar to `q`, closest first, tolerating typos and reordering.
+
+    Args:
+        request (Request): The incoming request. Used to access the application's connection pool.
+        q (str): The name to match.
+        limit (int): The maximum number of matches to return.
+
+    Returns:
+        list[NameMatch]: Names whose trigram similarity reaches `pg_trgm.similarity_threshold`.
+    """
+    return await statement_registry.fetch(
+        request.app.postgres_pool, "stuff.similar", q=q, limit=limit
+    )
+
+
+@router.get("/autocomplete", response_model=list[NameMatch])
+async def autocomplete_stuff(
+    request: Request,
+    prefix: Annotated[
+        str, Query(min_length=1, max_length=255, description="Typed start of a name")
+    ],
+    limit: Annotated[
+        int, Query(ge=1, le=50, description="Maximum number of matches")
+    ] = 10,
+):
+    """
+    Complete a typed prefix to Stuff names, case-insensitively.
+
+    Recently requested prefixes are answered from this worker's memory for a few seconds.
+
+    Args:
+        request (Request): The incoming request. Used to access the application's connection pool.
+        prefix (str): The start of the name.
+        limit (int): The maximum number of matches to return.
+
+    Returns:
+        list[NameMatch]: Names starting with `prefix`, most similar first.
+    """
+    return await stuff_prefixes.get_or_load(
+        prefix,
+        limit,
+        lambda: statement_registry.fetch(
+            request.app.postgres_pool,
+            "stuff.autocomplete",
+            prefix=prefix,
+            pattern=like_prefix(prefix),
+            limit=limit,
+        ),
+    )
 
 
 @router.get("/{name}", response_model=StuffResponse)
-async def get_stuff(name: str, db_session: AsyncSession = Depends(get_db)):
-    result = await Stuff.get_by_name(db_session, name)
-    return result
+async def get_stuff(
+    request: Request,
+    name: str,
+    db_session: AsyncSession = Depends(get_db, scope="function"),
+):
+    payload = await stuff_cache.get_or_load(
+        request.app.cache, name, lambda: Stuff.get_by_name(db_session, name)
+    )
+    if payload is None:
+        return None
+    return Response(content=payload, media_type="application/json")
 
 
 @router.get("/pool/{name}", response_model=StuffResponse)
 async def find_stuff_pool(
     request: Request,
     name: str,
-    db_session: AsyncSession = Depends(get_db),
 ):
     """
     Asynchronous function to find a specific 'Stuff' object in the database using a connection pool.
 
-    This function compiles an SQL statement to find a 'Stuff' object by its name, executes the statement
-    using a connection from the application's connection pool, and returns the result as a dictionary.
+    This function runs the `stuff.get_by_name` statement from the statement registry. The statement
+    is compiled once at startup into parameterized SQL, so asyncpg reuses the prepared statement cached
+    on each pooled connection instead of parsing and planning a new literal query for every name.
+    Results are served through the read-through Stuff cache shared with `get_stuff`.
     If the 'Stuff' object is not found, it raises an HTTPException with a 404 status code.
-    If an SQLAlchemyError occurs during the execution of the SQL statement, it raises an HTTPException
+    If a Postgres error occurs during the execution of the SQL statement, it raises an HTTPException
     with a 422 status code.
 
     Args:
         request (Request): The incoming request. Used to access the application's connection pool.
         name (str): The name of the 'Stuff' object to find.
-        db_session (AsyncSession): The database session. Used to compile the SQL statement.
 
     Returns:
-        dict: The found 'Stuff' object as a dictionary.
+        Response: The found 'Stuff' object as JSON.
 
     Raises:
-        HTTPException: If the 'Stuff' object is not found or an SQLAlchemyError occurs.
+        HTTPException: If the 'Stuff' object is not found or a Postgres error occurs.
     """
+
+    async def load():
+        record = await statement_registry.fetchrow(
+            request.app.postgres_pool, "stuff.get_by_name", name=name
+        )
+        return dict(record) if record else None
+
     try:
-        stmt = await Stuff.get_by_name(db_session, name, compile_sql=True)
-        result = await request.app.postgres_pool.fetchrow(str(stmt))
-    except SQLAlchemyError as ex:
+        payload = await stuff_cache.get_or_load(request.app.cache, name, load)
+    except PostgresError as ex:
         raise HTTPException(
             status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=repr(ex)
         ) from ex
-    if not result:
+    if not payload:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Stuff with name {name} not found.",
         )
-    return dict(result)
+    return Response(content=payload, media_type="application/json")
 
 
 @router.delete("/{name}")
-async def delete_stuff(name: str, db_session: AsyncSession = Depends(get_db)):
-    stuff = await Stuff.get_by_name(db_session, name)
-    return await Stuff.delete(stuff, db_session)
+async def delete_stuff(
+    request: Request,
+    name: str,
+    db_session: AsyncSession = Depends(get_db, scope="function"),
+):
+    deleted = await Stuff.delete_by_key_returning(db_session, name)
+    if deleted is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Stuff with name {name} not found.",
+        )
+    await db_session.commit()
+    await stuff_cache.invalidate(request.app.cache, name)
+    return True
 
 
 @router.patch("/{name}", response_model=StuffResponse)
 async def update_stuff(
+    request: Request,
     payload: StuffSchema,
     name: str,
-    db_session: AsyncSession = Depends(get_db),
+    db_session: AsyncSession = Depends(get_db, scope="function"),
 ):
-    stuff = await Stuff.get_by_name(db_session, name)
-    await stuff.update(**payload.model_dump())
+    stuff = await Stuff.update_by_key_returning(db_session, name, payload.model_dump())
+    await db_session.commit()
+    await stuff_cache.invalidate(request.app.cache, name, payload.name)
     return stuff
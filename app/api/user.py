@@ -16,7 +16,9 @@ router = APIRouter(prefix="/v1/user")
 
 @router.post("/", status_code=status.HTTP_201_CREATED, response_model=UserResponse)
 async def create_user(
-    payload: UserSchema, request: Request, db_session: AsyncSession = Depends(get_db)
+    payload: UserSchema,
+    request: Request,
+    db_session: AsyncSession = Depends(get_db, scope="function"),
 ):
     await logger.ainfo(f"Creating user: {payload}")
     _user: User = User(**payload.model_dump())
@@ -33,7 +35,7 @@ async def create_user(
 async def get_token_for_user(
     user: Annotated[UserLogin, Form()],
     request: Request,
-    db_session: AsyncSession = Depends(get_db),
+    db_session: AsyncSession = Depends(get_db, scope="function"),
 ):
     _user: User = await User.find(db_session, [User.email == user.email])
 
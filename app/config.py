@@ -35,6 +35,40 @@ class Settings(BaseSettings):
     POSTGRES_DB: str
     POSTGRES_TEST_DB: str
 
+    # One pool per worker process, shared by SQLAlchemy sessions and raw asyncpg access
+    POSTGRES_POOL_SIZE: int = 5
+    POSTGRES_MAX_OVERFLOW: int = 5
+    POSTGRES_POOL_TIMEOUT: float = 30.0
+    POSTGRES_POOL_RECYCLE: int = 1800
+    POSTGRES_POOL_PRE_PING: bool = True
+    POSTGRES_STATEMENT_CACHE_SIZE: int = 100
+    POSTGRES_ECHO: bool = False
+
+    # Comma separated host[:port] list of read replicas, empty to read from the primary
+    POSTGRES_REPLICA_HOSTS: str = ""
+    POSTGRES_REPLICA_RETRY_AFTER: float = 30.0
+
+    CACHE_TTL_STUFF: int = 300
+    CACHE_TTL_NONSENSE: int = 300
+    # Autocomplete results kept per worker process, so staleness is bounded by the TTL
+    AUTOCOMPLETE_CACHE_TTL: float = 30.0
+    AUTOCOMPLETE_CACHE_SIZE: int = 1024
+    # Sounds-like and same-root paragraph matches served from Postgres, per worker process
+    RELATED_CACHE_TTL: float = 300.0
+    RELATED_CACHE_SIZE: int = 1024
+
+    # Background imports run per worker process; job state expires from Redis after the TTL
+    IMPORT_WORKERS: int = 2
+    IMPORT_JOB_TTL: int = 86400
+    # Reject files of imports, pruned after IMPORT_JOB_TTL; share it between workers
+    IMPORT_REJECTS_DIR: str = "/tmp/import-rejects"
+
+    # Memory-mapped concordance index files; built from Postgres when missing
+    CONCORDANCE_DIR: str = "/tmp/concordance"
+
+    # Seconds between refreshes of the statistics materialized views
+    STATS_REFRESH_INTERVAL: int = 300
+
     @computed_field
     @property
     def redis_url(self) -> RedisDsn:
@@ -81,6 +115,35 @@ class Settings(BaseSettings):
             path=self.POSTGRES_DB,
         )
 
+    @computed_field
+    @property
+    def replica_asyncpg_urls(self) -> list[PostgresDsn]:
+        """
+        This is a computed field that generates a PostgresDsn URL for asyncpg per read replica.
+
+        Each URL is built like `asyncpg_url`, with the host and optional port taken from one
+        entry of the comma separated POSTGRES_REPLICA_HOSTS environment variable.
+
+        Returns:
+            list[PostgresDsn]: The replica URLs, empty when no replica is configured.
+        """
+        urls = []
+        for replica in filter(
+            None, map(str.strip, self.POSTGRES_REPLICA_HOSTS.split(","))
+        ):
+            host, _, port = replica.partition(":")
+            urls.append(
+                MultiHostUrl.build(
+                    scheme="postgresql+asyncpg",
+                    username=self.POSTGRES_USER,
+                    password=self.POSTGRES_PASSWORD,
+                    host=host,
+                    port=int(port) if port else None,
+                    path=self.POSTGRES_DB,
+                )
+            )
+        return urls
+
     @computed_field
     @property
     def test_asyncpg_url(self) -> PostgresDsn:
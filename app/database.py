@@ -1,20 +1,137 @@
+import statistics
+import time
+from collections import deque
 from collections.abc import AsyncGenerator
+from contextlib import asynccontextmanager
+from typing import Any
 
+from asyncpg import Connection
+from attrs import define, field
+from fastapi import Request
 from fastapi.exceptions import ResponseValidationError
 from rotoger import get_logger
-from sqlalchemy.exc import SQLAlchemyError
-from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy import event
+from sqlalchemy.exc import DBAPIError, SQLAlchemyError
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 
 from app.config import settings as global_settings
 
 logger = get_logger()
 
+
+def _latency_summary(samples: deque[float], name: str) -> dict[str, Any]:
+    ordered = sorted(samples)
+    if not ordered:
+        return {"samples": 0}
+    return {
+        "samples": len(ordered),
+        f"{name}_ms_mean": round(statistics.fmean(ordered), 3),
+        f"{name}_ms_p50": round(ordered[len(ordered) // 2], 3),
+        f"{name}_ms_p99": round(
+            ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))], 3
+        ),
+        f"{name}_ms_max": round(ordered[-1], 3),
+    }
+
+
+@define(slots=True)
+class PoolStats:
+    """Checkout counters and recent checkout wait times of the connection pool."""
+
+    checkouts: int = field(default=0)
+    waits: deque[float] = field(factory=lambda: deque(maxlen=1000))
+
+    def record(self, seconds: float) -> None:
+        self.checkouts += 1
+        self.waits.append(seconds * 1000)
+
+    def summary(self) -> dict[str, Any]:
+        return {"checkouts": self.checkouts, **_latency_summary(self.waits, "wait")}
+
+
+@define(slots=True)
+class RouteCheckoutStats:
+    """
+    How long each route holds a pooled connection, from first use of its session to release.
+
+    Requests whose session never touched the database are only counted, which shows how many
+    checkouts lazy sessions save on a route.
+    """
+
+    sessions: dict[str, int] = field(factory=dict)
+    holds: dict[str, deque[float]] = field(factory=dict)
+
+    def record(self, route: str, seconds: float | None) -> None:
+        self.sessions[route] = self.sessions.get(route, 0) + 1
+        if seconds is not None:
+            self.holds.setdefault(route, deque(maxlen=1000)).append(seconds * 1000)
+
+    def summary(self) -> dict[str, Any]:
+        return {
+            route: {
+                "sessions": sessions,
+                "checkouts": len(self.holds.get(route, ())),
+                **_latency_summary(self.holds.get(route, deque()), "hold"),
+            }
+            for route, sessions in sorted(self.sessions.items())
+        }
+
+
+pool_stats = PoolStats()
+route_checkout_stats = RouteCheckoutStats()
+
+CHECKED_OUT_AT = "checked_out_at"
+
+
+@event.listens_for(Session, "after_begin")
+def _mark_checkout(session, *_) -> None:
+    # Sessions check out a connection lazily, when their first transaction begins
+    session.info.setdefault(CHECKED_OUT_AT, time.perf_counter())
+
+
+class TimedQueuePool(AsyncAdaptedQueuePool):
+    """Async queue pool that records how long every checkout waits, pre-ping included."""
+
+    def connect(self):
+        started = time.perf_counter()
+        try:
+            return super().connect()
+        finally:
+            pool_stats.record(time.perf_counter() - started)
+
+
+engine_options = {
+    "future": True,
+    "echo": global_settings.POSTGRES_ECHO,
+    "poolclass": TimedQueuePool,
+    "pool_size": global_settings.POSTGRES_POOL_SIZE,
+    "max_overflow": global_settings.POSTGRES_MAX_OVERFLOW,
+    "pool_timeout": global_settings.POSTGRES_POOL_TIMEOUT,
+    "pool_recycle": global_settings.POSTGRES_POOL_RECYCLE,
+    "pool_pre_ping": global_settings.POSTGRES_POOL_PRE_PING,
+    "connect_args": {
+        # asyncpg cache used by raw driver access, SQLAlchemy's own cache for sessions
+        "statement_cache_size": global_settings.POSTGRES_STATEMENT_CACHE_SIZE,
+        "prepared_statement_cache_size": global_settings.POSTGRES_STATEMENT_CACHE_SIZE,
+    },
+}
+
 engine = create_async_engine(
-    global_settings.asyncpg_url.unicode_string(),
-    future=True,
-    echo=True,
+    global_settings.asyncpg_url.unicode_string(), **engine_options
 )
 
+replica_engines = [
+    create_async_engine(url.unicode_string(), **engine_options)
+    for url in global_settings.replica_asyncpg_urls
+]
+
 test_engine = create_async_engine(
     global_settings.test_asyncpg_url.unicode_string(),
     future=True,
@@ -29,27 +146,215 @@ AsyncSessionFactory = async_sessionmaker(
     expire_on_commit=False,
 )
 
+# Transactions of read-only requests run as BEGIN READ ONLY on the primary pool
+ReadOnlySessionFactory = async_sessionmaker(
+    engine.execution_options(postgresql_readonly=True),
+    autoflush=False,
+    expire_on_commit=False,
+)
+
+ReplicaSessionFactories = [
+    async_sessionmaker(replica_engine, autoflush=False, expire_on_commit=False)
+    for replica_engine in replica_engines
+]
+
 TestAsyncSessionFactory = async_sessionmaker(
     test_engine,
     autoflush=False,
     expire_on_commit=False,
 )
 
+READ_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+
+
+@define(slots=True)
+class ReplicaRouter:
+    """
+    Round-robin, health-aware selection of read replica sessions.
+
+    Replicas are tried in turn starting after the last one used. A replica whose connection
+    cannot be checked out is skipped for `retry_after` seconds; when none is available the
+    primary serves the read, so losing every replica degrades to single-node behaviour.
+
+    Attributes:
+        primary (async_sessionmaker): Session factory of the primary.
+        replicas (list[async_sessionmaker]): Session factories of the replicas.
+        retry_after (float): Seconds a failed replica is left out of the rotation.
+    """
+
+    primary: async_sessionmaker
+    replicas: list[async_sessionmaker]
+    retry_after: float = 30.0
+    position: int = field(default=0)
+    down_until: dict[int, float] = field(factory=dict)
+
+    async def read_session(self) -> AsyncSession:
+        now = time.monotonic()
+        for offset in range(len(self.replicas)):
+            index = (self.position + offset) % len(self.replicas)
+            if self.down_until.get(index, 0) > now:
+                continue
+            session = self.replicas[index]()
+            try:
+                # Check the connection out now so a dead replica fails over before use
+                await session.connection()
+            except (DBAPIError, OSError) as ex:
+                await session.close()
+                self.down_until[index] = now + self.retry_after
+                await logger.awarning(
+                    f"Read replica unavailable: {repr(ex)}", replica=index
+                )
+                continue
+            self.position = index + 1
+            return session
+        return self.primary()
+
+
+replica_router = ReplicaRouter(
+    primary=ReadOnlySessionFactory,
+    replicas=ReplicaSessionFactories,
+    retry_after=global_settings.POSTGRES_REPLICA_RETRY_AFTER,
+)
+
+
+async def get_driver_connection(db_session: AsyncSession) -> Connection:
+    """
+    Return the asyncpg connection behind a session for driver-level APIs such as COPY.
+
+    Args:
+        db_session (AsyncSession): The session whose connection should be used.
+
+    Returns:
+        Connection: The asyncpg connection checked out by the session.
+    """
+    connection = await db_session.connection()
+    raw_connection = await connection.get_raw_connection()
+    return raw_connection.driver_connection
+
+
+@define(slots=True)
+class DriverPool:
+    """
+    asyncpg-style facade over the SQLAlchemy engine pool.
+
+    Raw asyncpg access (prepared statements, COPY, server-side cursors) checks out the same
+    pooled connections as SQLAlchemy sessions, so each worker holds a single set of Postgres
+    connections sized by `Settings` instead of a second, independent `asyncpg` pool.
+
+    Attributes:
+        engine (AsyncEngine): The engine whose pool is shared.
+    """
+
+    engine: AsyncEngine
+
+    @asynccontextmanager
+    async def acquire(self) -> AsyncGenerator[Connection]:
+        async with self.engine.connect() as connection:
+            raw_connection = await connection.get_raw_connection()
+            yield raw_connection.driver_connection
+
+    async def fetchrow(self, query: str, *args: Any):
+        async with self.acquire() as connection:
+            return await connection.fetchrow(query, *args)
+
+    async def fetch(self, query: str, *args: Any):
+        async with self.acquire() as connection:
+            return await connection.fetch(query, *args)
+
+    async def execute(self, query: str, *args: Any):
+        async with self.acquire() as connection:
+            return await connection.execute(query, *args)
+
+    def status(self) -> dict[str, Any]:
+        pool = self.engine.pool
+        return {
+            "size": pool.size(),
+            "checked_out": pool.checkedout(),
+            "idle": pool.checkedin(),
+            "overflow": pool.overflow(),
+            "max_overflow": global_settings.POSTGRES_MAX_OVERFLOW,
+            **pool_stats.summary(),
+            "routes": route_checkout_stats.summary(),
+        }
+
+
+@asynccontextmanager
+async def session_scope(
+    session: AsyncSession, route: str | None = None, read_only: bool = False
+) -> AsyncGenerator[AsyncSession]:
+    """
+    Run a request session and release its connection, committing unless it is read-only.
+
+    The session checks out a connection on its first statement, so a request that never
+    queries holds none. Read-only sessions are closed without COMMIT; closing rolls back the
+    READ ONLY transaction as the connection returns to the pool.
+
+    Args:
+        session (AsyncSession): The session to run.
+        route (str | None): Route the connection hold time is recorded under.
+        read_only (bool): Skip the commit at the end of the request.
+    """
+    try:
+        async with session:
+            try:
+                yield session
+                if not read_only:
+                    await session.commit()
+            except SQLAlchemyError:
+                # Re-raise SQLAlchemy errors to be handled by the global handler
+                raise
+            except Exception as ex:
+                # Only log actual database-related issues, not response validation
+                if not isinstance(ex, ResponseValidationError):
+                    await logger.aerror(f"Database-related error: {repr(ex)}")
+                raise  # Re-raise to be handled by appropriate handlers
+    finally:
+        if route is not None:
+            checked_out_at = session.info.pop(CHECKED_OUT_AT, None)
+            route_checkout_stats.record(
+                route,
+                None
+                if checked_out_at is None
+                else time.perf_counter() - checked_out_at,
+            )
+
+
+def _route_name(request: Request) -> str:
+    route = request.scope.get("route")
+    return f"{request.method} {getattr(route, 'path', request.url.path)}"
+
 
 # Dependency
-async def get_db() -> AsyncGenerator:
-    async with AsyncSessionFactory() as session:
-        try:
-            yield session
-            await session.commit()
-        except SQLAlchemyError:
-            # Re-raise SQLAlchemy errors to be handled by the global handler
-            raise
-        except Exception as ex:
-            # Only log actual database-related issues, not response validation
-            if not isinstance(ex, ResponseValidationError):
-                await logger.aerror(f"Database-related error: {repr(ex)}")
-            raise  # Re-raise to be handled by appropriate handlers
+async def get_db(request: Request) -> AsyncGenerator:
+    """
+    Lazily connected session for the request.
+
+    Read methods get a read replica, or the primary in a READ ONLY transaction, and are never
+    committed; everything a write request does, including reading its own writes, stays on the
+    primary. Routes declare it with `Depends(get_db, scope="function")` so the connection is
+    released as soon as the route returns instead of after the response is serialized and sent.
+    """
+    read_only = request.method in READ_METHODS
+    if read_only:
+        session = await replica_router.read_session()
+    else:
+        session = AsyncSessionFactory()
+    async with session_scope(session, _route_name(request), read_only) as db_session:
+        yield db_session
+
+
+async def get_read_db(request: Request) -> AsyncGenerator:
+    """Session on a read replica for explicitly read-only dependencies, whatever the method."""
+    session = await replica_router.read_session()
+    async with session_scope(session, _route_name(request), True) as db_session:
+        yield db_session
+
+
+async def get_primary_db(request: Request) -> AsyncGenerator:
+    """Session on the primary, for reads that must see the latest committed writes."""
+    session = AsyncSessionFactory()
+    async with session_scope(session, _route_name(request)) as db_session:
+        yield db_session
 
 
 async def get_test_db() -> AsyncGenerator:
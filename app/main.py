@@ -1,7 +1,6 @@
 from contextlib import asynccontextmanager
 from pathlib import Path
 
-import asyncpg
 from fastapi import Depends, FastAPI, Request
 from fastapi.responses import HTMLResponse
 from fastapi.templating import Jinja2Templates
@@ -15,11 +14,16 @@ from app.api.nonsense import router as nonsense_router
 from app.api.shakespeare import router as shakespeare_router
 from app.api.stuff import router as stuff_router
 from app.api.user import router as user_router
-from app.config import settings as global_settings
+from app.database import DriverPool, engine, replica_engines
 from app.exception_handlers import register_exception_handlers
 from app.middleware.profiler import ProfilingMiddleware
-from app.redis import get_redis
+from app.redis import get_cache, get_redis
 from app.services.auth import AuthBearer
+from app.services.concordance import concordance
+from app.services.jobs import import_jobs
+from app.services.lookups import shakespeare_lookups
+from app.services.stats import stats_refresher
+from app.utils.statements import statement_registry
 
 templates = Jinja2Templates(directory=Path(__file__).parent.parent / "templates")
 
@@ -28,23 +32,29 @@ templates = Jinja2Templates(directory=Path(__file__).parent.parent / "templates"
 async def lifespan(app: FastAPI):
     app.logger = get_logger()
     app.redis = await get_redis()
-    postgres_dsn = global_settings.postgres_url.unicode_string()
+    app.cache = await get_cache()
     try:
-        app.postgres_pool = await asyncpg.create_pool(
-            dsn=postgres_dsn,
-            min_size=5,
-            max_size=20,
-        )
+        app.postgres_pool = DriverPool(engine)
+        await app.postgres_pool.execute("SELECT 1")
+        await app.logger.ainfo("Postgres pool ready", **app.postgres_pool.status())
         await app.logger.ainfo(
-            "Postgres pool created", idle_size=app.postgres_pool.get_idle_size()
+            "SQL statements compiled", statements=statement_registry.compile_all()
         )
+        await shakespeare_lookups.reload(app.postgres_pool)
+        concordance.start(app.postgres_pool)
+        stats_refresher.start(app.postgres_pool)
         yield
     except Exception as e:
         await app.logger.aerror("Error during app startup", error=repr(e))
         raise
     finally:
+        await import_jobs.shutdown()
+        await concordance.shutdown()
+        await stats_refresher.shutdown()
         await app.redis.close()
-        await app.postgres_pool.close()
+        await app.cache.close()
+        for _engine in (engine, *replica_engines):
+            await _engine.dispose()
 
 
 middleware = [
@@ -97,6 +107,5 @@ app = create_app()
 # _scheduler_event_broker = RedisEventBroker(client_or_url=global_settings.redis_url.unicode_string())
 # _scheduler_himself = AsyncScheduler(_scheduler_data_store, _scheduler_event_broker)
 # app.add_middleware(SchedulerMiddleware, scheduler=_scheduler_himself)
-# TODO: every non-GET method should reset cache
 # TODO: scheduler tasks needing DB should access connection pool via request
 # TODO: https://stackoverflow.com/questions/16053364/make-sure-only-one-worker-launches-the-apscheduler-event-in-a-pyramid-web-app-ru
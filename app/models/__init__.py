@@ -1,5 +1,7 @@
 # for Alembic and unit tests
+from app.models.imports import *  # noqa
 from app.models.nonsense import *  # noqa
 from app.models.shakespeare import *  # noqa
+from app.models.stats import *  # noqa
 from app.models.stuff import *  # noqa
 from app.models.user import *  # noqa
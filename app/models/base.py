@@ -1,8 +1,19 @@
+from collections.abc import Sequence
 from typing import Any
 
-from asyncpg import UniqueViolationError
 from fastapi import HTTPException, status
 from rotoger import get_logger
+from sqlalchemy import (
+    RowMapping,
+    UniqueConstraint,
+    bindparam,
+    delete,
+    func,
+    inspect,
+    select,
+    update,
+)
+from sqlalchemy.dialects.postgresql import ARRAY, insert
 from sqlalchemy.exc import IntegrityError, SQLAlchemyError
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import DeclarativeBase, declared_attr
@@ -10,6 +21,11 @@ from sqlalchemy.orm import DeclarativeBase, declared_attr
 logger = get_logger()
 
 
+def _stored_columns(table) -> list:
+    # Generated columns such as tsvectors are maintained by Postgres and never returned
+    return [column for column in table.columns if column.computed is None]
+
+
 class Base(DeclarativeBase):
     id: Any
     __name__: str
@@ -44,16 +60,232 @@ class Base(DeclarativeBase):
                 status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=repr(ex)
             ) from ex
 
+    @classmethod
+    async def insert_returning(
+        cls, db_session: AsyncSession, values: dict[str, Any]
+    ) -> RowMapping:
+        """
+        Insert a row and return it in a single `INSERT ... RETURNING` round trip.
+
+        Unlike `save`, no ORM instance is added, flushed and refreshed; client-side defaults
+        such as generated ids are filled by the statement and the stored row comes back as a
+        plain mapping ready for the response model.
+
+        Args:
+            db_session (AsyncSession): The database session to use for the statement.
+            values (dict[str, Any]): Column values of the new row.
+
+        Returns:
+            RowMapping: The inserted row.
+        """
+        table = cls.__table__
+        stmt = insert(table).values(**values).returning(*_stored_columns(table))
+        result = await db_session.execute(stmt)
+        return result.mappings().one()
+
+    @classmethod
+    async def update_by_key_returning(
+        cls, db_session: AsyncSession, key: Any, values: dict[str, Any]
+    ) -> RowMapping | None:
+        """
+        Update the row with the given primary key and return it, in one `UPDATE ... RETURNING`.
+
+        Args:
+            db_session (AsyncSession): The database session to use for the statement.
+            key (Any): Primary key value of the row to update.
+            values (dict[str, Any]): Column values to set.
+
+        Returns:
+            RowMapping | None: The updated row, or `None` when no row has the key.
+        """
+        table = cls.__table__
+        stmt = (
+            update(table)
+            .where(cls.__mapper__.primary_key[0] == key)
+            .values(**values)
+            .returning(*_stored_columns(table))
+        )
+        result = await db_session.execute(stmt)
+        return result.mappings().one_or_none()
+
+    @classmethod
+    async def delete_by_key_returning(
+        cls, db_session: AsyncSession, key: Any
+    ) -> RowMapping | None:
+        """
+        Delete the row with the given primary key and return it, in one `DELETE ... RETURNING`.
+
+        Args:
+            db_session (AsyncSession): The database session to use for the statement.
+            key (Any): Primary key value of the row to delete.
+
+        Returns:
+            RowMapping | None: The deleted row, or `None` when no row has the key.
+        """
+        table = cls.__table__
+        stmt = (
+            delete(table)
+            .where(cls.__mapper__.primary_key[0] == key)
+            .returning(*_stored_columns(table))
+        )
+        result = await db_session.execute(stmt)
+        return result.mappings().one_or_none()
+
+    @classmethod
+    def upsert_key(cls) -> tuple[str, ...]:
+        """
+        Conflict target for upserts, derived from the table's unique constraints.
+
+        The primary key is used unless every column of it is filled by a client-side default
+        (a surrogate id that can never conflict); then the first unique constraint on caller
+        supplied columns is used instead, e.g. `email` for `User`.
+
+        Returns:
+            tuple[str, ...]: The column names of the conflict target.
+        """
+        table = cls.__table__
+        unique = sorted(
+            (
+                tuple(constraint.columns)
+                for constraint in table.constraints
+                if isinstance(constraint, UniqueConstraint)
+            ),
+            key=lambda columns: [column.name for column in columns],
+        )
+        for columns in [tuple(table.primary_key.columns), *unique]:
+            if not all(column.default is not None for column in columns):
+                return tuple(column.name for column in columns)
+        return tuple(column.name for column in table.primary_key.columns)
+
     async def save_or_update(self, db_session: AsyncSession):
+        """
+        Insert this instance or update the row it conflicts with, in one round trip.
+
+        Runs a single `INSERT ... ON CONFLICT (<upsert_key>) DO UPDATE ... RETURNING`, so the
+        conflict path costs no failed statement, SELECT or second UPDATE. Columns that are
+        unset on the instance keep their stored value on update.
+
+        Args:
+            db_session (AsyncSession): The database session to use for the statement.
+
+        Returns:
+            The persisted instance as stored after the insert or update.
+
+        Raises:
+            HTTPException: If the row violates a constraint other than the conflict target.
+        """
+        cls = type(self)
+        key = cls.upsert_key()
+        values = {
+            attr.key: getattr(self, attr.key)
+            for attr in inspect(cls).column_attrs
+            if attr.columns[0].computed is None and getattr(self, attr.key) is not None
+        }
+        stmt = insert(cls).values(**values)
+        updates = {name: stmt.excluded[name] for name in values if name not in key}
+        stmt = (
+            stmt.on_conflict_do_update(index_elements=key, set_=updates)
+            if updates
+            else stmt.on_conflict_do_nothing(index_elements=key)
+        ).returning(cls)
         try:
-            db_session.add(self)
-            await db_session.flush()
-            return True
+            result = await db_session.scalars(
+                stmt, execution_options={"populate_existing": True}
+            )
         except IntegrityError as exception:
-            if isinstance(exception.orig, UniqueViolationError):
-                return await db_session.merge(self)
-            else:
-                raise HTTPException(
-                    status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
-                    detail=repr(exception),
-                ) from exception
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                detail=repr(exception),
+            ) from exception
+        return result.one_or_none() or self
+
+    @classmethod
+    async def upsert_many(
+        cls, db_session: AsyncSession, rows: Sequence[dict[str, Any]]
+    ) -> int:
+        """
+        Upsert many rows with a single statement whatever the batch size.
+
+        Each column is sent as one array parameter and expanded server-side with `unnest`,
+        so the statement has one bind per column instead of one per value and stays far
+        below the protocol's parameter limit. Rows repeating a key keep the last occurrence,
+        as Postgres cannot update the same row twice in one statement.
+
+        Args:
+            db_session (AsyncSession): The database session to use for the statement.
+            rows (Sequence[dict[str, Any]]): Column values per row; all rows share the same keys.
+
+        Returns:
+            int: The number of rows inserted or updated.
+        """
+        if not rows:
+            return 0
+        table = cls.__table__
+        key = cls.upsert_key()
+        rows = list({tuple(row[name] for name in key): row for row in rows}.values())
+        provided = rows[0].keys()
+        columns = [
+            column
+            for column in table.columns
+            if column.name in provided or column.default is not None
+        ]
+
+        def value(row: dict[str, Any], column):
+            if column.name in row:
+                return row[column.name]
+            return (
+                column.default.arg(None)
+                if column.default.is_callable
+                else column.default.arg
+            )
+
+        source = select(
+            *(
+                func.unnest(
+                    bindparam(
+                        column.name,
+                        [value(row, column) for row in rows],
+                        type_=ARRAY(column.type),
+                    )
+                ).label(column.name)
+                for column in columns
+            )
+        )
+        stmt = insert(table).from_select([column.name for column in columns], source)
+        updates = {name: stmt.excluded[name] for name in provided if name not in key}
+        stmt = (
+            stmt.on_conflict_do_update(index_elements=key, set_=updates)
+            if updates
+            else stmt.on_conflict_do_nothing(index_elements=key)
+        )
+        result = await db_session.execute(stmt)
+        return result.rowcount
+
+    @classmethod
+    async def keyset_page(
+        cls, db_session: AsyncSession, after: Any, limit: int
+    ) -> tuple[Sequence[RowMapping], Any]:
+        """
+        Fetch one page of rows ordered by the primary key, starting after a given key.
+
+        Rows are selected as plain column mappings, so no ORM objects are hydrated, and the
+        `WHERE key > :after ... LIMIT` predicate keeps every page an index range scan
+        regardless of how deep the client has paged.
+
+        Args:
+            db_session (AsyncSession): The database session to use for the query.
+            after (Any): The key of the last row of the previous page, or `None` for the first page.
+            limit (int): The maximum number of rows to return.
+
+        Returns:
+            tuple: The rows of the page and the key to continue after, or `None` on the last page.
+        """
+        key = cls.__mapper__.primary_key[0]
+        stmt = select(*_stored_columns(cls.__table__)).order_by(key).limit(limit + 1)
+        if after is not None:
+            stmt = stmt.where(key > after)
+        result = await db_session.execute(stmt)
+        rows = result.mappings().all()
+        if len(rows) > limit:
+            return rows[:limit], rows[limit - 1][key.name]
+        return rows, None
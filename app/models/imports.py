@@ -0,0 +1,73 @@
+import uuid
+from datetime import datetime
+
+from sqlalchemy import (
+    TIMESTAMP,
+    Integer,
+    String,
+    Text,
+    UniqueConstraint,
+    bindparam,
+    cast,
+    func,
+    select,
+)
+from sqlalchemy.dialects.postgresql import JSONB, UUID, insert
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models.base import Base
+from app.utils.statements import statement_registry
+
+
+class ImportLedger(Base):
+    """
+    One row per completed file import, addressed by the content of the file.
+
+    `sha256` is the digest of the uploaded bytes; `fingerprint` also covers the options the
+    file was read with, so the same bytes imported with another column mapping or mode are a
+    different import. A matching fingerprint lets a re-sent file be answered from its ledger
+    entry without reading it again.
+    """
+
+    __tablename__ = "import_ledger"
+    __table_args__ = (
+        UniqueConstraint("target", "fingerprint"),
+        {"schema": "happy_hog"},
+    )
+    id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
+        primary_key=True,
+        server_default=func.gen_random_uuid(),
+    )
+    target: Mapped[str] = mapped_column(String, nullable=False)
+    fingerprint: Mapped[str] = mapped_column(String(64), nullable=False)
+    sha256: Mapped[str] = mapped_column(String(64), nullable=False, index=True)
+    source: Mapped[str | None] = mapped_column(String, index=True)
+    rows: Mapped[int] = mapped_column(Integer, nullable=False)
+    report: Mapped[dict] = mapped_column(JSONB, nullable=False)
+    created_at: Mapped[datetime] = mapped_column(
+        TIMESTAMP(timezone=True), nullable=False, server_default=func.now()
+    )
+
+
+statement_registry.register(
+    "import_ledger.find",
+    select(cast(ImportLedger.report, Text).label("report")).where(
+        ImportLedger.target == bindparam("target", type_=String),
+        ImportLedger.fingerprint == bindparam("fingerprint", type_=String),
+    ),
+)
+
+statement_registry.register(
+    "import_ledger.record",
+    insert(ImportLedger)
+    .values(
+        target=bindparam("target", type_=String),
+        fingerprint=bindparam("fingerprint", type_=String),
+        sha256=bindparam("sha256", type_=String),
+        source=bindparam("source", type_=String),
+        rows=bindparam("rows", type_=Integer),
+        report=cast(bindparam("report", type_=String), JSONB),
+    )
+    .on_conflict_do_nothing(index_elements=["target", "fingerprint"]),
+)
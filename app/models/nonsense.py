@@ -1,21 +1,47 @@
 import uuid
 
-from sqlalchemy import String, select
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy import (
+    Computed,
+    Float,
+    Index,
+    Integer,
+    String,
+    bindparam,
+    func,
+    literal_column,
+    select,
+)
+from sqlalchemy.dialects.postgresql import TSVECTOR, UUID
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Mapped, mapped_column
 
 from app.models.base import Base
+from app.utils.statements import name_lookups, statement_registry
 
 
 class Nonsense(Base):
     __tablename__ = "nonsense"
-    __table_args__ = ({"schema": "happy_hog"},)
+    __table_args__ = (
+        Index("ix_nonsense_description_tsv", "description_tsv", postgresql_using="gin"),
+        Index(
+            "ix_nonsense_name_trgm",
+            "name",
+            postgresql_using="gin",
+            postgresql_ops={"name": "gin_trgm_ops"},
+        ),
+        {"schema": "happy_hog"},
+    )
     id: Mapped[uuid:UUID] = mapped_column(
         UUID(as_uuid=True), unique=True, default=uuid.uuid4, autoincrement=True
     )
     name: Mapped[str] = mapped_column(String, primary_key=True, unique=True)
     description: Mapped[str | None]
+    # Stored by Postgres on write so searches never run to_tsvector per row
+    description_tsv: Mapped[str | None] = mapped_column(
+        TSVECTOR,
+        Computed("to_tsvector('english', coalesce(description, ''))", persisted=True),
+        deferred=True,
+    )
     # TODO: apply relation to other tables
 
     @classmethod
@@ -24,3 +50,31 @@ class Nonsense(Base):
         result = await db_session.execute(stmt)
         instance = result.scalars().first()
         return instance
+
+
+statement_registry.register(
+    "nonsense.export",
+    select(Nonsense.id, Nonsense.name, Nonsense.description).order_by(Nonsense.name),
+)
+
+
+_search_query = func.websearch_to_tsquery(
+    literal_column("'english'"), bindparam("q", type_=String)
+)
+
+statement_registry.register(
+    "nonsense.search",
+    select(
+        Nonsense.name,
+        Nonsense.description,
+        func.ts_rank_cd(Nonsense.description_tsv, _search_query, type_=Float).label(
+            "rank"
+        ),
+    )
+    .where(Nonsense.description_tsv.bool_op("@@")(_search_query))
+    .order_by(literal_column("rank").desc(), Nonsense.name)
+    .limit(bindparam("limit", type_=Integer)),
+)
+
+for lookup, stmt in name_lookups(Nonsense.name).items():
+    statement_registry.register(f"nonsense.{lookup}", stmt)
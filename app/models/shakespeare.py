@@ -1,18 +1,35 @@
+from collections.abc import Sequence
+from typing import Any
+
 from sqlalchemy import (
     Column,
+    Computed,
+    Float,
     ForeignKeyConstraint,
+    Index,
     Integer,
     PrimaryKeyConstraint,
+    RowMapping,
     String,
     Table,
     Text,
     UniqueConstraint,
+    bindparam,
+    cast,
+    func,
+    literal_column,
+    or_,
     select,
+    tuple_,
 )
+from sqlalchemy.dialects.postgresql import ARRAY, TSVECTOR, array
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Mapped, mapped_column, relationship
+from sqlalchemy.sql import ColumnElement
+from sqlalchemy.sql.selectable import ScalarSelect
 
 from app.models.base import Base
+from app.utils.statements import statement_registry
 
 
 class Character(Base):
@@ -73,6 +90,10 @@ class Wordform(Base):
     __tablename__ = "wordform"
     __table_args__ = (
         PrimaryKeyConstraint("id", name="wordform_pkey"),
+        # Normalization of query words, and expansion of a code to its forms
+        Index("ix_wordform_plain_text", "plain_text"),
+        Index("ix_wordform_phonetic_text", "phonetic_text"),
+        Index("ix_wordform_stem_text", "stem_text"),
         {"schema": "shakespeare"},
     )
 
@@ -219,7 +240,7 @@ class Paragraph(Base):
     - `work` (Work): The associated work.
 
     ### Class Method
-    - `find(cls, db_session: AsyncSession, character: str) -> List[Paragraph]`: A class method that finds paragraphs associated with a specific character. It takes a database session and the name of the character as arguments, and returns a list of matching paragraphs.
+    - `find(cls, db_session: AsyncSession, character_ids: Sequence[str], after, limit, fields) -> tuple`: A class method that finds one page of paragraphs associated with specific characters, projected to the requested columns.
 
     """
 
@@ -243,6 +264,14 @@ class Paragraph(Base):
             ["work_id"], ["shakespeare.work.id"], name="paragraph_work_id_fkey"
         ),
         PrimaryKeyConstraint("id", name="paragraph_pkey"),
+        # Serves the character filter and the (work_id, paragraph_num) keyset order of `find`
+        Index(
+            "ix_paragraph_character_work_num",
+            "character_id",
+            "work_id",
+            "paragraph_num",
+        ),
+        Index("ix_paragraph_text_tsv", "text_tsv", postgresql_using="gin"),
         {"schema": "shakespeare"},
     )
 
@@ -258,35 +287,221 @@ class Paragraph(Base):
     chapter_number: Mapped[int] = mapped_column(Integer)
     char_count: Mapped[int] = mapped_column(Integer)
     word_count: Mapped[int] = mapped_column(Integer)
+    # Stored by Postgres on write so searches never run to_tsvector per row
+    text_tsv: Mapped[str | None] = mapped_column(
+        TSVECTOR,
+        Computed("to_tsvector('english', coalesce(plain_text, ''))", persisted=True),
+        deferred=True,
+    )
 
     character: Mapped[Character] = relationship("Character", back_populates="paragraph")
     chapter: Mapped[Chapter] = relationship("Chapter", back_populates="paragraph")
     work: Mapped[Work] = relationship("Work", back_populates="paragraph")
 
     @classmethod
-    async def find(cls, db_session: AsyncSession, character: str):
+    async def find(
+        cls,
+        db_session: AsyncSession,
+        character_ids: Sequence[str],
+        after: tuple[str, int] | None = None,
+        limit: int = 100,
+        fields: Sequence[str] | None = None,
+    ) -> tuple[Sequence[RowMapping], Any]:
         """
-        `find` is a class method of the `Paragraph` class that finds paragraphs associated with a specific character.
+        `find` is a class method of the `Paragraph` class that finds one page of paragraphs associated with specific characters.
 
         ### Explanation
-        This method takes a database session (`db_session`) and the name of the character (`character`) as arguments.
-        It performs a database query to find paragraphs that are associated with the specified character.
-        The method returns a list of matching paragraphs.
+        Paragraphs are ordered by `(work_id, paragraph_num)` and a page starts after the key of the last row of the previous one,
+        so every page is an index range scan however deep the client pages. Only the requested columns are selected, as plain
+        mappings without ORM objects. Character names are resolved to ids in memory by the caller, so the query joins
+        nothing and is a range scan of the `(character_id, work_id, paragraph_num)` index.
+        `work_id` and `paragraph_num` are always selected as they make up the cursor.
 
         ### Args
         - `db_session` (AsyncSession): The database session to use for the query.
-        - `character` (str): The name of the character to find paragraphs for.
+        - `character_ids` (Sequence[str]): The ids of the characters to find paragraphs for; a name can belong to several.
+        - `after` (tuple[str, int] | None): The `(work_id, paragraph_num)` of the last row of the previous page, or `None` for the first page.
+        - `limit` (int): The maximum number of paragraphs to return.
+        - `fields` (Sequence[str] | None): Paragraph columns to return; all columns when `None`.
 
         ### Returns
-        - List[Paragraph]: A list of `Paragraph` objects that are associated with the specified character.
+        - tuple: The rows of the page and the key to continue after, or `None` on the last page.
 
         """
+        table = cls.__table__
+        key = (table.c.work_id, table.c.paragraph_num)
+        names = fields or [column.name for column in table.c if column.computed is None]
+        columns = [*key, *(table.c[name] for name in names if name not in key)]
         stmt = (
-            select(cls)
-            .join(Character)
-            .join(Chapter)
-            .join(Work)
-            .where(Character.name == character)
+            select(*columns)
+            .where(cls.character_id.in_(character_ids))
+            .order_by(*key)
+            .limit(limit + 1)
         )
+        if after is not None:
+            stmt = stmt.where(tuple_(*key) > tuple_(*after))
         result = await db_session.execute(stmt)
-        return result.scalars().all()
+        rows = result.mappings().all()
+        if len(rows) > limit:
+            last = rows[limit - 1]
+            return rows[:limit], [last["work_id"], last["paragraph_num"]]
+        return rows, None
+
+
+_search_query = func.websearch_to_tsquery(
+    literal_column("'english'"), bindparam("q", type_=String)
+)
+_work_id = bindparam("work_id", type_=String)
+_character = bindparam("character", type_=String)
+_genre = bindparam("genre", type_=String)
+_hits = (
+    select(
+        Paragraph.id,
+        Paragraph.work_id,
+        Paragraph.paragraph_num,
+        Paragraph.plain_text,
+        Work.title.label("work_title"),
+        Character.name.label("character"),
+        func.ts_rank_cd(Paragraph.text_tsv, _search_query, type_=Float).label("rank"),
+    )
+    .join(Work, Work.id == Paragraph.work_id)
+    .join(Character, Character.id == Paragraph.character_id)
+    .where(
+        Paragraph.text_tsv.bool_op("@@")(_search_query),
+        or_(_work_id.is_(None), Paragraph.work_id == _work_id),
+        or_(_character.is_(None), Character.name == _character),
+        or_(_genre.is_(None), Work.genre_type == _genre),
+    )
+    .order_by(literal_column("rank").desc(), Paragraph.id)
+    .limit(bindparam("limit", type_=Integer))
+    .subquery("hits")
+)
+
+# Headlines are built for the ranked page only, as ts_headline re-parses each document
+statement_registry.register(
+    "paragraph.search",
+    select(
+        _hits.c.id,
+        _hits.c.work_id,
+        _hits.c.paragraph_num,
+        _hits.c.work_title,
+        _hits.c.character,
+        _hits.c.rank,
+        func.ts_headline(
+            literal_column("'english'"),
+            _hits.c.plain_text,
+            _search_query,
+            literal_column("'StartSel=<b>, StopSel=</b>, MaxFragments=2, MaxWords=20'"),
+            type_=Text,
+        ).label("snippet"),
+    ).order_by(_hits.c.rank.desc(), _hits.c.id),
+)
+
+# Same filters as an ILIKE scan, the baseline of `performance/search_benchmark.py`
+statement_registry.register(
+    "paragraph.search_ilike",
+    select(
+        Paragraph.id,
+        Paragraph.work_id,
+        Paragraph.paragraph_num,
+        Work.title.label("work_title"),
+        Character.name.label("character"),
+    )
+    .join(Work, Work.id == Paragraph.work_id)
+    .join(Character, Character.id == Paragraph.character_id)
+    .where(
+        Paragraph.plain_text.ilike(bindparam("pattern", type_=String)),
+        or_(_work_id.is_(None), Paragraph.work_id == _work_id),
+        or_(_character.is_(None), Character.name == _character),
+        or_(_genre.is_(None), Work.genre_type == _genre),
+    )
+    .limit(bindparam("limit", type_=Integer)),
+)
+
+statement_registry.register(
+    "paragraph.corpus",
+    select(
+        Paragraph.id, Paragraph.work_id, Paragraph.paragraph_num, Paragraph.plain_text
+    ).order_by(Paragraph.work_id, Paragraph.paragraph_num),
+)
+
+statement_registry.register(
+    "wordform.codes",
+    select(Wordform.plain_text, Wordform.stem_text, Wordform.phonetic_text),
+)
+
+statement_registry.register(
+    "character.lookup",
+    select(Character.id, Character.name, Character.abbrev, Character.speech_count),
+)
+
+statement_registry.register(
+    "work.lookup",
+    select(Work.id, Work.title, Work.long_title, Work.year, Work.genre_type),
+)
+
+
+def _terms(column) -> ColumnElement:
+    return func.string_to_array(column, literal_column("' '"), type_=ARRAY(Text))
+
+
+# Whole-word matching of the space-separated codes of a paragraph
+Index(
+    "ix_paragraph_phonetic_terms",
+    _terms(Paragraph.phonetic_text),
+    postgresql_using="gin",
+)
+Index("ix_paragraph_stem_terms", _terms(Paragraph.stem_text), postgresql_using="gin")
+
+_word = func.lower(bindparam("word", type_=String))
+_code = bindparam("code", type_=String)
+
+
+def _code_of(column) -> ScalarSelect:
+    return (
+        select(func.min(column)).where(Wordform.plain_text == _word).scalar_subquery()
+    )
+
+
+# Words of the dataset get its own codes; other words the nearest Postgres equivalent
+statement_registry.register(
+    "wordform.normalize",
+    select(
+        func.coalesce(
+            _code_of(Wordform.phonetic_text),
+            func.metaphone(_word, literal_column("16"), type_=String),
+        ).label("sounds_like"),
+        func.coalesce(
+            _code_of(Wordform.stem_text),
+            func.ts_lexize(literal_column("'english_stem'"), _word, type_=ARRAY(Text))[
+                literal_column("1")
+            ],
+            _word,
+        ).label("same_root"),
+    ),
+)
+
+for _mode, _column, _paragraph_column in (
+    ("sounds_like", Wordform.phonetic_text, Paragraph.phonetic_text),
+    ("same_root", Wordform.stem_text, Paragraph.stem_text),
+):
+    statement_registry.register(
+        f"wordform.{_mode}",
+        select(Wordform.plain_text.label("form"), Wordform.occurences.label("count"))
+        .where(_column == _code)
+        .order_by(Wordform.occurences.desc(), Wordform.plain_text)
+        .limit(bindparam("limit", type_=Integer)),
+    )
+    statement_registry.register(
+        f"paragraph.{_mode}",
+        select(
+            Paragraph.id,
+            Paragraph.work_id,
+            Paragraph.paragraph_num,
+            Paragraph.plain_text,
+            func.count().over().label("total"),
+        )
+        .where(_terms(_paragraph_column).contains(cast(array([_code]), ARRAY(Text))))
+        .order_by(Paragraph.work_id, Paragraph.paragraph_num)
+        .limit(bindparam("limit", type_=Integer)),
+    )
@@ -0,0 +1,233 @@
+from datetime import datetime
+
+from sqlalchemy import (
+    DDL,
+    TIMESTAMP,
+    BigInteger,
+    Column,
+    Float,
+    Integer,
+    MetaData,
+    String,
+    Table,
+    bindparam,
+    event,
+    func,
+    literal_column,
+    or_,
+    select,
+    text,
+)
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models.base import Base
+from app.utils.statements import statement_registry
+
+# Materialized views are created by Alembic and by `Base.metadata.create_all` through the
+# DDL events below; they live in their own metadata so they are never mistaken for tables.
+# Every selected column is grouped explicitly: grouping by a primary key alone makes the
+# view depend on that key, and the seed loader could no longer drop it.
+views = MetaData(schema="shakespeare")
+
+STATS_VIEWS: dict[str, tuple[str, tuple[str, ...]]] = {
+    "character_act_stats": (
+        """
+        SELECT p.work_id, p.character_id, c.name AS character_name, p.section_number,
+               count(*) AS paragraphs,
+               sum(p.word_count)::bigint AS words,
+               sum(p.char_count)::bigint AS chars
+        FROM shakespeare.paragraph p
+        JOIN shakespeare.character c ON c.id = p.character_id
+        GROUP BY p.work_id, p.character_id, c.name, p.section_number
+        """,
+        ("work_id", "character_id", "section_number"),
+    ),
+    "work_stats": (
+        """
+        SELECT w.id AS work_id, w.title, w.genre_type, w.year,
+               count(DISTINCT p.section_number) AS acts,
+               count(DISTINCT p.character_id) AS characters,
+               count(p.id) AS paragraphs,
+               coalesce(sum(p.word_count), 0)::bigint AS words,
+               coalesce(sum(p.char_count), 0)::bigint AS chars
+        FROM shakespeare.work w
+        LEFT JOIN shakespeare.paragraph p ON p.work_id = w.id
+        GROUP BY w.id, w.title, w.genre_type, w.year
+        """,
+        ("work_id",),
+    ),
+    "genre_stats": (
+        """
+        SELECT w.genre_type,
+               count(DISTINCT w.id) AS works,
+               count(p.id) AS paragraphs,
+               coalesce(sum(p.word_count), 0)::bigint AS words,
+               coalesce(sum(p.char_count), 0)::bigint AS chars
+        FROM shakespeare.work w
+        LEFT JOIN shakespeare.paragraph p ON p.work_id = w.id
+        GROUP BY w.genre_type
+        """,
+        ("genre_type",),
+    ),
+}
+
+# Tables whose changes make the views stale
+STATS_SOURCES = ("paragraph", "character", "work")
+
+
+class StatsRefresh(Base):
+    """
+    Refresh generation of each statistics materialized view.
+
+    `generation` grows by one on every refresh and tags the responses served from the view,
+    so clients can revalidate them with `If-None-Match`. `source_version` is the number of
+    rows written to the source tables, as counted by Postgres statistics, when the view was
+    last refreshed; while it is unchanged a scheduled refresh is skipped.
+    """
+
+    __tablename__ = "stats_refresh"
+    __table_args__ = {"schema": "shakespeare"}
+
+    view: Mapped[str] = mapped_column(String(64), primary_key=True)
+    generation: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    source_version: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    seconds: Mapped[float] = mapped_column(Float, nullable=False)
+    refreshed_at: Mapped[datetime] = mapped_column(
+        TIMESTAMP(timezone=True), nullable=False, server_default=func.now()
+    )
+
+
+character_act_stats = Table(
+    "character_act_stats",
+    views,
+    Column("work_id", String(32)),
+    Column("character_id", String(32)),
+    Column("character_name", String(64)),
+    Column("section_number", Integer),
+    Column("paragraphs", BigInteger),
+    Column("words", BigInteger),
+    Column("chars", BigInteger),
+)
+
+work_stats = Table(
+    "work_stats",
+    views,
+    Column("work_id", String(32)),
+    Column("title", String(32)),
+    Column("genre_type", String(1)),
+    Column("year", Integer),
+    Column("acts", BigInteger),
+    Column("characters", BigInteger),
+    Column("paragraphs", BigInteger),
+    Column("words", BigInteger),
+    Column("chars", BigInteger),
+)
+
+genre_stats = Table(
+    "genre_stats",
+    views,
+    Column("genre_type", String(1)),
+    Column("works", BigInteger),
+    Column("paragraphs", BigInteger),
+    Column("words", BigInteger),
+    Column("chars", BigInteger),
+)
+
+for _view, (_query, _key) in STATS_VIEWS.items():
+    event.listen(
+        Base.metadata,
+        "after_create",
+        DDL(f"CREATE MATERIALIZED VIEW IF NOT EXISTS shakespeare.{_view} AS {_query}"),
+    )
+    # CONCURRENTLY refreshes need a unique index covering every row
+    event.listen(
+        Base.metadata,
+        "after_create",
+        DDL(
+            f"CREATE UNIQUE INDEX IF NOT EXISTS ix_{_view}_key "
+            f"ON shakespeare.{_view} ({', '.join(_key)})"
+        ),
+    )
+    event.listen(
+        Base.metadata,
+        "before_drop",
+        DDL(f"DROP MATERIALIZED VIEW IF EXISTS shakespeare.{_view}"),
+    )
+
+
+def refresh_view_sql(view: str) -> str:
+    if view not in STATS_VIEWS:
+        raise ValueError(f"Unknown statistics view {view!r}")
+    return f"REFRESH MATERIALIZED VIEW CONCURRENTLY shakespeare.{view}"
+
+
+statement_registry.register(
+    "stats.generation",
+    select(
+        StatsRefresh.generation, StatsRefresh.source_version, StatsRefresh.refreshed_at
+    ).where(StatsRefresh.view == bindparam("view", type_=String)),
+)
+
+statement_registry.register(
+    "stats.source_version",
+    text(
+        "SELECT coalesce(sum(n_tup_ins + n_tup_upd + n_tup_del), 0)::bigint "
+        "FROM pg_stat_user_tables "
+        "WHERE schemaname = 'shakespeare' "
+        f"AND relname IN ({', '.join(repr(name) for name in STATS_SOURCES)})"
+    ),
+)
+
+# Held until the refresh transaction ends, so one worker refreshes at a time
+statement_registry.register(
+    "stats.try_lock",
+    text("SELECT pg_try_advisory_xact_lock(hashtext('shakespeare.stats_refresh'))"),
+)
+
+statement_registry.register(
+    "stats.record_refresh",
+    insert(StatsRefresh)
+    .values(
+        view=bindparam("view", type_=String),
+        generation=literal_column("1"),
+        source_version=bindparam("source_version", type_=BigInteger),
+        seconds=bindparam("seconds", type_=Float),
+    )
+    .on_conflict_do_update(
+        index_elements=[StatsRefresh.view],
+        set_={
+            "generation": StatsRefresh.generation + literal_column("1"),
+            "source_version": bindparam("source_version", type_=BigInteger),
+            "seconds": bindparam("seconds", type_=Float),
+            "refreshed_at": func.now(),
+        },
+    )
+    .returning(StatsRefresh.generation),
+)
+
+statement_registry.register(
+    "stats.character_acts",
+    select(character_act_stats)
+    .where(character_act_stats.c.work_id == bindparam("work_id", type_=String))
+    .order_by(
+        character_act_stats.c.character_name, character_act_stats.c.section_number
+    ),
+)
+
+statement_registry.register(
+    "stats.works",
+    select(work_stats)
+    .where(
+        or_(
+            bindparam("genre", type_=String).is_(None),
+            work_stats.c.genre_type == bindparam("genre", type_=String),
+        )
+    )
+    .order_by(work_stats.c.work_id),
+)
+
+statement_registry.register(
+    "stats.genres",
+    select(genre_stats).order_by(genre_stats.c.genre_type),
+)
@@ -1,6 +1,6 @@
 import uuid
 
-from sqlalchemy import ForeignKey, String, select
+from sqlalchemy import ForeignKey, Index, String, bindparam, select
 from sqlalchemy.dialects.postgresql import JSON, UUID
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Mapped, joinedload, mapped_column, relationship
@@ -8,6 +8,7 @@ from sqlalchemy.orm import Mapped, joinedload, mapped_column, relationship
 from app.models.base import Base
 from app.models.nonsense import Nonsense
 from app.utils.decorators import compile_sql_or_scalar
+from app.utils.statements import name_lookups, statement_registry
 
 
 class RandomStuff(Base):
@@ -22,7 +23,15 @@ class RandomStuff(Base):
 
 class Stuff(Base):
     __tablename__ = "stuff"
-    __table_args__ = ({"schema": "happy_hog"},)
+    __table_args__ = (
+        Index(
+            "ix_stuff_name_trgm",
+            "name",
+            postgresql_using="gin",
+            postgresql_ops={"name": "gin_trgm_ops"},
+        ),
+        {"schema": "happy_hog"},
+    )
     id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True), unique=True, default=uuid.uuid4, autoincrement=True
     )
@@ -46,8 +55,26 @@ class StuffFullOfNonsense(Base):
     id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True), default=uuid.uuid4, primary_key=True
     )
-    stuff_id: Mapped[Stuff] = mapped_column(UUID, ForeignKey("happy_hog.stuff.id"))
+    stuff_id: Mapped[Stuff] = mapped_column(
+        UUID, ForeignKey("happy_hog.stuff.id", ondelete="CASCADE")
+    )
     nonsense_id: Mapped[Nonsense] = mapped_column(
         UUID, ForeignKey("happy_hog.nonsense.id")
     )
     but_why: Mapped[str | None]
+
+
+statement_registry.register(
+    "stuff.get_by_name",
+    select(Stuff.id, Stuff.name, Stuff.description).where(
+        Stuff.name == bindparam("name")
+    ),
+)
+
+statement_registry.register(
+    "stuff.export",
+    select(Stuff.id, Stuff.name, Stuff.description).order_by(Stuff.name),
+)
+
+for lookup, stmt in name_lookups(Stuff.name).items():
+    statement_registry.register(f"stuff.{lookup}", stmt)
@@ -0,0 +1,175 @@
+from typing import Any, Literal
+
+from pydantic import BaseModel, Field
+
+
+class RejectedRow(BaseModel):
+    index: int = Field(
+        title="Index",
+        description="Position of the row in the payload, or its line number for NDJSON",
+    )
+    key: Any = Field(
+        default=None,
+        title="Key",
+        description="Natural key of the row when it could be read",
+    )
+    reason: str = Field(
+        title="Reason",
+        description="Why the row was not inserted",
+    )
+
+
+class BulkReport(BaseModel):
+    inserted: int = Field(
+        default=0,
+        title="Inserted",
+        description="Number of rows inserted",
+    )
+    rejected: list[RejectedRow] = Field(
+        default_factory=list,
+        title="Rejected",
+        description="Rows that were not inserted, with the reason for each",
+    )
+
+
+class IngestReport(BulkReport):
+    lines: int = Field(
+        default=0,
+        title="Lines",
+        description="Number of NDJSON lines read from the request body",
+    )
+    batches: int = Field(
+        default=0,
+        title="Batches",
+        description="Number of batches flushed to the database",
+    )
+
+
+class ImportReport(BaseModel):
+    filename: str | None = Field(
+        default=None,
+        title="Filename",
+        description="Name of the uploaded file",
+    )
+    rows: int = Field(
+        default=0,
+        title="Rows",
+        description="Number of rows read from the file",
+    )
+    inserted: int = Field(
+        default=0,
+        title="Inserted",
+        description="Number of rows inserted",
+    )
+    rejected: int = Field(
+        default=0,
+        title="Rejected",
+        description="Rows that failed validation and were written to the reject file",
+    )
+    rejects_id: str | None = Field(
+        default=None,
+        title="Rejects id",
+        description="Id of the downloadable reject file, when rows were rejected",
+    )
+    updated: int = Field(
+        default=0,
+        title="Updated",
+        description="Existing rows whose values changed, updated in diff mode",
+    )
+    skipped: int = Field(
+        default=0,
+        title="Skipped",
+        description="Valid rows not written because their key exists, or in diff mode "
+        "because the stored row is identical",
+    )
+    sha256: str | None = Field(
+        default=None,
+        title="SHA-256",
+        description="Digest of the uploaded file",
+    )
+    duplicate: bool = Field(
+        default=False,
+        title="Duplicate",
+        description="The same file was imported before; the report is the ledger entry "
+        "of that import and nothing was read or written",
+    )
+    batches: int = Field(
+        default=0,
+        title="Batches",
+        description="Number of Arrow batches copied to the database",
+    )
+    seconds: float = Field(
+        default=0.0,
+        title="Seconds",
+        description="Time spent reading and loading the file",
+    )
+    rows_per_second: float | None = Field(
+        default=None,
+        title="Rows per second",
+        description="Import throughput",
+    )
+    worker_peak_memory_mb: float | None = Field(
+        default=None,
+        title="Worker peak memory",
+        description=(
+            "High-water mark in MiB of the worker process's resident memory since it "
+            "started; it covers earlier imports too, not this one alone"
+        ),
+    )
+
+
+class ImportJobStatus(BaseModel):
+    job_id: str = Field(
+        title="Job id",
+        description="Identifier to poll the job with",
+    )
+    status: Literal["queued", "running", "completed", "failed", "cancelled"] = Field(
+        default="queued",
+        title="Status",
+        description="Lifecycle state of the job",
+    )
+    filename: str | None = Field(
+        default=None,
+        title="Filename",
+        description="Name of the uploaded file",
+    )
+    rows_processed: int = Field(
+        default=0,
+        title="Rows processed",
+        description="Rows read and copied to the database so far",
+    )
+    rows_rejected: int = Field(
+        default=0,
+        title="Rows rejected",
+        description="Processed rows that failed validation or already existed",
+    )
+    rejects_id: str | None = Field(
+        default=None,
+        title="Rejects id",
+        description="Id of the downloadable reject file, when rows were rejected",
+    )
+    rows_total: int | None = Field(
+        default=None,
+        title="Rows total",
+        description="Rows in the file, when the format records it in its metadata",
+    )
+    rows_per_second: float | None = Field(
+        default=None,
+        title="Rows per second",
+        description="Throughput so far",
+    )
+    eta_seconds: float | None = Field(
+        default=None,
+        title="ETA",
+        description="Estimated seconds until completion, when the row total is known",
+    )
+    error: str | None = Field(
+        default=None,
+        title="Error",
+        description="Why the job failed",
+    )
+    report: ImportReport | None = Field(
+        default=None,
+        title="Report",
+        description="Final import report once the job has completed",
+    )
@@ -0,0 +1,21 @@
+from pydantic import BaseModel, Field
+
+
+class ExportParams(BaseModel):
+    columns: list[str] | None = Field(
+        default=None,
+        title="Columns",
+        description="Columns to export, in order; all columns when omitted",
+    )
+    filter: list[str] | None = Field(
+        default=None,
+        title="Filter",
+        description="Conditions as `column:op:value` with op one of eq, ne, lt, le, gt, ge, like",
+    )
+    chunk_size: int = Field(
+        default=10_000,
+        ge=1,
+        le=100_000,
+        title="Chunk size",
+        description="Rows fetched from Postgres and written per record batch",
+    )
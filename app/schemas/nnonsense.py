@@ -50,3 +50,29 @@ class NonsenseResponse(BaseModel):
     #             "description": "Some Nonsense Description",
     #         }
     #     }
+
+
+class NonsensePage(BaseModel):
+    items: list[NonsenseResponse] = Field(
+        title="Items",
+        description="Rows of this page ordered by name",
+    )
+    next_cursor: str | None = Field(
+        title="Next cursor",
+        description="Token for the next page, or null on the last page",
+    )
+
+
+class NonsenseSearchHit(BaseModel):
+    name: str = Field(
+        title="Name",
+        description="Name of the matching row",
+    )
+    description: str | None = Field(
+        title="Description",
+        description="Description that matched the query",
+    )
+    rank: float = Field(
+        title="Rank",
+        description="ts_rank_cd score of the match; higher is better",
+    )
@@ -0,0 +1,12 @@
+from pydantic import BaseModel, Field
+
+
+class NameMatch(BaseModel):
+    name: str = Field(
+        title="Name",
+        description="Name of the matching row",
+    )
+    score: float = Field(
+        title="Score",
+        description="Trigram similarity to the query, from 0 to 1; higher is closer",
+    )
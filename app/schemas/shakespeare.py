@@ -1,6 +1,21 @@
-from typing import Any
+from typing import Any, Literal
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
+
+ParagraphField = Literal[
+    "id",
+    "work_id",
+    "paragraph_num",
+    "character_id",
+    "plain_text",
+    "phonetic_text",
+    "stem_text",
+    "paragraph_type",
+    "section_number",
+    "chapter_number",
+    "char_count",
+    "word_count",
+]
 
 
 class Character(BaseModel):
@@ -47,3 +62,193 @@ class Paragraph(BaseModel):
     character: Character
     chapter: Chapter
     work: Work
+
+
+class CharacterSummary(BaseModel):
+    id: str = Field(title="Id", description="Character id")
+    name: str = Field(title="Name", description="Character name")
+    abbrev: str | None = Field(title="Abbreviation", description="Short name")
+    speech_count: int = Field(title="Speech count", description="Number of speeches")
+
+
+class WorkSummary(BaseModel):
+    id: str = Field(title="Id", description="Work id")
+    title: str = Field(title="Title", description="Title of the work")
+    long_title: str = Field(title="Long title", description="Full title of the work")
+    year: int = Field(title="Year", description="Year of the work")
+    genre_type: str = Field(
+        title="Genre type", description="Genre type, e.g. `t` or `c`"
+    )
+
+
+class ParagraphPage(BaseModel):
+    items: list[dict[str, Any]] = Field(
+        title="Items",
+        description="Paragraphs of this page ordered by work and paragraph number, "
+        "with the requested fields",
+    )
+    next_cursor: str | None = Field(
+        title="Next cursor",
+        description="Token for the next page, or null on the last page",
+    )
+    characters: dict[str, CharacterSummary] = Field(
+        default_factory=dict,
+        title="Characters",
+        description="Characters of the page items by id, when `character_id` is selected",
+    )
+    works: dict[str, WorkSummary] = Field(
+        default_factory=dict,
+        title="Works",
+        description="Works of the page items by id",
+    )
+
+
+class ParagraphSearchHit(BaseModel):
+    id: int = Field(title="Id", description="Paragraph id")
+    work_id: str = Field(title="Work id", description="Work the paragraph belongs to")
+    paragraph_num: int = Field(
+        title="Paragraph number", description="Position of the paragraph in the work"
+    )
+    work_title: str = Field(title="Work title", description="Title of the work")
+    character: str = Field(title="Character", description="Name of the speaker")
+    rank: float = Field(
+        title="Rank", description="ts_rank_cd score of the match; higher is better"
+    )
+    snippet: str = Field(
+        title="Snippet",
+        description="Fragments of the paragraph with matched words wrapped in <b></b>",
+    )
+
+
+class FormCount(BaseModel):
+    form: str = Field(title="Form", description="Lowercased word form")
+    count: int = Field(title="Count", description="Number of occurrences")
+
+
+class WordFrequency(BaseModel):
+    word: str = Field(title="Word", description="The requested word")
+    forms: list[FormCount] = Field(
+        title="Forms", description="Occurrences per matched form, most frequent first"
+    )
+    count: int = Field(title="Count", description="Occurrences of all matched forms")
+    paragraphs: int = Field(
+        title="Paragraphs", description="Number of paragraphs containing a matched form"
+    )
+
+
+class KwicLine(BaseModel):
+    paragraph_id: int = Field(title="Paragraph id", description="Paragraph id")
+    work_id: str = Field(title="Work id", description="Work the paragraph belongs to")
+    paragraph_num: int = Field(
+        title="Paragraph number", description="Position of the paragraph in the work"
+    )
+    left: str = Field(title="Left", description="Context before the keyword")
+    keyword: str = Field(title="Keyword", description="The keyword as written")
+    right: str = Field(title="Right", description="Context after the keyword")
+
+
+class ConcordancePage(BaseModel):
+    total: int = Field(title="Total", description="Occurrences of the keyword")
+    lines: list[KwicLine] = Field(
+        title="Lines",
+        description="Keyword-in-context lines of this page, in corpus order",
+    )
+
+
+class ConcordanceStats(BaseModel):
+    ready: bool = Field(title="Ready", description="Whether the index is loaded")
+    source: str | None = Field(
+        default=None,
+        title="Source",
+        description="`built` from Postgres or `loaded` from the saved files",
+    )
+    seconds: float | None = Field(
+        default=None, title="Seconds", description="Time taken to build or load"
+    )
+    paragraphs: int | None = Field(
+        default=None, title="Paragraphs", description="Indexed paragraphs"
+    )
+    tokens: int | None = Field(
+        default=None, title="Tokens", description="Indexed words"
+    )
+    terms: int | None = Field(
+        default=None, title="Terms", description="Distinct lowercased word forms"
+    )
+    index_mb: float | None = Field(
+        default=None, title="Index MB", description="Size of the index arrays"
+    )
+    peak_memory_mb: float | None = Field(
+        default=None,
+        title="Peak memory MB",
+        description="Peak resident memory of the worker once the index was ready",
+    )
+
+
+class CharacterActStats(BaseModel):
+    work_id: str = Field(title="Work id", description="Work of the character")
+    character_id: str = Field(title="Character id", description="Character id")
+    character_name: str = Field(title="Character name", description="Character name")
+    section_number: int = Field(title="Act", description="Act (section) number")
+    paragraphs: int = Field(title="Lines", description="Paragraphs spoken in the act")
+    words: int = Field(title="Words", description="Words spoken in the act")
+    chars: int = Field(title="Characters", description="Characters of text in the act")
+
+
+class WorkStats(BaseModel):
+    work_id: str = Field(title="Work id", description="Work id")
+    title: str = Field(title="Title", description="Title of the work")
+    genre_type: str = Field(
+        title="Genre type", description="Genre type, e.g. `t` or `c`"
+    )
+    year: int = Field(title="Year", description="Year of the work")
+    acts: int = Field(title="Acts", description="Number of acts with paragraphs")
+    characters: int = Field(title="Characters", description="Number of speakers")
+    paragraphs: int = Field(title="Paragraphs", description="Number of paragraphs")
+    words: int = Field(title="Words", description="Words of all paragraphs")
+    chars: int = Field(title="Chars", description="Characters of all paragraphs")
+
+
+class GenreStats(BaseModel):
+    genre_type: str = Field(
+        title="Genre type", description="Genre type, e.g. `t` or `c`"
+    )
+    works: int = Field(title="Works", description="Number of works of the genre")
+    paragraphs: int = Field(title="Paragraphs", description="Number of paragraphs")
+    words: int = Field(title="Words", description="Words of all paragraphs")
+    chars: int = Field(title="Chars", description="Characters of all paragraphs")
+
+
+RelatedMode = Literal["sounds_like", "same_root"]
+
+
+class RelatedParagraph(BaseModel):
+    id: int = Field(title="Id", description="Paragraph id")
+    work_id: str = Field(title="Work id", description="Work the paragraph belongs to")
+    paragraph_num: int = Field(
+        title="Paragraph number", description="Position of the paragraph in the work"
+    )
+    plain_text: str = Field(title="Text", description="Text of the paragraph")
+
+
+class RelatedWords(BaseModel):
+    word: str = Field(title="Word", description="The requested word")
+    mode: RelatedMode = Field(
+        title="Mode", description="`sounds_like` or `same_root` matching"
+    )
+    code: str | None = Field(
+        title="Code", description="Phonetic code or stem the word normalizes to"
+    )
+    source: Literal["memory", "postgres"] = Field(
+        title="Source",
+        description="Answered from the in-memory concordance or from Postgres",
+    )
+    forms: list[FormCount] = Field(
+        title="Forms", description="Word forms sharing the code, most frequent first"
+    )
+    total: int = Field(
+        title="Total", description="Number of paragraphs containing one of the forms"
+    )
+    paragraphs: list[RelatedParagraph] = Field(
+        title="Paragraphs",
+        description="First matching paragraphs ordered by work and paragraph number",
+    )
@@ -55,3 +55,14 @@ class StuffResponse(BaseModel):
     #             "description": "Some Stuff Description",
     #         }
     #     }
+
+
+class StuffPage(BaseModel):
+    items: list[StuffResponse] = Field(
+        title="Items",
+        description="Rows of this page ordered by name",
+    )
+    next_cursor: str | None = Field(
+        title="Next cursor",
+        description="Token for the next page, or null on the last page",
+    )
@@ -0,0 +1,304 @@
+import io
+from collections.abc import AsyncGenerator, AsyncIterable, Iterable
+from typing import Any
+
+import orjson
+import pyarrow as pa
+from asyncpg import Connection
+from attrs import define, field
+from pyarrow import csv as pa_csv
+from pydantic import BaseModel, ValidationError
+from rotoger import get_logger
+from sqlalchemy import Table
+
+from app.schemas.bulk import BulkReport, IngestReport, RejectedRow
+from app.services.validation import FrameRules
+
+logger = get_logger()
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+
+def _validation_reason(ex: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(loc) for loc in error['loc']) or 'row'}: {error['msg']}"
+        for error in ex.errors()
+    )
+
+
+@define(slots=True)
+class StagedCopy:
+    """
+    Bulk loader that streams rows into a table with COPY through a temporary staging table.
+
+    Rows are copied into a session-local temp table shaped like the target, then moved with
+    a single `INSERT ... SELECT ... ON CONFLICT DO NOTHING RETURNING`. Rows that hit a unique
+    constraint are skipped by Postgres and reported back instead of aborting the whole load,
+    and no ORM objects or unit of work are involved.
+
+    Attributes:
+        table (Table): The target table.
+        columns (tuple[str, ...]): Columns written by the loader, in COPY order.
+        key (str): Natural key column used to match returned rows to submitted ones.
+        generated (dict[str, str]): SQL expressions for columns that Arrow batches do not
+            carry, e.g. `{"id": "gen_random_uuid()"}` for a client-side generated id.
+        rules (FrameRules | None): Constraints Arrow batches are validated against before COPY.
+    """
+
+    table: Table
+    columns: tuple[str, ...]
+    key: str
+    generated: dict[str, str] = field(factory=dict)
+    rules: FrameRules | None = None
+
+    @property
+    def target(self) -> str:
+        return f"{self.table.schema}.{self.table.name}"
+
+    @property
+    def staging(self) -> str:
+        return f"staging_{self.table.name}"
+
+    def record(self, values: dict[str, Any]) -> tuple:
+        """Build a COPY record, filling client-side column defaults such as generated ids."""
+        return tuple(
+            values[column]
+            if column in values
+            else self.table.c[column].default.arg(None)
+            for column in self.columns
+        )
+
+    async def load(self, connection: Connection, records: list[tuple]) -> set[Any]:
+        """
+        Copy records into the target table.
+
+        Args:
+            connection (Connection): The asyncpg connection to load through.
+            records (list[tuple]): Records in `columns` order.
+
+        Returns:
+            set: Keys of the rows that were actually inserted.
+        """
+        if not records:
+            return set()
+        columns = ", ".join(self.columns)
+        async with connection.transaction():
+            await connection.execute(
+                f"CREATE TEMP TABLE IF NOT EXISTS {self.staging} "
+                f"(LIKE {self.target} INCLUDING DEFAULTS) ON COMMIT DROP"
+            )
+            await connection.execute(f"TRUNCATE {self.staging}")
+            await connection.copy_records_to_table(
+                self.staging, records=records, columns=list(self.columns)
+            )
+            inserted = await connection.fetch(
+                f"INSERT INTO {self.target} ({columns}) "
+                f"SELECT {columns} FROM {self.staging} "
+                f"ON CONFLICT DO NOTHING RETURNING {self.key}"
+            )
+        return {row[self.key] for row in inserted}
+
+    @property
+    def arrow_columns(self) -> list[str]:
+        return [column for column in self.columns if column not in self.generated]
+
+    @staticmethod
+    def encode_csv(batch: pa.RecordBatch | pa.Table) -> io.BytesIO:
+        """Render an Arrow batch as headerless CSV for COPY, entirely in Arrow's C++ writer."""
+        buffer = io.BytesIO()
+        pa_csv.write_csv(batch, buffer, pa_csv.WriteOptions(include_header=False))
+        buffer.seek(0)
+        return buffer
+
+    async def load_csv(
+        self, connection: Connection, source: io.BytesIO, update: bool = False
+    ) -> tuple[int, list[Any]]:
+        """
+        COPY a CSV buffer of `arrow_columns` into the target table.
+
+        Strings are quoted by the Arrow writer while nulls are left empty, so Postgres reads
+        empty strings and NULLs apart. Rows without a key are dropped by the final
+        `INSERT ... SELECT`, and rows whose key already exists are skipped or, with `update`,
+        overwritten only when a value differs, so unchanged rows cost no write. Nothing is
+        returned row by row.
+
+        Args:
+            connection (Connection): The asyncpg connection to load through.
+            source (io.BytesIO): CSV produced by `encode_csv`.
+            update (bool): Update existing rows whose values changed instead of skipping them.
+
+        Returns:
+            tuple[int, list[Any]]: The number of rows inserted and the keys of updated rows.
+        """
+        columns = self.arrow_columns
+        staging = f"{self.staging}_arrow"
+        selected = ", ".join(columns)
+        changed = [column for column in columns if column != self.key]
+        async with connection.transaction():
+            # CREATE TABLE AS copies column types only, so generated NOT NULL columns stay empty
+            await connection.execute(
+                f"CREATE TEMP TABLE IF NOT EXISTS {staging} ON COMMIT DROP "
+                f"AS SELECT {selected} FROM {self.target} WITH NO DATA"
+            )
+            await connection.execute(f"TRUNCATE {staging}")
+            await connection.copy_to_table(
+                staging, source=source, columns=columns, format="csv"
+            )
+            insert = (
+                f"INSERT INTO {self.target} AS target "
+                f"({', '.join([*columns, *self.generated])}) "
+                f"SELECT {', '.join([*columns, *self.generated.values()])} "
+                f"FROM {staging} WHERE {self.key} IS NOT NULL "
+            )
+            if not (update and changed):
+                status = await connection.execute(f"{insert} ON CONFLICT DO NOTHING")
+                # Command tag is "INSERT 0 <rows>"
+                return int(status.split()[-1]), []
+            # xmax is 0 only on freshly inserted row versions
+            merged = await connection.fetchrow(
+                f"WITH merged AS ({insert} ON CONFLICT ({self.key}) DO UPDATE SET "
+                f"{', '.join(f'{column} = excluded.{column}' for column in changed)} "
+                f"WHERE ({', '.join(f'target.{column}' for column in changed)}) "
+                f"IS DISTINCT FROM "
+                f"({', '.join(f'excluded.{column}' for column in changed)}) "
+                f"RETURNING {self.key}, xmax = 0 AS inserted) "
+                f"SELECT count(*) FILTER (WHERE inserted) AS inserted, "
+                f"coalesce(array_agg({self.key}) FILTER (WHERE NOT inserted), '{{}}') "
+                f"AS updated FROM merged"
+            )
+        return merged["inserted"], merged["updated"]
+
+    async def ingest(
+        self,
+        connection: Connection,
+        schema: type[BaseModel],
+        rows: Iterable[tuple[int, Any]],
+        report: BulkReport,
+    ) -> BulkReport:
+        """
+        Validate raw rows with `schema`, load the valid ones and record every rejection.
+
+        Args:
+            connection (Connection): The asyncpg connection to load through.
+            schema (type[BaseModel]): Pydantic schema each row must satisfy.
+            rows (Iterable[tuple[int, Any]]): Raw rows paired with their position in the payload.
+            report (BulkReport): Request-scoped report updated in place.
+
+        Returns:
+            BulkReport: The updated report.
+        """
+        records: list[tuple] = []
+        positions: dict[Any, int] = {}
+        key_index = self.columns.index(self.key)
+        for index, raw in rows:
+            key = raw.get(self.key) if isinstance(raw, dict) else None
+            try:
+                values = schema.model_validate(raw).model_dump()
+            except ValidationError as ex:
+                report.rejected.append(
+                    RejectedRow(index=index, key=key, reason=_validation_reason(ex))
+                )
+                continue
+            record = self.record(values)
+            if record[key_index] in positions:
+                report.rejected.append(
+                    RejectedRow(
+                        index=index,
+                        key=record[key_index],
+                        reason=f"duplicate {self.key} in payload",
+                    )
+                )
+                continue
+            positions[record[key_index]] = index
+            records.append(record)
+
+        inserted = await self.load(connection, records)
+        report.inserted += len(inserted)
+        report.rejected.extend(
+            RejectedRow(
+                index=index,
+                key=key,
+                reason=f"{self.key} already exists in {self.target}",
+            )
+            for key, index in positions.items()
+            if key not in inserted
+        )
+        return report
+
+
+async def iter_ndjson_batches(
+    chunks: AsyncIterable[bytes], batch_size: int, report: IngestReport
+) -> AsyncGenerator[list[tuple[int, Any]]]:
+    """
+    Split a streamed NDJSON body into batches of decoded lines.
+
+    Only the current partial line and one batch are held in memory. Blank lines are skipped
+    and lines that are not valid JSON are recorded in `report` under their line number.
+
+    Args:
+        chunks (AsyncIterable[bytes]): The raw body chunks, e.g. `request.stream()`.
+        batch_size (int): Number of decoded lines per batch.
+        report (IngestReport): Report updated with line counters and JSON errors.
+
+    Yields:
+        list[tuple[int, Any]]: Decoded lines paired with their 1-based line number.
+    """
+    buffer = b""
+    batch: list[tuple[int, Any]] = []
+
+    def decode(line: bytes) -> None:
+        report.lines += 1
+        if not line.strip():
+            return
+        try:
+            batch.append((report.lines, orjson.loads(line)))
+        except orjson.JSONDecodeError as ex:
+            report.rejected.append(
+                RejectedRow(index=report.lines, reason=f"invalid JSON: {ex}")
+            )
+
+    async for chunk in chunks:
+        buffer += chunk
+        *lines, buffer = buffer.split(b"\n")
+        for line in lines:
+            decode(line)
+            if len(batch) >= batch_size:
+                yield batch
+                batch = []
+    if buffer:
+        decode(buffer)
+    if batch:
+        yield batch
+
+
+async def ingest_ndjson(
+    chunks: AsyncIterable[bytes],
+    connection: Connection,
+    loader: StagedCopy,
+    schema: type[BaseModel],
+    batch_size: int,
+) -> IngestReport:
+    """
+    Validate and load an NDJSON stream batch by batch while it is still being received.
+
+    Args:
+        chunks (AsyncIterable[bytes]): The raw body chunks, e.g. `request.stream()`.
+        connection (Connection): The asyncpg connection to load through.
+        loader (StagedCopy): Loader for the target table.
+        schema (type[BaseModel]): Pydantic schema each line must satisfy.
+        batch_size (int): Number of lines flushed to Postgres at a time.
+
+    Returns:
+        IngestReport: Progress counters and the line numbers of rejected rows.
+    """
+    report = IngestReport()
+    async for batch in iter_ndjson_batches(chunks, batch_size, report):
+        await loader.ingest(connection, schema, batch, report)
+        report.batches += 1
+        await logger.ainfo(
+            f"Ingest into {loader.target} in progress",
+            lines=report.lines,
+            inserted=report.inserted,
+            rejected=len(report.rejected),
+        )
+    return report
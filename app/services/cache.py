@@ -0,0 +1,239 @@
+import asyncio
+import os
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable, Sequence
+from typing import Any
+
+from attrs import define, field
+from pydantic import BaseModel
+from redis.exceptions import RedisError
+from rotoger import get_logger
+
+from app.config import settings as global_settings
+from app.schemas.nnonsense import NonsenseResponse
+from app.schemas.stuff import StuffResponse
+
+logger = get_logger()
+
+
+@define(slots=True)
+class ResponseCache:
+    """
+    Read-through Redis cache of serialized response payloads for one model.
+
+    Payloads are stored as the JSON bytes of the response schema under
+    `cache:<namespace>:<name>`, so a hit is returned to the client without touching
+    Postgres or re-serializing. Misses are not cached, which keeps inserts from ever
+    needing an invalidation; updates and deletes invalidate the exact keys they touch.
+    Redis errors are logged and treated as misses so the cache can never take reads down.
+
+    Attributes:
+        namespace (str): Key prefix for the model.
+        schema (type[BaseModel]): Response schema used to serialize payloads.
+        ttl (int): Expiry of cached payloads in seconds.
+        hits (int): Hits served by this worker.
+        misses (int): Misses seen by this worker.
+    """
+
+    namespace: str
+    schema: type[BaseModel]
+    ttl: int
+    hits: int = field(default=0)
+    misses: int = field(default=0)
+
+    def key(self, name: str) -> str:
+        return f"cache:{self.namespace}:{name}"
+
+    async def get_or_load(
+        self, client, name: str, loader: Callable[[], Awaitable[Any]]
+    ) -> bytes | None:
+        """
+        Return the cached payload for `name`, loading and caching it on a miss.
+
+        Args:
+            client: The binary Redis client from `get_cache()`.
+            name (str): The natural key of the row.
+            loader (Callable[[], Awaitable[Any]]): Loads the row from Postgres on a miss.
+
+        Returns:
+            bytes | None: The JSON payload, or `None` when the row does not exist.
+        """
+        key = self.key(name)
+        try:
+            payload = await client.get(key)
+        except RedisError as ex:
+            await logger.aerror(f"Cache read error: {repr(ex)}", key=key)
+            payload = None
+        if payload is not None:
+            self.hits += 1
+            return payload
+        self.misses += 1
+        instance = await loader()
+        if instance is None:
+            return None
+        payload = self.schema.model_validate(instance).model_dump_json().encode()
+        try:
+            await client.set(key, payload, ex=self.ttl)
+        except RedisError as ex:
+            await logger.aerror(f"Cache write error: {repr(ex)}", key=key)
+        return payload
+
+    async def invalidate(self, client, *names: str) -> None:
+        """
+        Drop the cached payloads of the given names.
+
+        Redis errors are logged and swallowed: the write has already committed, so the
+        response goes out and a stale payload lives at most until its TTL expires.
+        """
+        if not names:
+            return
+        keys = {self.key(name) for name in names}
+        try:
+            await client.delete(*keys)
+        except RedisError as ex:
+            await logger.aerror(
+                f"Cache invalidation error: {repr(ex)}", keys=sorted(keys)
+            )
+
+    def stats(self) -> dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "namespace": self.namespace,
+            "ttl": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else None,
+        }
+
+
+stuff_cache = ResponseCache(
+    namespace="stuff", schema=StuffResponse, ttl=global_settings.CACHE_TTL_STUFF
+)
+nonsense_cache = ResponseCache(
+    namespace="nonsense",
+    schema=NonsenseResponse,
+    ttl=global_settings.CACHE_TTL_NONSENSE,
+)
+
+
+@define(slots=True)
+class PrefixCache:
+    """
+    Small in-process LRU of autocomplete results keyed by lowercased prefix and limit.
+
+    Typing bursts repeat the same few prefixes within seconds, so results are kept in the
+    worker for `ttl` seconds instead of round-tripping to Redis or Postgres. The pending
+    load itself is cached: concurrent requests for a prefix that is not cached yet await
+    one query. Entries are never invalidated on write; the short TTL bounds staleness.
+
+    Attributes:
+        namespace (str): Name reported in the stats.
+        ttl (float): Seconds a result is served from memory.
+        size (int): Maximum number of prefixes kept; the least recently used go first.
+        entries (OrderedDict): Expiry time and loading task per key.
+        hits (int): Lookups served from memory by this worker.
+        misses (int): Lookups that reached Postgres.
+    """
+
+    namespace: str
+    ttl: float
+    size: int
+    entries: OrderedDict[tuple[str, int], tuple[float, asyncio.Task]] = field(
+        factory=OrderedDict
+    )
+    hits: int = field(default=0)
+    misses: int = field(default=0)
+
+    async def get_or_load(
+        self,
+        prefix: str,
+        limit: int,
+        loader: Callable[[], Awaitable[Sequence[Any]]],
+    ) -> list[dict[str, Any]]:
+        """
+        Return the cached matches of `prefix`, loading them on a miss.
+
+        Args:
+            prefix (str): The typed prefix; matching is case-insensitive.
+            limit (int): Number of matches requested.
+            loader (Callable[[], Awaitable[Sequence[Any]]]): Queries Postgres on a miss.
+
+        Returns:
+            list[dict[str, Any]]: The matches, as plain dicts.
+        """
+        key = (prefix.lower(), limit)
+        now = time.monotonic()
+        entry = self.entries.get(key)
+        if entry is not None and entry[0] > now:
+            self.hits += 1
+            self.entries.move_to_end(key)
+            return await asyncio.shield(entry[1])
+        self.misses += 1
+        # The load runs as its own task, so a cancelled request that started it does not
+        # cancel it for the requests waiting on the same key
+        task = asyncio.create_task(self._load(loader))
+        task.add_done_callback(lambda done: self._settle(key, done))
+        self.entries[key] = (now + self.ttl, task)
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.size:
+            self.entries.popitem(last=False)
+        return await asyncio.shield(task)
+
+    @staticmethod
+    async def _load(
+        loader: Callable[[], Awaitable[Sequence[Any]]],
+    ) -> list[dict[str, Any]]:
+        return [dict(row) for row in await loader()]
+
+    def _settle(self, key: tuple[str, int], task: asyncio.Task) -> None:
+        # Retrieving the error keeps the loop from logging it when nobody is left waiting
+        if task.cancelled() or task.exception() is not None:
+            if self.entries.get(key, (None, None))[1] is task:
+                del self.entries[key]
+
+    def stats(self) -> dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "namespace": self.namespace,
+            "ttl": self.ttl,
+            "size": len(self.entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else None,
+        }
+
+
+stuff_prefixes = PrefixCache(
+    namespace="stuff.autocomplete",
+    ttl=global_settings.AUTOCOMPLETE_CACHE_TTL,
+    size=global_settings.AUTOCOMPLETE_CACHE_SIZE,
+)
+nonsense_prefixes = PrefixCache(
+    namespace="nonsense.autocomplete",
+    ttl=global_settings.AUTOCOMPLETE_CACHE_TTL,
+    size=global_settings.AUTOCOMPLETE_CACHE_SIZE,
+)
+# Keyed by match mode and code, so every spelling that normalizes alike shares an entry
+related_paragraphs = PrefixCache(
+    namespace="shakespeare.related",
+    ttl=global_settings.RELATED_CACHE_TTL,
+    size=global_settings.RELATED_CACHE_SIZE,
+)
+
+
+def cache_stats() -> dict[str, Any]:
+    """Hit/miss counters of every response and prefix cache in this worker process."""
+    return {
+        "pid": os.getpid(),
+        "caches": [
+            cache.stats()
+            for cache in (
+                stuff_cache,
+                nonsense_cache,
+                stuff_prefixes,
+                nonsense_prefixes,
+                related_paragraphs,
+            )
+        ],
+    }
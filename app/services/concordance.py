@@ -0,0 +1,591 @@
+import asyncio
+import bisect
+import fcntl
+import re
+import shutil
+import tempfile
+import time
+from array import array
+from collections import Counter
+from collections.abc import AsyncIterator, Iterator
+from contextlib import asynccontextmanager
+from pathlib import Path
+from typing import Any, Self
+
+import pyarrow as pa
+import pyarrow.compute as pc
+from attrs import define, field
+from fastapi import HTTPException, status
+from pyarrow import ipc
+from rotoger import get_logger
+from starlette.concurrency import run_in_threadpool
+
+from app.config import settings as global_settings
+from app.services.imports import peak_memory_mb
+from app.utils.statements import statement_registry
+
+logger = get_logger()
+
+WORD_PATTERN = re.compile(r"[a-z]+(?:'[a-z]+)*")
+
+# One Arrow IPC file per table, memory-mapped on load
+TABLES = ("paragraphs", "tokens", "terms", "postings")
+
+
+def _uint32(values: array) -> pa.Array:
+    return pa.Array.from_buffers(pa.uint32(), len(values), [None, pa.py_buffer(values)])
+
+
+def _view(column: pa.ChunkedArray) -> memoryview:
+    """Zero-copy view of a uint32 column, indexable at C speed without Arrow scalars."""
+    chunk = column.combine_chunks()
+    width = chunk.type.byte_width
+    data = memoryview(chunk.buffers()[1])
+    return data[chunk.offset * width : (chunk.offset + len(chunk)) * width].cast("I")
+
+
+@define(slots=True)
+class Concordance:
+    """
+    Array-backed inverted index of the words of every Shakespeare paragraph.
+
+    The corpus is stored as four Arrow tables of fixed-width columns:
+
+    - `paragraphs`: id, work_id, paragraph_num, plain_text and `token_start`, the index of the
+      paragraph's first token.
+    - `tokens`: the forward index; the term id and character offset of every word, in
+      paragraph order.
+    - `terms`: the vocabulary; each lowercased word form, its stem and phonetic code from
+      `wordform`, and `posting_start`, the index of its first posting.
+    - `postings`: the inverted index; token indices grouped by term, then in corpus order.
+
+    Offsets delimit a term's postings and a paragraph's tokens, so a lookup is two slices
+    with no per-word Python objects. Saved tables are memory-mapped on load, so the pages are
+    shared between workers and read lazily by the OS instead of being parsed into the heap.
+    Only the vocabulary, stem and phonetic dictionaries are built in Python.
+
+    Attributes:
+        paragraphs (pa.Table): Paragraph metadata and text.
+        tokens (pa.Table): Forward index.
+        terms (pa.Table): Vocabulary.
+        postings (pa.Table): Inverted index.
+        source (str): `built` from Postgres or `loaded` from disk.
+        seconds (float): Time taken to build or load the index.
+    """
+
+    paragraphs: pa.Table
+    tokens: pa.Table
+    terms: pa.Table
+    postings: pa.Table
+    source: str
+    seconds: float
+    term_ids: dict[str, int] = field(init=False)
+    stem_ids: dict[str, list[int]] = field(init=False)
+    stem_of: dict[str, str] = field(init=False)
+    phonetic_ids: dict[str, list[int]] = field(init=False)
+    phonetic_of: dict[str, str] = field(init=False)
+    token_start: memoryview = field(init=False)
+    token_term: memoryview = field(init=False)
+    token_offset: memoryview = field(init=False)
+    posting_start: memoryview = field(init=False)
+    posting_token: memoryview = field(init=False)
+    frequent: list[int] = field(init=False)
+
+    def __attrs_post_init__(self) -> None:
+        forms = self.terms.column("term").to_pylist()
+        stems = self.terms.column("stem").to_pylist()
+        self.term_ids = {form: index for index, form in enumerate(forms)}
+        self.stem_of = {
+            form: stem
+            for form, stem in zip(forms, stems, strict=True)
+            if stem is not None
+        }
+        self.stem_ids = {}
+        for index, stem in enumerate(stems):
+            if stem is not None:
+                self.stem_ids.setdefault(stem, []).append(index)
+        phonetics = self.terms.column("phonetic").to_pylist()
+        self.phonetic_of = {
+            form: code
+            for form, code in zip(forms, phonetics, strict=True)
+            if code is not None
+        }
+        self.phonetic_ids = {}
+        for index, code in enumerate(phonetics):
+            if code is not None:
+                self.phonetic_ids.setdefault(code, []).append(index)
+        self.token_start = _view(self.paragraphs.column("token_start"))
+        self.token_term = _view(self.tokens.column("term"))
+        self.token_offset = _view(self.tokens.column("offset"))
+        self.posting_start = _view(self.terms.column("posting_start"))
+        self.posting_token = _view(self.postings.column("token"))
+        self.frequent = sorted(
+            range(len(forms)), key=lambda term: -len(self.postings_of(term))
+        )
+
+    @classmethod
+    def build(
+        cls,
+        paragraphs: list[tuple[int, str, int, str]],
+        wordforms: dict[str, str],
+        phonetics: dict[str, str] | None = None,
+    ) -> Self:
+        """
+        Tokenize paragraphs and build the forward and inverted indexes.
+
+        Args:
+            paragraphs (list[tuple[int, str, int, str]]): id, work_id, paragraph_num and
+                plain_text of every paragraph.
+            wordforms (dict[str, str]): Lowercased word forms mapped to their stem; forms
+                missing from it have none.
+            phonetics (dict[str, str] | None): Lowercased word forms mapped to their
+                phonetic code; forms missing from it have none.
+
+        Returns:
+            Concordance: The index.
+        """
+        started = time.perf_counter()
+        term_ids: dict[str, int] = {}
+        token_start, token_term, token_offset = array("I"), array("I"), array("I")
+        for *_, text in paragraphs:
+            token_start.append(len(token_term))
+            for match in WORD_PATTERN.finditer((text or "").lower()):
+                token_term.append(term_ids.setdefault(match[0], len(term_ids)))
+                token_offset.append(match.start())
+
+        # Stable sort keeps each term's postings in corpus order
+        tokens = _uint32(token_term)
+        postings = pc.sort_indices(tokens).cast(pa.uint32())
+        counts = array("I", bytes(4 * len(term_ids)))
+        for term in token_term:
+            counts[term] += 1
+        posting_start, total = array("I"), 0
+        for count in counts:
+            posting_start.append(total)
+            total += count
+
+        ids, work_ids, numbers, texts = list(zip(*paragraphs, strict=True)) or [()] * 4
+        return cls(
+            paragraphs=pa.table(
+                {
+                    "id": pa.array(ids, pa.int32()),
+                    "work_id": pa.array(work_ids, pa.string()),
+                    "paragraph_num": pa.array(numbers, pa.int32()),
+                    "plain_text": pa.array(texts, pa.large_string()),
+                    "token_start": _uint32(token_start),
+                }
+            ),
+            tokens=pa.table({"term": tokens, "offset": _uint32(token_offset)}),
+            terms=pa.table(
+                {
+                    "term": pa.array(list(term_ids), pa.string()),
+                    "stem": pa.array(
+                        [wordforms.get(term) for term in term_ids], pa.string()
+                    ),
+                    "phonetic": pa.array(
+                        [(phonetics or {}).get(term) for term in term_ids], pa.string()
+                    ),
+                    "posting_start": _uint32(posting_start),
+                }
+            ),
+            postings=pa.table({"token": postings}),
+            source="built",
+            seconds=round(time.perf_counter() - started, 3),
+        )
+
+    def save(self, directory: Path) -> None:
+        """
+        Write the tables to a new build directory and publish it as `current`.
+
+        The four files are published together by swapping the `current` symlink in one
+        rename, so a worker loading concurrently sees either the previous build or this
+        one, never a mix or a half-written file. Builds older than the previous one are
+        removed; workers that mapped them keep their pages until they unmap them.
+
+        Args:
+            directory (Path): Directory of the builds.
+        """
+        directory.mkdir(parents=True, exist_ok=True)
+        build = Path(tempfile.mkdtemp(prefix="build-", dir=directory))
+        for name in TABLES:
+            table: pa.Table = getattr(self, name)
+            with ipc.new_file(build / f"{name}.arrow", table.schema) as writer:
+                writer.write_table(table)
+        current = directory / "current"
+        previous = current.resolve() if current.exists() else None
+        link = directory / f".{build.name}"
+        link.symlink_to(build.name)
+        link.replace(current)
+        for stale in directory.glob("build-*"):
+            if stale not in (build, previous):
+                shutil.rmtree(stale, ignore_errors=True)
+
+    @classmethod
+    def load(cls, directory: Path) -> Self:
+        """
+        Memory-map the current build of a saved index.
+
+        Args:
+            directory (Path): Directory written by `save`.
+
+        Returns:
+            Concordance: The index, backed by the mapped files.
+
+        Raises:
+            FileNotFoundError: If the index was never saved there.
+            pa.ArrowInvalid: If the files are corrupt or were saved by an older version.
+        """
+        started = time.perf_counter()
+        # Resolved once, so every table comes from the same build
+        build = (directory / "current").resolve(strict=True)
+        tables = {
+            name: ipc.open_file(pa.memory_map(str(build / f"{name}.arrow"))).read_all()
+            for name in TABLES
+        }
+        if "phonetic" not in tables["terms"].column_names:
+            raise pa.ArrowInvalid(f"Concordance in {directory} predates phonetic codes")
+        index = cls(**tables, source="loaded", seconds=0.0)
+        index.seconds = round(time.perf_counter() - started, 3)
+        return index
+
+    def lookup(self, word: str, stem: bool = False) -> list[int]:
+        """Term ids of `word`, or of every form sharing its stem."""
+        word = word.lower()
+        if stem and word in self.stem_of:
+            return self.stem_ids[self.stem_of[word]]
+        # A form without a stem only matches itself
+        return [self.term_ids[word]] if word in self.term_ids else []
+
+    def code_of(self, word: str, mode: str) -> str | None:
+        """
+        The stem (`same_root`) or phonetic code (`sounds_like`) of a word from `wordform`.
+
+        Forms missing from `wordform` have no code here; they are normalized by Postgres,
+        so a word gets the same code whether or not the concordance is ready.
+        """
+        codes = self.stem_of if mode == "same_root" else self.phonetic_of
+        return codes.get(word.lower())
+
+    def related(self, code: str, mode: str, limit: int = 20) -> dict[str, Any]:
+        """
+        Forms sharing a stem or phonetic code, and the paragraphs that contain any of them.
+
+        Args:
+            code (str): The stem or phonetic code.
+            mode (str): `same_root` to match stems, `sounds_like` to match phonetic codes.
+            limit (int): Maximum number of forms and of paragraphs.
+
+        Returns:
+            dict: The forms with their counts, the number of paragraphs and the first
+            `limit` paragraphs in corpus order.
+        """
+        terms = (self.stem_ids if mode == "same_root" else self.phonetic_ids).get(
+            code, []
+        )
+        forms = self.terms.column("term")
+        counts = sorted(
+            ((forms[term].as_py(), len(self.postings_of(term))) for term in terms),
+            key=lambda item: (-item[1], item[0]),
+        )
+        paragraphs = sorted(
+            {
+                paragraph
+                for term in terms
+                for _, paragraph, _, _ in self.paragraph_spans(self.postings_of(term))
+            }
+        )
+        columns = [
+            self.paragraphs.column(name)
+            for name in ("id", "work_id", "paragraph_num", "plain_text")
+        ]
+        return {
+            "forms": [{"form": form, "count": count} for form, count in counts[:limit]],
+            "total": len(paragraphs),
+            "paragraphs": [
+                {
+                    "id": columns[0][paragraph].as_py(),
+                    "work_id": columns[1][paragraph].as_py(),
+                    "paragraph_num": columns[2][paragraph].as_py(),
+                    "plain_text": columns[3][paragraph].as_py(),
+                }
+                for paragraph in paragraphs[:limit]
+            ],
+        }
+
+    def postings_of(self, term: int) -> memoryview:
+        end = (
+            self.posting_start[term + 1]
+            if term + 1 < len(self.posting_start)
+            else len(self.posting_token)
+        )
+        return self.posting_token[self.posting_start[term] : end]
+
+    def paragraph_of(self, token: int) -> int:
+        return bisect.bisect_right(self.token_start, token) - 1
+
+    def paragraph_spans(self, tokens) -> Iterator[tuple[int, int, int, int]]:
+        """
+        Pair ascending token indices with their paragraph and its token range.
+
+        The paragraph is only searched for when a token falls past the current one, so a
+        term's postings cost one bisection per paragraph rather than per occurrence.
+
+        Yields:
+            tuple[int, int, int, int]: The token, its paragraph, and the paragraph's first
+            and past-the-end token indices.
+        """
+        paragraph, first, last = -1, 0, 0
+        for token in tokens:
+            if token >= last:
+                paragraph = self.paragraph_of(token)
+                first = self.token_start[paragraph]
+                last = (
+                    self.token_start[paragraph + 1]
+                    if paragraph + 1 < len(self.token_start)
+                    else len(self.token_term)
+                )
+            yield token, paragraph, first, last
+
+    def frequency(self, word: str, stem: bool = False) -> dict[str, Any]:
+        """
+        Count the occurrences of a word, or of every form of its stem.
+
+        Args:
+            word (str): The word to count.
+            stem (bool): Count every form sharing the word's stem.
+
+        Returns:
+            dict: Occurrences per form, in total, and the number of paragraphs they appear in.
+        """
+        terms = self.lookup(word, stem)
+        forms = self.terms.column("term")
+        counts = {forms[term].as_py(): len(self.postings_of(term)) for term in terms}
+        paragraphs = {
+            paragraph
+            for term in terms
+            for _, paragraph, _, _ in self.paragraph_spans(self.postings_of(term))
+        }
+        return {
+            "word": word,
+            "forms": [
+                {"form": form, "count": count}
+                for form, count in sorted(counts.items(), key=lambda item: -item[1])
+            ],
+            "count": sum(counts.values()),
+            "paragraphs": len(paragraphs),
+        }
+
+    def concordance(
+        self,
+        word: str,
+        stem: bool = False,
+        width: int = 40,
+        limit: int = 50,
+        offset: int = 0,
+    ) -> tuple[int, list[dict[str, Any]]]:
+        """
+        Keyword-in-context lines for a word, in corpus order.
+
+        Args:
+            word (str): The keyword.
+            stem (bool): Match every form sharing the keyword's stem.
+            width (int): Characters of context on each side.
+            limit (int): Maximum number of lines.
+            offset (int): Lines to skip.
+
+        Returns:
+            tuple[int, list[dict]]: The total number of occurrences and the requested lines.
+        """
+        tokens = sorted(
+            token
+            for term in self.lookup(word, stem)
+            for token in self.postings_of(term)
+        )
+        ids = self.paragraphs.column("id")
+        work_ids = self.paragraphs.column("work_id")
+        numbers = self.paragraphs.column("paragraph_num")
+        texts = self.paragraphs.column("plain_text")
+        forms = self.terms.column("term")
+        lines = []
+        for token in tokens[offset : offset + limit]:
+            paragraph = self.paragraph_of(token)
+            text = texts[paragraph].as_py()
+            start = self.token_offset[token]
+            end = start + len(forms[self.token_term[token]].as_py())
+            lines.append(
+                {
+                    "paragraph_id": ids[paragraph].as_py(),
+                    "work_id": work_ids[paragraph].as_py(),
+                    "paragraph_num": numbers[paragraph].as_py(),
+                    "left": " ".join(text[max(start - width, 0) : start].split()),
+                    "keyword": text[start:end],
+                    "right": " ".join(text[end : end + width].split()),
+                }
+            )
+        return len(tokens), lines
+
+    def cooccurrence(
+        self,
+        word: str,
+        stem: bool = False,
+        window: int = 5,
+        limit: int = 20,
+        skip_top: int = 100,
+    ) -> list[dict[str, Any]]:
+        """
+        Words most often found within `window` words of a word, in the same paragraph.
+
+        Args:
+            word (str): The word.
+            stem (bool): Match every form sharing the word's stem.
+            window (int): Words considered on each side of every occurrence.
+            limit (int): Maximum number of neighbours.
+            skip_top (int): Ignore the most frequent terms of the corpus, e.g. articles.
+
+        Returns:
+            list[dict]: Neighbouring forms and how often they occur near the word.
+        """
+        terms = set(self.lookup(word, stem))
+        common = set(self.frequent[:skip_top])
+        neighbours: Counter[int] = Counter()
+        skipped = terms | common
+        for term in terms:
+            for token, _, first, last in self.paragraph_spans(self.postings_of(term)):
+                neighbours.update(
+                    neighbour
+                    for neighbour in self.token_term[
+                        max(token - window, first) : min(token + window + 1, last)
+                    ]
+                    if neighbour not in skipped
+                )
+        forms = self.terms.column("term")
+        return [
+            {"form": forms[term].as_py(), "count": count}
+            for term, count in neighbours.most_common(limit)
+        ]
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "source": self.source,
+            "seconds": self.seconds,
+            "paragraphs": self.paragraphs.num_rows,
+            "tokens": self.tokens.num_rows,
+            "terms": self.terms.num_rows,
+            "index_mb": round(
+                sum(getattr(self, name).nbytes for name in TABLES) / (1024 * 1024), 1
+            ),
+        }
+
+
+@define(slots=True)
+class ConcordanceIndex:
+    """
+    Holder of this worker's concordance, loaded or built in the background at startup.
+
+    A saved index is memory-mapped from `directory`; without one the corpus is read from
+    Postgres once, indexed in the thread pool and saved for the other workers and restarts.
+    Builds take a file lock on the directory, so workers starting together build it once.
+
+    Attributes:
+        directory (Path): Where the index files are saved.
+        index (Concordance | None): The index, once ready.
+        task (asyncio.Task | None): The startup load or build.
+        peak_memory_mb (float | None): Peak resident memory of the worker once ready.
+    """
+
+    directory: Path
+    index: Concordance | None = field(default=None)
+    task: asyncio.Task | None = field(default=None)
+    peak_memory_mb: float | None = field(default=None)
+
+    def start(self, pool) -> None:
+        self.task = asyncio.create_task(self.load_or_build(pool))
+        self.task.add_done_callback(self._started)
+
+    def _started(self, task: asyncio.Task) -> None:
+        # Without this a failed startup would only show as 503s from this worker
+        if not task.cancelled() and (ex := task.exception()) is not None:
+            logger.error(f"Concordance failed to load: {repr(ex)}", exc_info=ex)
+
+    async def load_or_build(self, pool) -> Concordance:
+        try:
+            index = await run_in_threadpool(Concordance.load, self.directory)
+        except (FileNotFoundError, pa.ArrowInvalid):
+            async with self.building():
+                # Another worker may have saved an index while this one waited
+                try:
+                    index = await run_in_threadpool(Concordance.load, self.directory)
+                except (FileNotFoundError, pa.ArrowInvalid):
+                    return await self.build(pool)
+        return await self.ready(index)
+
+    @asynccontextmanager
+    async def building(self) -> AsyncIterator[None]:
+        """Hold an exclusive lock on the index directory, shared by every worker process."""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        with (self.directory / ".lock").open("w") as lock:
+            await run_in_threadpool(fcntl.flock, lock, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock, fcntl.LOCK_UN)
+
+    async def rebuild(self, pool) -> Concordance:
+        """
+        Read the corpus from Postgres, index it and save the index files.
+
+        Args:
+            pool: The asyncpg pool to read paragraphs and word forms with.
+
+        Returns:
+            Concordance: The new index, which replaces the current one.
+        """
+        async with self.building():
+            return await self.build(pool)
+
+    async def build(self, pool) -> Concordance:
+        paragraphs = await statement_registry.fetch(pool, "paragraph.corpus")
+        wordforms = await statement_registry.fetch(pool, "wordform.codes")
+        index = await run_in_threadpool(
+            Concordance.build,
+            [tuple(row) for row in paragraphs],
+            {
+                row["plain_text"].lower(): row["stem_text"].lower()
+                for row in wordforms
+                if row["stem_text"] is not None
+            },
+            {row["plain_text"].lower(): row["phonetic_text"] for row in wordforms},
+        )
+        await run_in_threadpool(index.save, self.directory)
+        return await self.ready(index)
+
+    async def ready(self, index: Concordance) -> Concordance:
+        self.index = index
+        self.peak_memory_mb = peak_memory_mb()
+        await logger.ainfo("Concordance ready", **self.stats())
+        return index
+
+    def get(self) -> Concordance:
+        if self.index is None:
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Concordance index is not ready yet.",
+            )
+        return self.index
+
+    def stats(self) -> dict[str, Any]:
+        if self.index is None:
+            return {"ready": False}
+        return {
+            "ready": True,
+            **self.index.stats(),
+            "peak_memory_mb": self.peak_memory_mb,
+        }
+
+    async def shutdown(self) -> None:
+        if self.task is not None and not self.task.done():
+            self.task.cancel()
+            await asyncio.gather(self.task, return_exceptions=True)
+
+
+concordance = ConcordanceIndex(directory=Path(global_settings.CONCORDANCE_DIR))
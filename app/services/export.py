@@ -0,0 +1,283 @@
+import operator
+import uuid
+from collections.abc import AsyncGenerator
+from typing import Any, Literal, Self
+
+import orjson
+import pyarrow as pa
+import pyarrow.parquet as pq
+from attrs import define, field
+from fastapi import HTTPException, status
+from fastapi.responses import StreamingResponse
+from pyarrow import csv as pa_csv
+from pyarrow import ipc
+from sqlalchemy import Column, Table, select
+from sqlalchemy.dialects.postgresql.asyncpg import PGDialect_asyncpg
+
+from app.schemas.export import ExportParams
+from app.utils.statements import statement_registry
+
+_dialect = PGDialect_asyncpg()
+
+ExportFormat = Literal["parquet", "arrow", "csv"]
+
+EXPORT_MEDIA_TYPES = {
+    "parquet": "application/vnd.apache.parquet",
+    "arrow": "application/vnd.apache.arrow.stream",
+    "csv": "text/csv",
+}
+
+ARROW_TYPES = {
+    int: pa.int64(),
+    float: pa.float64(),
+    bool: pa.bool_(),
+    str: pa.string(),
+}
+
+# Column types whose filter values can be parsed from the query string
+FILTERABLE_TYPES = (int, float, str, uuid.UUID)
+
+FILTER_OPERATORS = {
+    "eq": operator.eq,
+    "ne": operator.ne,
+    "lt": operator.lt,
+    "le": operator.le,
+    "gt": operator.gt,
+    "ge": operator.ge,
+    "like": lambda column, value: column.like(value),
+}
+
+
+async def stream_json_array(
+    pool, key: str, chunk_size: int, **values: Any
+) -> AsyncGenerator[bytes]:
+    """
+    Stream the rows of a registered statement as one JSON array, chunk by chunk.
+
+    Rows are read from a server-side cursor inside a transaction on a dedicated pool
+    connection, serialized straight from asyncpg records and yielded `chunk_size` rows
+    at a time, so neither the result set nor ORM objects are ever held in memory.
+
+    Args:
+        pool: The asyncpg pool to acquire a connection from.
+        key (str): The registered statement key.
+        chunk_size (int): Number of rows fetched and yielded per chunk.
+        **values: Values for the statement bind parameters.
+
+    Yields:
+        bytes: Consecutive pieces of the JSON array.
+    """
+    async with pool.acquire() as connection, connection.transaction():
+        yield b"["
+        separator = b""
+        chunk: list[bytes] = []
+        async for record in statement_registry.cursor(
+            connection, key, chunk_size, **values
+        ):
+            chunk.append(orjson.dumps(dict(record)))
+            if len(chunk) >= chunk_size:
+                yield separator + b",".join(chunk)
+                separator = b","
+                chunk = []
+        if chunk:
+            yield separator + b",".join(chunk)
+        yield b"]"
+
+
+def _python_type(column: Column) -> type:
+    try:
+        return column.type.python_type
+    except NotImplementedError:
+        return str
+
+
+@define(slots=True)
+class ChunkSink:
+    """
+    Write-only file object that hands back what Arrow writers wrote since the last drain.
+
+    `tell` keeps counting across drains, so Parquet footers still carry the right offsets.
+    """
+
+    chunks: list[bytes] = field(factory=list)
+    position: int = field(default=0)
+    closed: bool = field(default=False)
+
+    def write(self, data) -> int:
+        self.chunks.append(bytes(data))
+        self.position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self.position
+
+    def flush(self) -> None:
+        pass
+
+    def close(self) -> None:
+        self.closed = True
+
+    def drain(self) -> bytes:
+        data = b"".join(self.chunks)
+        self.chunks.clear()
+        return data
+
+
+@define(slots=True)
+class ColumnarExport:
+    """
+    Stream a table as Parquet, Arrow IPC or CSV from a server-side cursor.
+
+    Rows are fetched `chunk_size` at a time, turned into one Arrow record batch per chunk and
+    passed to the format writer, whose output is yielded before the next fetch; at most one
+    chunk of rows is ever held in memory whatever the table size. Parquet gets one row group
+    per chunk and Arrow uses the IPC stream format, so both can be written incrementally.
+
+    Attributes:
+        table (Table): The table to export.
+        file_format (ExportFormat): Output format.
+        columns (list[Column]): Projected columns, in output order.
+        sql (str): The parameterized query.
+        args (list[Any]): Values of the query parameters.
+        chunk_size (int): Rows per fetch and record batch.
+    """
+
+    table: Table
+    file_format: ExportFormat
+    columns: list[Column]
+    sql: str
+    args: list[Any]
+    chunk_size: int
+
+    @classmethod
+    def build(
+        cls, table: Table, file_format: ExportFormat, params: ExportParams
+    ) -> Self:
+        """
+        Resolve projected columns and filters into a query.
+
+        Args:
+            table (Table): The table to export.
+            file_format (ExportFormat): Output format.
+            params (ExportParams): Requested columns, filters and chunk size.
+
+        Returns:
+            ColumnarExport: The export, ready to stream.
+
+        Raises:
+            ValueError: If a column, operator or filter value is invalid.
+        """
+        names = params.columns or [
+            column.name for column in table.columns if column.computed is None
+        ]
+        unknown = [name for name in names if name not in table.c]
+        if unknown:
+            raise ValueError(f"Unknown columns {unknown} for {table.name}")
+        columns = [table.c[name] for name in names]
+        stmt = select(*columns)
+        for condition in params.filter or []:
+            name, _, rest = condition.partition(":")
+            op, _, value = rest.partition(":")
+            if name not in table.c or op not in FILTER_OPERATORS:
+                raise ValueError(
+                    f"Invalid filter {condition!r}, expected column:op:value with op in "
+                    f"{list(FILTER_OPERATORS)}"
+                )
+            column = table.c[name]
+            python_type = _python_type(column)
+            if python_type not in FILTERABLE_TYPES:
+                raise ValueError(f"Column {name} cannot be filtered")
+            stmt = stmt.where(FILTER_OPERATORS[op](column, python_type(value)))
+        stmt = stmt.order_by(*table.primary_key.columns)
+        compiled = stmt.compile(dialect=_dialect)
+        return cls(
+            table=table,
+            file_format=file_format,
+            columns=columns,
+            sql=compiled.string,
+            args=[compiled.params[name] for name in compiled.positiontup or ()],
+            chunk_size=params.chunk_size,
+        )
+
+    @property
+    def schema(self) -> pa.Schema:
+        return pa.schema(
+            pa.field(column.name, ARROW_TYPES.get(_python_type(column), pa.string()))
+            for column in self.columns
+        )
+
+    def writer(self, sink: ChunkSink):
+        match self.file_format:
+            case "parquet":
+                return pq.ParquetWriter(sink, self.schema)
+            case "arrow":
+                return ipc.new_stream(sink, self.schema)
+            case "csv":
+                return pa_csv.CSVWriter(sink, self.schema)
+
+    def record_batch(self, records: list) -> pa.RecordBatch:
+        arrays = []
+        for index, field_ in enumerate(self.schema):
+            values = [record[index] for record in records]
+            if _python_type(self.columns[index]) not in ARROW_TYPES:
+                # UUIDs and JSON documents are exported as their text form
+                values = [None if value is None else str(value) for value in values]
+            arrays.append(pa.array(values, type=field_.type))
+        return pa.RecordBatch.from_arrays(arrays, schema=self.schema)
+
+    async def stream(self, pool) -> AsyncGenerator[bytes]:
+        """
+        Yield the encoded table chunk by chunk.
+
+        Args:
+            pool: The pool to acquire a connection from, e.g. `app.postgres_pool`.
+
+        Yields:
+            bytes: Consecutive pieces of the output file.
+        """
+        sink = ChunkSink()
+        writer = self.writer(sink)
+        async with pool.acquire() as connection, connection.transaction():
+            cursor = await connection.cursor(self.sql, *self.args)
+            while records := await cursor.fetch(self.chunk_size):
+                writer.write_batch(self.record_batch(records))
+                yield sink.drain()
+        writer.close()
+        yield sink.drain()
+
+    def response(self, pool, filename: str) -> StreamingResponse:
+        extension = "arrows" if self.file_format == "arrow" else self.file_format
+        return StreamingResponse(
+            self.stream(pool),
+            media_type=EXPORT_MEDIA_TYPES[self.file_format],
+            headers={
+                "Content-Disposition": f'attachment; filename="{filename}.{extension}"'
+            },
+        )
+
+
+def columnar_export(
+    pool, table: Table, file_format: ExportFormat, params: ExportParams
+) -> StreamingResponse:
+    """
+    Build the streaming response of a columnar table export.
+
+    Args:
+        pool: The pool to acquire a connection from, e.g. `app.postgres_pool`.
+        table (Table): The table to export.
+        file_format (ExportFormat): Output format.
+        params (ExportParams): Requested columns, filters and chunk size.
+
+    Returns:
+        StreamingResponse: The file, streamed as it is written.
+
+    Raises:
+        HTTPException: If a column or filter is invalid.
+    """
+    try:
+        export = ColumnarExport.build(table, file_format, params)
+    except ValueError as ex:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=str(ex)
+        ) from ex
+    return export.response(pool, table.name)
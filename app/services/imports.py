@@ -0,0 +1,403 @@
+import hashlib
+import io
+import resource
+import sys
+import tempfile
+import time
+from collections.abc import Awaitable, Callable, Iterator
+from pathlib import Path
+from typing import Any
+
+import fastexcel
+import orjson
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+from asyncpg import Connection
+from attrs import define
+from fastapi import UploadFile
+from pyarrow import csv as pa_csv
+from pyarrow import ipc
+from rotoger import get_logger
+from starlette.concurrency import iterate_in_threadpool, run_in_threadpool
+
+from app.schemas.bulk import ImportReport
+from app.services.bulk import StagedCopy
+from app.services.validation import FrameValidator
+
+logger = get_logger()
+
+SPOOL_CHUNK_SIZE = 1024 * 1024
+
+# Leading bytes of each supported format; CSV has none and is the fallback
+FILE_SIGNATURES = {
+    b"PK\x03\x04": "xlsx",
+    b"PAR1": "parquet",
+    b"ARROW1": "ipc",
+    b"\xff\xff\xff\xff": "ipc_stream",
+}
+FILE_FORMATS = ("xlsx", "csv", "parquet", "ipc", "ipc_stream")
+
+
+async def spool_upload(upload: UploadFile, suffix: str = "") -> tuple[Path, str]:
+    """
+    Copy an upload to a temporary file on disk, one chunk at a time, hashing it on the way.
+
+    Readers get a real path to open or memory-map instead of the whole body as bytes, and
+    the SHA-256 digest costs no second pass over the file. The caller is responsible for
+    unlinking the file.
+
+    Args:
+        upload (UploadFile): The uploaded file.
+        suffix (str): Suffix of the temporary file name, e.g. `.xlsx`.
+
+    Returns:
+        tuple[Path, str]: Location of the spooled file and the hex digest of its content.
+    """
+    digest = hashlib.sha256()
+
+    def write(chunk: bytes) -> None:
+        spool.write(chunk)
+        digest.update(chunk)
+
+    with tempfile.NamedTemporaryFile(suffix=suffix, delete=False) as spool:
+        try:
+            while chunk := await upload.read(SPOOL_CHUNK_SIZE):
+                await run_in_threadpool(write, chunk)
+        except BaseException:
+            # A dropped upload or a full disk leaves no half-written file behind
+            spool.close()
+            Path(spool.name).unlink(missing_ok=True)
+            raise
+    return Path(spool.name), digest.hexdigest()
+
+
+def iter_xlsx_batches(
+    path: Path, sheet_name: str, columns: list[str], batch_size: int
+) -> Iterator[pa.RecordBatch]:
+    """
+    Read the given columns of a worksheet with calamine and yield them as Arrow batches.
+
+    calamine materializes the sheet's cell range once; the requested columns are converted
+    straight to Arrow string arrays and sliced into zero-copy batches, so no Python object
+    is created per row or cell.
+
+    Args:
+        path (Path): The spooled workbook.
+        sheet_name (str): The worksheet to read.
+        columns (list[str]): Header names of the columns to read, in output order.
+        batch_size (int): Number of rows per batch.
+
+    Yields:
+        pa.RecordBatch: Consecutive slices of the sheet.
+    """
+    sheet = fastexcel.read_excel(path).load_sheet(
+        sheet_name,
+        use_columns=columns,
+        dtypes=dict.fromkeys(columns, "string"),
+    )
+    data = sheet.to_arrow().select(columns)
+    for offset in range(0, data.num_rows, batch_size):
+        yield data.slice(offset, batch_size)
+
+
+def detect_format(path: Path) -> str:
+    """
+    Detect the format of a spooled file from its leading bytes.
+
+    Args:
+        path (Path): The spooled file.
+
+    Returns:
+        str: One of `FILE_FORMATS`; files without a known signature are read as CSV.
+    """
+    with path.open("rb") as file:
+        head = file.read(8)
+    for signature, file_format in FILE_SIGNATURES.items():
+        if head.startswith(signature):
+            return file_format
+    return "csv"
+
+
+def iter_csv_batches(
+    path: Path, columns: list[str], batch_size: int
+) -> Iterator[pa.RecordBatch]:
+    """Stream a CSV file block by block, reading only `columns` as strings."""
+    reader = pa_csv.open_csv(
+        path,
+        convert_options=pa_csv.ConvertOptions(
+            include_columns=columns,
+            column_types=dict.fromkeys(columns, pa.string()),
+        ),
+    )
+    for batch in reader:
+        for offset in range(0, batch.num_rows, batch_size):
+            yield batch.slice(offset, batch_size)
+
+
+def require_columns(names: list[str], columns: list[str]) -> None:
+    """
+    Check that a file schema has every column to read.
+
+    Parquet and IPC readers do not fail on a missing column the way the CSV and Excel
+    readers do, so their schema is checked before the first batch is read.
+
+    Args:
+        names (list[str]): Column names of the file schema.
+        columns (list[str]): Columns to read.
+
+    Raises:
+        ValueError: If columns are missing, naming them.
+    """
+    missing = [column for column in columns if column not in names]
+    if missing:
+        raise ValueError(f"Missing columns {missing}, the file has {names}")
+
+
+def iter_parquet_batches(
+    path: Path, columns: list[str], batch_size: int
+) -> Iterator[pa.RecordBatch]:
+    """Read a memory-mapped Parquet file row group by row group, decoding only `columns`."""
+    parquet = pq.ParquetFile(path, memory_map=True)
+    require_columns(parquet.schema_arrow.names, columns)
+    yield from parquet.iter_batches(batch_size=batch_size, columns=columns)
+
+
+def iter_ipc_batches(
+    path: Path, columns: list[str], batch_size: int, stream: bool = False
+) -> Iterator[pa.RecordBatch]:
+    """Read Arrow IPC batches zero-copy from a memory map of the file."""
+    with pa.memory_map(str(path)) as source:
+        reader = ipc.open_stream(source) if stream else ipc.open_file(source)
+        require_columns(reader.schema.names, columns)
+        batches = (
+            reader
+            if stream
+            else (reader.get_batch(i) for i in range(reader.num_record_batches))
+        )
+        for batch in batches:
+            batch = batch.select(columns)
+            for offset in range(0, batch.num_rows, batch_size):
+                yield batch.slice(offset, batch_size)
+
+
+def iter_file_batches(
+    path: Path,
+    file_format: str,
+    columns: dict[str, str],
+    batch_size: int,
+    sheet_name: str,
+) -> Iterator[pa.RecordBatch]:
+    """
+    Read any supported file as Arrow batches of string columns named after the target table.
+
+    Every format feeds the same COPY path: the source columns are read, cast to strings and
+    renamed to their target names, whatever reader produced them.
+
+    Args:
+        path (Path): The spooled file.
+        file_format (str): One of `FILE_FORMATS`, e.g. from `detect_format`.
+        columns (dict[str, str]): Target column names mapped to source column names.
+        batch_size (int): Maximum number of rows per batch.
+        sheet_name (str): The worksheet to read from an Excel file.
+
+    Yields:
+        pa.RecordBatch: Batches with the target columns in `columns` order.
+
+    Raises:
+        ValueError: If the format is unknown.
+    """
+    sources = list(columns.values())
+    match file_format:
+        case "xlsx":
+            batches = iter_xlsx_batches(path, sheet_name, sources, batch_size)
+        case "csv":
+            batches = iter_csv_batches(path, sources, batch_size)
+        case "parquet":
+            batches = iter_parquet_batches(path, sources, batch_size)
+        case "ipc" | "ipc_stream":
+            batches = iter_ipc_batches(
+                path, sources, batch_size, stream=file_format == "ipc_stream"
+            )
+        case _:
+            raise ValueError(f"Unsupported file format {file_format!r}")
+    for batch in batches:
+        yield pa.RecordBatch.from_arrays(
+            [pc.cast(batch.column(source), pa.string()) for source in sources],
+            names=list(columns),
+        )
+
+
+def parse_column_map(mapping: list[str], targets: list[str]) -> dict[str, str]:
+    """
+    Build the target-to-source column map from `source:target` pairs.
+
+    Args:
+        mapping (list[str]): Pairs naming a source column and the target column it fills.
+        targets (list[str]): Target columns; those not mapped are read from a same-named column.
+
+    Returns:
+        dict[str, str]: Target column names mapped to source column names.
+
+    Raises:
+        ValueError: If a pair is malformed or names an unknown target column.
+    """
+    columns = dict(zip(targets, targets, strict=True))
+    for pair in mapping:
+        source, separator, target = pair.rpartition(":")
+        if not separator or not source or target not in columns:
+            raise ValueError(
+                f"Invalid column mapping {pair!r}, expected source:target "
+                f"with target in {targets}"
+            )
+        columns[target] = source
+    return columns
+
+
+def count_rows(path: Path, file_format: str) -> int | None:
+    """
+    Count the rows of a file from its metadata, without decoding any column.
+
+    Args:
+        path (Path): The spooled file.
+        file_format (str): One of `FILE_FORMATS`.
+
+    Returns:
+        int | None: The row count for Parquet and Arrow IPC files, `None` for formats that
+        can only be counted by reading them.
+    """
+    match file_format:
+        case "parquet":
+            return pq.ParquetFile(path, memory_map=True).metadata.num_rows
+        case "ipc":
+            with pa.memory_map(str(path)) as source:
+                reader = ipc.open_file(source)
+                return sum(
+                    reader.get_batch(i).num_rows
+                    for i in range(reader.num_record_batches)
+                )
+    return None
+
+
+@define(slots=True)
+class ImportSource:
+    """
+    A spooled upload and the options it should be imported with.
+
+    Attributes:
+        path (Path): The spooled file.
+        filename (str | None): Name of the uploaded file.
+        file_format (str): One of `FILE_FORMATS`.
+        columns (dict[str, str]): Target column names mapped to source column names.
+        sheet_name (str): The worksheet to read from an Excel file.
+        batch_size (int): Maximum number of rows per batch.
+        sha256 (str | None): Hex digest of the file content.
+        source (str | None): Feed the file comes from, recorded in the import ledger.
+        diff (bool): Update existing rows whose values changed instead of skipping them.
+    """
+
+    path: Path
+    filename: str | None
+    file_format: str
+    columns: dict[str, str]
+    sheet_name: str
+    batch_size: int
+    sha256: str | None = None
+    source: str | None = None
+    diff: bool = False
+
+    @property
+    def fingerprint(self) -> str:
+        """Digest of the content and of every option that changes what the import loads."""
+        options = orjson.dumps(
+            [self.sha256, self.file_format, self.sheet_name, self.columns, self.diff]
+        )
+        return hashlib.sha256(options).hexdigest()
+
+    def batches(self) -> Iterator[pa.RecordBatch]:
+        return iter_file_batches(
+            self.path, self.file_format, self.columns, self.batch_size, self.sheet_name
+        )
+
+    def cleanup(self) -> None:
+        self.path.unlink(missing_ok=True)
+
+
+def peak_memory_mb() -> float:
+    # Peak over the whole life of the process; ru_maxrss is in KiB on Linux, bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+def _encode_batches(
+    batches: Iterator[pa.RecordBatch],
+    loader: StagedCopy,
+    validator: FrameValidator | None,
+) -> Iterator[tuple[int, io.BytesIO]]:
+    for batch in batches:
+        valid = batch if validator is None else validator.split(batch)
+        yield batch.num_rows, loader.encode_csv(valid)
+
+
+async def import_arrow_batches(
+    batches: Iterator[pa.RecordBatch],
+    connection: Connection,
+    loader: StagedCopy,
+    report: ImportReport,
+    on_batch: Callable[[ImportReport], Awaitable[None]] | None = None,
+    update: bool = False,
+    on_update: Callable[[list[Any]], Awaitable[None]] | None = None,
+) -> ImportReport:
+    """
+    Validate Arrow batches, COPY the valid rows into the loader's table and measure throughput.
+
+    Batches are checked against the loader's rules, if any, before encoding; rejects go to a
+    reject file whose id is reported. Reading, validation and CSV encoding run in the thread
+    pool, so parsing a large file does not block the event loop; Postgres receives every
+    batch through one COPY.
+
+    Args:
+        batches (Iterator[pa.RecordBatch]): Batches with the loader's `arrow_columns`.
+        connection (Connection): The asyncpg connection to load through.
+        loader (StagedCopy): Loader for the target table.
+        report (ImportReport): Report updated in place.
+        on_batch (Callable[[ImportReport], Awaitable[None]] | None): Awaited with the report
+            after every batch, e.g. to publish progress or stop a cancelled import.
+        update (bool): Update existing rows whose values changed instead of skipping them.
+        on_update (Callable[[list[Any]], Awaitable[None]] | None): Awaited with the keys of
+            the rows each batch updated, e.g. to invalidate cached responses.
+
+    Returns:
+        ImportReport: Row counters, elapsed time, rows per second and the worker's peak
+        memory.
+    """
+    started = time.perf_counter()
+    validator = None if loader.rules is None else FrameValidator(loader.rules)
+    encoded = _encode_batches(batches, loader, validator)
+    async for rows, source in iterate_in_threadpool(encoded):
+        inserted, updated = await loader.load_csv(connection, source, update=update)
+        report.inserted += inserted
+        report.updated += len(updated)
+        if updated and on_update is not None:
+            await on_update(updated)
+        report.rows += rows
+        report.batches += 1
+        if validator is not None:
+            report.rejected = validator.rejected
+            report.rejects_id = validator.rejects_id
+        report.skipped = (
+            report.rows - report.rejected - report.inserted - report.updated
+        )
+        report.seconds = round(time.perf_counter() - started, 3)
+        report.rows_per_second = (
+            round(report.rows / report.seconds, 1) if report.seconds else None
+        )
+        await logger.ainfo(
+            f"Import into {loader.target} in progress",
+            rows=report.rows,
+            inserted=report.inserted,
+        )
+        if on_batch is not None:
+            await on_batch(report)
+    report.worker_peak_memory_mb = peak_memory_mb()
+    return report
@@ -0,0 +1,194 @@
+import asyncio
+import time
+from collections.abc import Awaitable, Callable
+from typing import Any
+from uuid import uuid4
+
+from attrs import define, field
+from rotoger import get_logger
+from starlette.concurrency import run_in_threadpool
+
+from app.config import settings as global_settings
+from app.database import DriverPool
+from app.schemas.bulk import ImportJobStatus, ImportReport
+from app.services.bulk import StagedCopy
+from app.services.imports import ImportSource, count_rows, import_arrow_batches
+from app.services.ledger import find_import, record_import
+
+logger = get_logger()
+
+
+class ImportCancelled(Exception):
+    """Raised between batches when a job's cancellation flag is set."""
+
+
+@define(slots=True)
+class ImportJobs:
+    """
+    In-process pool of background import tasks whose state is kept in Redis.
+
+    A submitted job runs as an asyncio task of the worker that received the upload, at most
+    `workers` at a time per process. Its status is written to Redis after every batch, so any
+    worker behind the load balancer can answer a poll or set the cancellation flag; the
+    running task checks that flag between batches. Every batch is committed on its own, so a
+    cancelled or failed job keeps the rows it already loaded.
+
+    Attributes:
+        workers (int): Imports run concurrently by this process.
+        ttl (int): Seconds job state is kept in Redis.
+        tasks (dict[str, asyncio.Task]): Tasks of the jobs started by this process.
+    """
+
+    workers: int
+    ttl: int
+    tasks: dict[str, asyncio.Task] = field(factory=dict)
+    slots: asyncio.Semaphore = field(init=False)
+
+    def __attrs_post_init__(self) -> None:
+        self.slots = asyncio.Semaphore(self.workers)
+
+    @staticmethod
+    def key(job_id: str) -> str:
+        return f"import-job:{job_id}"
+
+    async def save(self, client, job: ImportJobStatus) -> None:
+        await client.set(self.key(job.job_id), job.model_dump_json(), ex=self.ttl)
+
+    async def status(self, client, job_id: str) -> ImportJobStatus | None:
+        payload = await client.get(self.key(job_id))
+        if payload is None:
+            return None
+        return ImportJobStatus.model_validate_json(payload)
+
+    async def submit(
+        self,
+        client,
+        pool: DriverPool,
+        loader: StagedCopy,
+        source: ImportSource,
+        on_update: Callable[[list[Any]], Awaitable[None]] | None = None,
+    ) -> ImportJobStatus:
+        """
+        Queue an import of a spooled file and return its initial status.
+
+        A file the import ledger already holds is not queued: the job is completed at once
+        with the recorded report.
+
+        Args:
+            client: The Redis client job state is stored with.
+            pool (DriverPool): Pool the job checks its COPY connection out of.
+            loader (StagedCopy): Loader for the target table.
+            source (ImportSource): The spooled file, removed when the job ends.
+            on_update (Callable[[list[Any]], Awaitable[None]] | None): Awaited with the keys
+                of rows updated in diff mode.
+
+        Returns:
+            ImportJobStatus: The queued job.
+        """
+        job = ImportJobStatus(job_id=uuid4().hex, filename=source.filename)
+        previous = await find_import(pool, loader.target, source)
+        if previous is not None:
+            source.cleanup()
+            job.status = "completed"
+            job.rows_total = job.rows_processed = previous.rows
+            job.eta_seconds = 0.0
+            job.report = previous
+            await self.save(client, job)
+            return job
+        await self.save(client, job)
+        task = asyncio.create_task(
+            self.run(client, pool, loader, source, job, on_update)
+        )
+        self.tasks[job.job_id] = task
+        task.add_done_callback(lambda _: self.tasks.pop(job.job_id, None))
+        return job
+
+    async def cancel(self, client, job_id: str) -> ImportJobStatus | None:
+        """
+        Request cancellation of a queued or running job.
+
+        Args:
+            client: The Redis client job state is stored with.
+            job_id (str): The job to cancel.
+
+        Returns:
+            ImportJobStatus | None: The job status, or `None` when the job is unknown.
+        """
+        job = await self.status(client, job_id)
+        if job is None or job.status not in ("queued", "running"):
+            return job
+        await client.set(f"{self.key(job_id)}:cancel", 1, ex=self.ttl)
+        return job
+
+    async def run(
+        self,
+        client,
+        pool: DriverPool,
+        loader: StagedCopy,
+        source: ImportSource,
+        job: ImportJobStatus,
+        on_update: Callable[[list[Any]], Awaitable[None]] | None = None,
+    ) -> None:
+        async def progress(report: ImportReport) -> None:
+            job.rows_processed = report.rows
+            job.rows_rejected = report.rejected + report.skipped
+            job.rejects_id = report.rejects_id
+            job.rows_per_second = report.rows_per_second
+            if job.rows_total is not None and report.rows_per_second:
+                job.eta_seconds = round(
+                    max(job.rows_total - report.rows, 0) / report.rows_per_second, 1
+                )
+            await self.save(client, job)
+            if await client.exists(f"{self.key(job.job_id)}:cancel"):
+                raise ImportCancelled
+
+        try:
+            async with self.slots:
+                if await client.exists(f"{self.key(job.job_id)}:cancel"):
+                    raise ImportCancelled
+                job.status = "running"
+                job.rows_total = await run_in_threadpool(
+                    count_rows, source.path, source.file_format
+                )
+                await self.save(client, job)
+                started = time.perf_counter()
+                async with pool.acquire() as connection:
+                    job.report = await import_arrow_batches(
+                        source.batches(),
+                        connection,
+                        loader,
+                        ImportReport(filename=source.filename, sha256=source.sha256),
+                        on_batch=progress,
+                        update=source.diff,
+                        on_update=on_update,
+                    )
+                    await record_import(connection, loader.target, source, job.report)
+                job.status = "completed"
+                job.eta_seconds = 0.0
+                await logger.ainfo(
+                    f"Import job {job.job_id} completed",
+                    rows=job.rows_processed,
+                    seconds=round(time.perf_counter() - started, 3),
+                )
+        except (ImportCancelled, asyncio.CancelledError):
+            job.status = "cancelled"
+            job.eta_seconds = None
+        except Exception as ex:
+            job.status = "failed"
+            job.error = repr(ex)
+            job.eta_seconds = None
+            await logger.aerror(f"Import job {job.job_id} failed: {repr(ex)}")
+        finally:
+            source.cleanup()
+            await self.save(client, job)
+
+    async def shutdown(self) -> None:
+        """Cancel the jobs still running in this process, recording them as cancelled."""
+        for task in list(self.tasks.values()):
+            task.cancel()
+        await asyncio.gather(*self.tasks.values(), return_exceptions=True)
+
+
+import_jobs = ImportJobs(
+    workers=global_settings.IMPORT_WORKERS, ttl=global_settings.IMPORT_JOB_TTL
+)
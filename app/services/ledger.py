@@ -0,0 +1,63 @@
+from rotoger import get_logger
+
+from app.models.imports import ImportLedger  # noqa: F401  registers the statements
+from app.schemas.bulk import ImportReport
+from app.services.imports import ImportSource
+from app.utils.statements import statement_registry
+
+logger = get_logger()
+
+
+async def find_import(
+    executor, target: str, source: ImportSource
+) -> ImportReport | None:
+    """
+    Look up a previous import of the same file content and options into `target`.
+
+    Args:
+        executor: An asyncpg pool or connection.
+        target (str): The schema-qualified target table.
+        source (ImportSource): The spooled file.
+
+    Returns:
+        ImportReport | None: The recorded report marked as a duplicate, or `None` when the
+        file was never imported this way.
+    """
+    row = await statement_registry.fetchrow(
+        executor, "import_ledger.find", target=target, fingerprint=source.fingerprint
+    )
+    if row is None:
+        return None
+    await logger.ainfo(f"Import into {target} skipped", sha256=source.sha256)
+    report = ImportReport.model_validate_json(row["report"])
+    report.filename = source.filename
+    report.duplicate = True
+    return report
+
+
+async def record_import(
+    executor, target: str, source: ImportSource, report: ImportReport
+) -> None:
+    """
+    Record a completed import in the ledger so the same file is not imported again.
+
+    The entry is written after the last batch has committed, in a statement of its own, so
+    it is not atomic with the rows: an import that dies in between leaves its rows without
+    an entry, and importing the file again skips the rows already present.
+
+    Args:
+        executor: An asyncpg pool or connection.
+        target (str): The schema-qualified target table.
+        source (ImportSource): The imported file.
+        report (ImportReport): The final report.
+    """
+    await statement_registry.fetchrow(
+        executor,
+        "import_ledger.record",
+        target=target,
+        fingerprint=source.fingerprint,
+        sha256=source.sha256,
+        source=source.source or source.filename,
+        rows=report.rows,
+        report=report.model_dump_json(),
+    )
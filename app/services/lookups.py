@@ -0,0 +1,136 @@
+import asyncio
+from collections.abc import Mapping
+from types import MappingProxyType
+from typing import Any, Self
+
+from attrs import asdict, define, field
+from rotoger import get_logger
+
+from app.utils.statements import statement_registry
+
+logger = get_logger()
+
+
+@define(frozen=True, slots=True)
+class CharacterInfo:
+    id: str
+    name: str
+    abbrev: str | None
+    speech_count: int
+
+
+@define(frozen=True, slots=True)
+class WorkInfo:
+    id: str
+    title: str
+    long_title: str
+    year: int
+    genre_type: str
+
+
+@define(frozen=True, slots=True)
+class ShakespeareCatalog:
+    """
+    Immutable snapshot of the Shakespeare characters and works.
+
+    Names are not unique: minor parts such as "First Citizen" appear in several works, so a
+    name maps to every character id that carries it.
+
+    Attributes:
+        characters (Mapping[str, CharacterInfo]): Characters by id.
+        character_ids (Mapping[str, tuple[str, ...]]): Character ids by name.
+        works (Mapping[str, WorkInfo]): Works by id.
+    """
+
+    characters: Mapping[str, CharacterInfo] = MappingProxyType({})
+    character_ids: Mapping[str, tuple[str, ...]] = MappingProxyType({})
+    works: Mapping[str, WorkInfo] = MappingProxyType({})
+
+    @classmethod
+    def from_rows(cls, characters, works) -> Self:
+        by_id = {row["id"]: CharacterInfo(**row) for row in characters}
+        by_name: dict[str, list[str]] = {}
+        for character in by_id.values():
+            by_name.setdefault(character.name, []).append(character.id)
+        return cls(
+            characters=MappingProxyType(by_id),
+            character_ids=MappingProxyType(
+                {name: tuple(sorted(ids)) for name, ids in by_name.items()}
+            ),
+            works=MappingProxyType({row["id"]: WorkInfo(**row) for row in works}),
+        )
+
+    def enrich(self, rows) -> dict[str, dict[str, Any]]:
+        """
+        Side-load the character and work metadata referenced by paragraph rows.
+
+        Args:
+            rows: Paragraph mappings; their `character_id` and `work_id` are looked up.
+
+        Returns:
+            dict: `characters` and `works` by id, limited to the ones on the rows.
+        """
+        character_ids = {row["character_id"] for row in rows if "character_id" in row}
+        work_ids = {row["work_id"] for row in rows}
+        return {
+            "characters": {
+                id_: asdict(self.characters[id_])
+                for id_ in character_ids
+                if id_ in self.characters
+            },
+            "works": {
+                id_: asdict(self.works[id_]) for id_ in work_ids if id_ in self.works
+            },
+        }
+
+
+@define(slots=True)
+class ShakespeareLookups:
+    """
+    The worker's current catalog, loaded at startup and swapped whole on reload.
+
+    Requests read whichever snapshot is current without locking; a reload builds a new
+    snapshot and replaces the reference, so a request never sees a half-loaded map.
+
+    Attributes:
+        catalog (ShakespeareCatalog | None): The current snapshot, once loaded.
+        lock (asyncio.Lock): Serializes loads, so concurrent first requests query once.
+    """
+
+    catalog: ShakespeareCatalog | None = field(default=None)
+    lock: asyncio.Lock = field(factory=asyncio.Lock)
+
+    async def reload(self, pool) -> ShakespeareCatalog:
+        """
+        Read the characters and works from Postgres and replace the current snapshot.
+
+        Args:
+            pool: The asyncpg pool to read with.
+
+        Returns:
+            ShakespeareCatalog: The new snapshot.
+        """
+        async with self.lock:
+            return await self.load(pool)
+
+    async def get(self, pool) -> ShakespeareCatalog:
+        """The current snapshot, loaded on first use if startup has not loaded it yet."""
+        if self.catalog is None:
+            async with self.lock:
+                if self.catalog is None:
+                    await self.load(pool)
+        return self.catalog
+
+    async def load(self, pool) -> ShakespeareCatalog:
+        characters = await statement_registry.fetch(pool, "character.lookup")
+        works = await statement_registry.fetch(pool, "work.lookup")
+        self.catalog = ShakespeareCatalog.from_rows(characters, works)
+        await logger.ainfo(
+            "Shakespeare lookups loaded",
+            characters=len(self.catalog.characters),
+            works=len(self.catalog.works),
+        )
+        return self.catalog
+
+
+shakespeare_lookups = ShakespeareLookups()
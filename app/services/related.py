@@ -0,0 +1,65 @@
+from typing import Any
+
+from starlette.concurrency import run_in_threadpool
+
+from app.services.cache import related_paragraphs
+from app.services.concordance import concordance
+from app.utils.statements import statement_registry
+
+
+async def related_words(pool, word: str, mode: str, limit: int) -> dict[str, Any]:
+    """
+    Find the forms that sound like a word or share its root, and the paragraphs using them.
+
+    The word is normalized as the dataset was: a form listed in `wordform` takes its stored
+    phonetic code or stem, so queries and stored codes always agree; other spellings fall
+    back to `metaphone` or the English Snowball stemmer. Matches come from the in-memory
+    concordance once it is ready. Until then they come from Postgres through the
+    `wordform` code indexes and the GIN indexes on the paragraph codes, and the paragraph
+    matches are cached per worker by code.
+
+    Args:
+        pool: The asyncpg pool used to normalize and, without a concordance, to match.
+        word (str): The query word.
+        mode (str): `sounds_like` to match phonetic codes, `same_root` to match stems.
+        limit (int): Maximum number of forms and of paragraphs.
+
+    Returns:
+        dict: The code, matching forms, the number of matching paragraphs and the first
+        `limit` of them.
+    """
+    index = concordance.index
+    code = index.code_of(word, mode) if index is not None else None
+    if code is None:
+        row = await statement_registry.fetchrow(pool, "wordform.normalize", word=word)
+        code = row[mode]
+    result: dict[str, Any] = {"word": word, "mode": mode, "code": code}
+    if code is None:
+        return {
+            **result,
+            "source": "postgres",
+            "forms": [],
+            "total": 0,
+            "paragraphs": [],
+        }
+    if index is not None:
+        matches = await run_in_threadpool(index.related, code, mode, limit)
+        return {**result, "source": "memory", **matches}
+
+    forms = await statement_registry.fetch(
+        pool, f"wordform.{mode}", code=code, limit=limit
+    )
+    paragraphs = await related_paragraphs.get_or_load(
+        f"{mode}:{code}",
+        limit,
+        lambda: statement_registry.fetch(
+            pool, f"paragraph.{mode}", code=code, limit=limit
+        ),
+    )
+    return {
+        **result,
+        "source": "postgres",
+        "forms": forms,
+        "total": paragraphs[0]["total"] if paragraphs else 0,
+        "paragraphs": paragraphs,
+    }
@@ -0,0 +1,98 @@
+import asyncio
+from typing import Any
+
+from asyncpg import PostgresError
+from attrs import define, field
+from fastapi import WebSocket
+from rotoger import get_logger
+
+from app.utils.statements import statement_registry
+
+logger = get_logger()
+
+SEARCH_DEBOUNCE_SECONDS = 0.25
+
+
+@define(slots=True)
+class DebouncedSearch:
+    """
+    Run a registered search statement for the latest query typed into a WebSocket.
+
+    Every query replaces the previous one: a query that arrives while another waits for its
+    debounce delay, or is still running, cancels it, so keystrokes in quick succession cost
+    at most one statement. Cancelling a task blocked on asyncpg interrupts the in-flight
+    query server-side and discards the connection's open cursor.
+
+    Results are read from a server-side cursor and sent `chunk_size` hits at a time as
+    `{"query", "results"}` messages, followed by `{"query", "done": true, "count"}`, so the
+    first hits reach the client before the last ones are ranked out of Postgres.
+
+    Attributes:
+        websocket (WebSocket): The connected client.
+        pool: The asyncpg pool connections are acquired from.
+        key (str): The registered statement key; it takes `q` and `limit` parameters.
+        limit (int): Maximum number of hits per query.
+        chunk_size (int): Hits fetched from Postgres and sent per message.
+        debounce (float): Seconds a query must stay the latest before it runs.
+        task (asyncio.Task | None): The pending or running search.
+        superseded (set[asyncio.Task]): Cancelled searches that have not finished yet.
+    """
+
+    websocket: WebSocket
+    pool: Any
+    key: str
+    limit: int = 20
+    chunk_size: int = 10
+    debounce: float = SEARCH_DEBOUNCE_SECONDS
+    task: asyncio.Task | None = field(default=None)
+    superseded: set[asyncio.Task] = field(factory=set)
+
+    def submit(self, query: str) -> None:
+        self.cancel()
+        if query.strip():
+            self.task = asyncio.create_task(self.run(query.strip()))
+            self.task.add_done_callback(self._finished)
+
+    def cancel(self) -> None:
+        if self.task is not None and not self.task.done():
+            self.task.cancel()
+            # Kept until it unwinds, so close() can wait for its connection to be released
+            self.superseded.add(self.task)
+        self.task = None
+
+    async def close(self) -> None:
+        self.cancel()
+        await asyncio.gather(*self.superseded, return_exceptions=True)
+
+    def _finished(self, task: asyncio.Task) -> None:
+        self.superseded.discard(task)
+        # Retrieving the error also keeps the loop from reporting it as never retrieved
+        if not task.cancelled() and (ex := task.exception()) is not None:
+            logger.error(f"Search {self.key} crashed: {repr(ex)}", exc_info=ex)
+
+    async def run(self, query: str) -> None:
+        await asyncio.sleep(self.debounce)
+        count = 0
+        try:
+            async with self.pool.acquire() as connection, connection.transaction():
+                chunk: list[dict[str, Any]] = []
+                async for record in statement_registry.cursor(
+                    connection, self.key, self.chunk_size, q=query, limit=self.limit
+                ):
+                    chunk.append(dict(record))
+                    if len(chunk) >= self.chunk_size:
+                        await self.send(query, chunk)
+                        count += len(chunk)
+                        chunk = []
+                if chunk:
+                    await self.send(query, chunk)
+                    count += len(chunk)
+        except PostgresError as ex:
+            await logger.aerror(f"Search {self.key} failed: {repr(ex)}")
+            await self.websocket.send_json({"query": query, "error": repr(ex)})
+            return
+        await self.websocket.send_json({"query": query, "done": True, "count": count})
+        await logger.ainfo(f"Search {self.key} completed", query=query, count=count)
+
+    async def send(self, query: str, results: list[dict[str, Any]]) -> None:
+        await self.websocket.send_json({"query": query, "results": results})
@@ -0,0 +1,387 @@
+"""
+Load the Shakespeare dataset from the `db/shakespeare_*.sql` INSERT dumps with COPY.
+
+Run with `make docker-load-database`, or directly with
+`python -m app.services.seed db --jobs 4`. Each dump is parsed once into a COPY text
+stream and every table is loaded over its own pooled connection, at most `--jobs` at a
+time. Primary keys, unique constraints, indexes and foreign keys of the loaded tables are
+dropped first and rebuilt from the SQLAlchemy metadata afterwards, so rows are never
+checked or indexed one at a time. Dumps already loaded, per the import ledger, into a
+table that still holds their rows are skipped, so the loader can run on every start. A dump
+enters the ledger only once its table is keyed and indexed again, so a load interrupted
+before that is redone on the next run; every run also recreates any key, index or foreign
+key of the dumped tables that is missing from the catalog.
+"""
+
+import argparse
+import asyncio
+import hashlib
+import re
+import time
+from pathlib import Path
+
+from attrs import define
+from rotoger import get_logger
+from sqlalchemy import Table
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.schema import (
+    AddConstraint,
+    CreateIndex,
+    DropConstraint,
+    DropIndex,
+    ForeignKeyConstraint,
+)
+from starlette.concurrency import run_in_threadpool
+
+import app.models  # noqa: F401  registers the tables and statements
+from app.database import DriverPool, engine
+from app.models.base import Base
+from app.schemas.bulk import ImportReport
+from app.utils.statements import statement_registry
+
+logger = get_logger()
+
+_dialect = postgresql.dialect()
+
+INSERT_PATTERN = re.compile(
+    r"insert\s+into\s+([\w.]+)\s*\(([^)]*)\)\s*values", re.IGNORECASE
+)
+VALUE_PATTERN = re.compile(
+    r"\s*(?:'((?:[^']|'')*)'|(null)\b|([-+]?[\d.]+(?:e[-+]?\d+)?|true|false)|([(),;]))",
+    re.IGNORECASE,
+)
+# COPY text format escapes
+ESCAPES = str.maketrans({"\\": "\\\\", "\t": "\\t", "\n": "\\n", "\r": "\\r"})
+
+
+@define(frozen=True, slots=True)
+class SqlDump:
+    """
+    Rows of an INSERT script converted to a COPY text stream.
+
+    Attributes:
+        path (Path): The dump file.
+        table (Table): The target table.
+        columns (tuple[str, ...]): Columns in the order of the INSERT statements.
+        sha256 (str): Digest of the dump file.
+        rows (int): Number of rows.
+        payload (bytes): Tab-separated rows with `\\N` for NULL.
+    """
+
+    path: Path
+    table: Table
+    columns: tuple[str, ...]
+    sha256: str
+    rows: int
+    payload: bytes
+
+    @property
+    def target(self) -> str:
+        return self.table.fullname
+
+
+def _copy_value(kind: int, value: str) -> str:
+    if kind == 1:
+        return value.replace("''", "'").translate(ESCAPES)
+    if kind == 2:
+        return r"\N"
+    return value
+
+
+def read_dump(path: Path) -> SqlDump:
+    """
+    Parse the `INSERT INTO ... VALUES (...), (...);` statements of a dump.
+
+    Args:
+        path (Path): The dump file.
+
+    Returns:
+        SqlDump: The rows as a COPY text stream.
+
+    Raises:
+        ValueError: If the file holds no INSERT, inserts into several tables or
+            columns of one table that differ, targets an unknown table, or is malformed.
+    """
+    raw = path.read_bytes()
+    text = raw.decode()
+    statements = list(INSERT_PATTERN.finditer(text))
+    if not statements:
+        raise ValueError(f"{path.name}: no INSERT statement")
+    names = {statement[1] for statement in statements}
+    headers = {statement[2] for statement in statements}
+    if len(names) > 1 or len({header.replace(" ", "") for header in headers}) > 1:
+        raise ValueError(
+            f"{path.name}: INSERTs into more than one table or column list"
+        )
+    name = names.pop()
+    table = Base.metadata.tables.get(name)
+    if table is None:
+        raise ValueError(f"{path.name}: unknown table {name}")
+    columns = tuple(column.strip() for column in statements[0][2].split(","))
+
+    lines: list[str] = []
+    row: list[str] = []
+    depth = 0
+    for statement, following in zip(statements, [*statements[1:], None], strict=True):
+        position = statement.end()
+        end = following.start() if following else len(text)
+        while position < end:
+            token = VALUE_PATTERN.match(text, position)
+            if token is None:
+                if text[position:end].strip():
+                    raise ValueError(f"{path.name}: cannot parse at offset {position}")
+                break
+            position = token.end()
+            punctuation = token[4]
+            if punctuation == "(":
+                depth, row = depth + 1, []
+            elif punctuation == ")":
+                depth -= 1
+                if len(row) != len(columns):
+                    raise ValueError(
+                        f"{path.name}: row {len(lines) + 1} has {len(row)} values"
+                    )
+                lines.append("\t".join(row))
+            elif punctuation is None:
+                kind = next(index for index in (1, 2, 3) if token[index] is not None)
+                row.append(_copy_value(kind, token[kind]))
+            if depth not in (0, 1):
+                raise ValueError(f"{path.name}: unbalanced parentheses")
+    return SqlDump(
+        path=path,
+        table=table,
+        columns=columns,
+        sha256=hashlib.sha256(raw).hexdigest(),
+        rows=len(lines),
+        payload=("\n".join(lines) + "\n").encode() if lines else b"",
+    )
+
+
+def _ddl(element) -> str:
+    return str(element.compile(dialect=_dialect))
+
+
+def _qualified(element) -> str:
+    return f"{element.table.schema}.{element.name}"
+
+
+def deferred_ddl(
+    tables: list[Table],
+) -> tuple[list[str], dict[str, dict[str, str]], dict[str, str]]:
+    """
+    DDL to drop and rebuild the keys, indexes and foreign keys of the tables to load.
+
+    Foreign keys of other tables that reference a loaded table are included, as its
+    primary key cannot be dropped under them. Unnamed constraints are left in place.
+
+    Args:
+        tables (list[Table]): The tables to load.
+
+    Returns:
+        tuple: Statements that drop everything, the statements that recreate the keys and
+        indexes of each table, and those that recreate the foreign keys; recreating
+        statements are keyed by the schema-qualified name of what they create.
+    """
+    foreign_keys = [
+        constraint
+        for table in Base.metadata.sorted_tables
+        for constraint in table.foreign_key_constraints
+        if constraint.name
+        and (constraint.table in tables or constraint.referred_table in tables)
+    ]
+    keys = [
+        constraint
+        for table in tables
+        for constraint in table.constraints
+        if constraint.name and not isinstance(constraint, ForeignKeyConstraint)
+    ]
+    indexes = [index for table in tables for index in table.indexes]
+    drop = [
+        *(
+            _ddl(DropConstraint(constraint, if_exists=True))
+            for constraint in foreign_keys
+        ),
+        *(_ddl(DropIndex(index, if_exists=True)) for index in indexes),
+        *(_ddl(DropConstraint(constraint, if_exists=True)) for constraint in keys),
+    ]
+    build = {
+        table.fullname: {
+            **{
+                _qualified(constraint): _ddl(AddConstraint(constraint))
+                for constraint in keys
+                if constraint.table is table
+            },
+            **{_qualified(index): _ddl(CreateIndex(index)) for index in table.indexes},
+        }
+        for table in tables
+    }
+    link = {
+        _qualified(constraint): _ddl(AddConstraint(constraint))
+        for constraint in foreign_keys
+    }
+    return drop, build, link
+
+
+async def existing_names(pool, tables: list[Table]) -> set[str]:
+    """Schema-qualified names of the constraints and indexes in the schemas of `tables`."""
+    schemas = sorted({table.schema for table in tables})
+    rows = await pool.fetch(
+        "SELECT n.nspname || '.' || c.conname FROM pg_constraint c "
+        "JOIN pg_namespace n ON n.oid = c.connamespace WHERE n.nspname = any($1::text[]) "
+        "UNION SELECT schemaname || '.' || indexname FROM pg_indexes "
+        "WHERE schemaname = any($1::text[])",
+        schemas,
+    )
+    return {row[0] for row in rows}
+
+
+async def is_loaded(pool, dump: SqlDump) -> bool:
+    row = await statement_registry.fetchrow(
+        pool, "import_ledger.find", target=dump.target, fingerprint=dump.sha256
+    )
+    if row is None:
+        return False
+    # A table that lost or gained rows since the load is loaded again
+    count = await pool.fetchrow(f"SELECT count(*) FROM {dump.target}")
+    return count[0] == ImportReport.model_validate_json(row["report"]).rows
+
+
+async def copy_dump(pool, dump: SqlDump) -> float:
+    """
+    Replace the rows of a table with a dump in one transaction.
+
+    Truncating in the loading transaction keeps the old rows until the new ones commit.
+
+    Args:
+        pool: The asyncpg pool to load with.
+        dump (SqlDump): The parsed dump.
+
+    Returns:
+        float: Seconds taken.
+    """
+    started = time.perf_counter()
+    schema, name = dump.target.split(".")
+    async with pool.acquire() as connection, connection.transaction():
+        await connection.execute(f"TRUNCATE {dump.target}")
+        await connection.copy_to_table(
+            name,
+            schema_name=schema,
+            columns=list(dump.columns),
+            # bytes would be taken for a file path; a memoryview is sent as is
+            source=memoryview(dump.payload),
+            format="text",
+        )
+    return time.perf_counter() - started
+
+
+async def record_dump(pool, dump: SqlDump) -> None:
+    report = ImportReport(
+        filename=dump.path.name,
+        rows=dump.rows,
+        inserted=dump.rows,
+        sha256=dump.sha256,
+    )
+    await statement_registry.fetchrow(
+        pool,
+        "import_ledger.record",
+        target=dump.target,
+        fingerprint=dump.sha256,
+        sha256=dump.sha256,
+        source=dump.path.name,
+        rows=dump.rows,
+        report=report.model_dump_json(),
+    )
+
+
+async def build_indexes(pool, statements: list[str]) -> None:
+    async with pool.acquire() as connection:
+        for statement in statements:
+            await connection.execute(statement)
+
+
+async def load(directory: Path, jobs: int = 4, force: bool = False) -> dict[str, str]:
+    """
+    Load every `shakespeare_*.sql` dump of a directory whose table is not up to date.
+
+    Args:
+        directory (Path): Directory of the dumps.
+        jobs (int): Tables loaded, and indexed, concurrently.
+        force (bool): Reload tables already loaded from the same dumps.
+
+    Returns:
+        dict[str, str]: The outcome per table.
+    """
+    pool = DriverPool(engine)
+    paths = sorted(directory.glob("shakespeare_*.sql"))
+    dumps = await asyncio.gather(
+        *(run_in_threadpool(read_dump, path) for path in paths)
+    )
+    outcome: dict[str, str] = {}
+    pending = []
+    for dump in dumps:
+        if not force and await is_loaded(pool, dump):
+            outcome[dump.target] = "up to date"
+        else:
+            pending.append(dump)
+
+    tables = [dump.table for dump in pending]
+    drop, _, _ = deferred_ddl(tables)
+    # Rebuilt for every dumped table, so what an interrupted run left dropped comes back
+    _, build, link = deferred_ddl([dump.table for dump in dumps])
+    slots = asyncio.Semaphore(jobs)
+
+    async def limited(coroutine):
+        async with slots:
+            return await coroutine
+
+    try:
+        if pending:
+            await build_indexes(pool, drop)
+            seconds = await asyncio.gather(
+                *(limited(copy_dump(pool, dump)) for dump in pending)
+            )
+            for dump, taken in zip(pending, seconds, strict=True):
+                outcome[dump.target] = f"{dump.rows} rows in {taken:.2f} s"
+    finally:
+        # Rebuilt even after a failed drop or load: its transaction rolled back to the old
+        # rows. Only what is missing is created, so a run with nothing to load is a no-op.
+        existing = await existing_names(pool, [dump.table for dump in dumps])
+        missing = [
+            [sql for name, sql in statements.items() if name not in existing]
+            for statements in build.values()
+        ]
+        await asyncio.gather(
+            *(limited(build_indexes(pool, statements)) for statements in missing)
+        )
+        await build_indexes(
+            pool,
+            [
+                *(sql for name, sql in link.items() if name not in existing),
+                *(f"ANALYZE {table.fullname}" for table in tables),
+            ],
+        )
+    # Only now, so a run stopped before the rebuild does not skip these tables next time
+    for dump in pending:
+        await record_dump(pool, dump)
+    await logger.ainfo("Shakespeare dataset loaded", **outcome)
+    return outcome
+
+
+async def main(directory: Path, jobs: int, force: bool) -> None:
+    started = time.perf_counter()
+    try:
+        outcome = await load(directory, jobs, force)
+    finally:
+        await engine.dispose()
+    for target, result in outcome.items():
+        print(f"{target:28} {result}")
+    print(f"{'total':28} {time.perf_counter() - started:.2f} s")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("directory", type=Path, nargs="?", default=Path("db"))
+    parser.add_argument("--jobs", type=int, default=4)
+    parser.add_argument("--force", action="store_true")
+    arguments = parser.parse_args()
+    asyncio.run(main(arguments.directory, arguments.jobs, arguments.force))
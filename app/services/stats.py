@@ -0,0 +1,136 @@
+import asyncio
+import time
+
+from attrs import define, field
+from fastapi import Request, Response, status
+from rotoger import get_logger
+
+from app.config import settings as global_settings
+from app.models.stats import STATS_VIEWS, refresh_view_sql
+from app.utils.statements import statement_registry
+
+logger = get_logger()
+
+
+@define(slots=True)
+class StatsRefresher:
+    """
+    Scheduled `REFRESH MATERIALIZED VIEW CONCURRENTLY` of the statistics views.
+
+    Every `interval` seconds each worker tries to take a transaction-level advisory lock; the
+    one that gets it compares the write counters of the source tables with those recorded at
+    the last refresh and refreshes only the views that may be stale. A concurrent refresh
+    diffs the new result against the view and applies only the changed rows, so readers are
+    never blocked. Each refresh bumps the view's generation, which tags the responses served
+    from it.
+
+    Attributes:
+        interval (float): Seconds between refresh attempts.
+        task (asyncio.Task | None): The scheduling loop.
+    """
+
+    interval: float
+    task: asyncio.Task | None = field(default=None)
+
+    def start(self, pool) -> None:
+        self.task = asyncio.create_task(self.run(pool))
+
+    async def run(self, pool) -> None:
+        while True:
+            try:
+                await self.refresh(pool)
+            except Exception as ex:  # keep the schedule alive across failed refreshes
+                await logger.aerror(f"Stats refresh failed: {repr(ex)}")
+            await asyncio.sleep(self.interval)
+
+    async def refresh(self, pool, force: bool = False) -> dict[str, int] | None:
+        """
+        Refresh the statistics views whose source tables changed since their last refresh.
+
+        Args:
+            pool: The asyncpg pool to refresh with.
+            force (bool): Refresh every view even if its sources look unchanged.
+
+        Returns:
+            dict[str, int] | None: The new generation of each refreshed view, or `None` when
+            another worker is refreshing.
+        """
+        refreshed: dict[str, int] = {}
+        async with pool.acquire() as connection, connection.transaction():
+            row = await statement_registry.fetchrow(connection, "stats.try_lock")
+            if not row[0]:
+                return None
+            version = (
+                await statement_registry.fetchrow(connection, "stats.source_version")
+            )[0]
+            for view in STATS_VIEWS:
+                current = await statement_registry.fetchrow(
+                    connection, "stats.generation", view=view
+                )
+                if (
+                    not force
+                    and current is not None
+                    and current["source_version"] == version
+                ):
+                    continue
+                started = time.perf_counter()
+                await connection.execute(refresh_view_sql(view))
+                record = await statement_registry.fetchrow(
+                    connection,
+                    "stats.record_refresh",
+                    view=view,
+                    source_version=version,
+                    seconds=round(time.perf_counter() - started, 3),
+                )
+                refreshed[view] = record["generation"]
+        if refreshed:
+            await logger.ainfo("Stats views refreshed", **refreshed)
+        return refreshed
+
+    async def shutdown(self) -> None:
+        if self.task is not None and not self.task.done():
+            self.task.cancel()
+            await asyncio.gather(self.task, return_exceptions=True)
+
+
+async def view_etag(executor, view: str) -> str:
+    """
+    Entity tag of the responses served from a statistics view.
+
+    Args:
+        executor: An asyncpg pool or connection.
+        view (str): The view name.
+
+    Returns:
+        str: A strong ETag naming the view and its refresh generation; generation 0 until
+        the view is first refreshed.
+    """
+    row = await statement_registry.fetchrow(executor, "stats.generation", view=view)
+    return f'"{view}-{row["generation"] if row else 0}"'
+
+
+def not_modified(request: Request, response: Response, etag: str) -> Response | None:
+    """
+    Tag the response, and answer 304 when the client already holds this generation.
+
+    Args:
+        request (Request): The incoming request and its `If-None-Match` header.
+        response (Response): The response the ETag header is set on.
+        etag (str): The current entity tag.
+
+    Returns:
+        Response | None: An empty 304 response, or `None` when the body must be sent.
+    """
+    response.headers["ETag"] = etag
+    tags = {
+        tag.strip().removeprefix("W/")
+        for tag in request.headers.get("if-none-match", "").split(",")
+    }
+    if etag in tags or "*" in tags:
+        return Response(
+            status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag}
+        )
+    return None
+
+
+stats_refresher = StatsRefresher(interval=global_settings.STATS_REFRESH_INTERVAL)
@@ -0,0 +1,144 @@
+import time
+from pathlib import Path
+from uuid import UUID, uuid4
+
+import polars as pl
+import pyarrow as pa
+from attrs import define, field
+
+from app.config import settings as global_settings
+
+REJECTS_DIR = Path(global_settings.IMPORT_REJECTS_DIR)
+
+
+@define(frozen=True, slots=True)
+class FrameRules:
+    """
+    Constraints of an import target expressed as polars expressions over whole batches.
+
+    String columns are trimmed first; a row is rejected with every reason that applies to it.
+
+    Attributes:
+        required (tuple[str, ...]): Columns that must not be null or blank.
+        max_length (dict[str, int]): Maximum number of characters per column.
+        unique (tuple[str, ...]): Columns whose values must be unique within the file.
+    """
+
+    required: tuple[str, ...] = ()
+    max_length: dict[str, int] = field(factory=dict)
+    unique: tuple[str, ...] = ()
+
+    def checks(self, seen: dict[str, pl.Series]) -> list[pl.Expr]:
+        return [
+            *(
+                pl.when(
+                    pl.col(column).is_null() | (pl.col(column).str.len_chars() == 0)
+                ).then(pl.lit(f"{column} is required"))
+                for column in self.required
+            ),
+            *(
+                pl.when(pl.col(column).str.len_chars() > limit).then(
+                    pl.lit(f"{column} is longer than {limit} characters")
+                )
+                for column, limit in self.max_length.items()
+            ),
+            *(
+                # Missing values are reported by `required`, not as duplicates
+                pl.when(
+                    pl.col(column).is_not_null()
+                    & (
+                        ~pl.col(column).is_first_distinct()
+                        | pl.col(column).is_in(seen[column].implode())
+                    )
+                ).then(pl.lit(f"duplicate {column} in file"))
+                for column in self.unique
+            ),
+        ]
+
+
+def rejects_path(rejects_id: str) -> Path:
+    """
+    Location of a reject file.
+
+    Args:
+        rejects_id (str): The id reported by the import.
+
+    Returns:
+        Path: The CSV file of rejected rows.
+
+    Raises:
+        ValueError: If `rejects_id` is not a valid id.
+    """
+    return REJECTS_DIR / f"{UUID(rejects_id).hex}.csv"
+
+
+def prune_rejects(max_age: int) -> None:
+    """Remove reject files older than `max_age` seconds."""
+    expired = time.time() - max_age
+    for path in REJECTS_DIR.glob("*.csv"):
+        if path.stat().st_mtime < expired:
+            path.unlink(missing_ok=True)
+
+
+@define(slots=True)
+class FrameValidator:
+    """
+    Split Arrow batches into valid rows and rejects in one vectorized pass per batch.
+
+    Values already accepted from earlier batches are kept as polars Series, so uniqueness
+    holds across the whole file. Rejected rows are appended, with their 1-based row number
+    in the file and the reasons, to a CSV reject file created on the first reject.
+
+    Attributes:
+        rules (FrameRules): Constraints to enforce.
+        rows (int): Rows validated so far.
+        rejected (int): Rows rejected so far.
+        rejects_id (str | None): Id of the reject file, once there is one.
+    """
+
+    rules: FrameRules
+    rows: int = field(default=0)
+    rejected: int = field(default=0)
+    rejects_id: str | None = field(default=None)
+    seen: dict[str, pl.Series] = field(factory=dict)
+
+    def split(self, batch: pa.RecordBatch) -> pa.Table:
+        """
+        Validate a batch, record its rejects and return the valid, trimmed rows.
+
+        Args:
+            batch (pa.RecordBatch): Batch of string columns.
+
+        Returns:
+            pa.Table: The rows that satisfy every rule.
+        """
+        for column in self.rules.unique:
+            self.seen.setdefault(column, pl.Series(column, [], dtype=pl.String))
+        frame = (
+            pl.from_arrow(batch)
+            .with_columns(pl.col(pl.String).str.strip_chars())
+            .with_columns(
+                row=pl.int_range(self.rows + 1, self.rows + batch.num_rows + 1),
+                reason=pl.concat_str(
+                    self.rules.checks(self.seen), separator="; ", ignore_nulls=True
+                ),
+            )
+        )
+        self.rows += batch.num_rows
+        rejects = frame.filter(pl.col("reason") != "")
+        valid = frame.filter(pl.col("reason") == "").drop("row", "reason")
+        for column in self.rules.unique:
+            self.seen[column].append(valid.get_column(column))
+        if rejects.height:
+            self.write_rejects(rejects.select("row", *batch.schema.names, "reason"))
+        return valid.to_arrow()
+
+    def write_rejects(self, rejects: pl.DataFrame) -> None:
+        first = self.rejects_id is None
+        if first:
+            REJECTS_DIR.mkdir(parents=True, exist_ok=True)
+            prune_rejects(global_settings.IMPORT_JOB_TTL)
+            self.rejects_id = uuid4().hex
+        with rejects_path(self.rejects_id).open("ab") as file:
+            rejects.write_csv(file, include_header=first)
+        self.rejected += rejects.height
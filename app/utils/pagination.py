@@ -0,0 +1,44 @@
+import base64
+import binascii
+from typing import Any
+
+import orjson
+from fastapi import HTTPException, status
+
+
+def encode_cursor(value: Any) -> str | None:
+    """
+    Encode the last key of a page into an opaque cursor token.
+
+    Args:
+        value (Any): The key of the last row on the page, or `None` when there is no next page.
+
+    Returns:
+        str | None: A URL-safe token, or `None` when `value` is `None`.
+    """
+    if value is None:
+        return None
+    return base64.urlsafe_b64encode(orjson.dumps(value)).decode()
+
+
+def decode_cursor(token: str | None) -> Any:
+    """
+    Decode a cursor token produced by `encode_cursor`.
+
+    Args:
+        token (str | None): The token sent by the client.
+
+    Returns:
+        Any: The key to continue after, or `None` for the first page.
+
+    Raises:
+        HTTPException: If the token is malformed.
+    """
+    if token is None:
+        return None
+    try:
+        return orjson.loads(base64.urlsafe_b64decode(token.encode()))
+    except (binascii.Error, orjson.JSONDecodeError, ValueError) as ex:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor."
+        ) from ex
@@ -0,0 +1,152 @@
+from collections.abc import Mapping
+from typing import Any
+
+from attrs import define, field
+from sqlalchemy import Float, Integer, String, bindparam, func, select
+from sqlalchemy.dialects.postgresql.asyncpg import PGDialect_asyncpg
+from sqlalchemy.sql import ColumnElement, Executable
+
+_dialect = PGDialect_asyncpg()
+
+
+@define(frozen=True, slots=True)
+class PreparedQuery:
+    """Parameterized SQL text and the order in which bind values are passed to asyncpg."""
+
+    sql: str
+    params: tuple[str, ...]
+
+    def args(self, values: Mapping[str, Any]) -> list[Any]:
+        try:
+            return [values[param] for param in self.params]
+        except KeyError as ex:
+            raise ValueError(f"Missing bind parameter {ex.args[0]!r}") from ex
+
+
+@define(slots=True)
+class StatementRegistry:
+    """
+    Registry of SQLAlchemy statements compiled once into asyncpg-ready SQL.
+
+    Models register statements built with named `bindparam`s. `compile_all` renders them
+    at startup into `$n` parameterized text, so every call sends the same query string and
+    asyncpg reuses the prepared statement from its per-connection statement cache instead
+    of parsing and planning a literal query on every request.
+
+    Attributes:
+        statements (dict[str, Executable]): Registered statements by key.
+        compiled (dict[str, PreparedQuery]): Statements already rendered for asyncpg.
+    """
+
+    statements: dict[str, Executable] = field(factory=dict)
+    compiled: dict[str, PreparedQuery] = field(factory=dict)
+
+    def register(self, key: str, stmt: Executable) -> None:
+        if key in self.statements:
+            raise ValueError(f"Statement {key!r} is already registered")
+        self.statements[key] = stmt
+
+    def compile(self, key: str) -> PreparedQuery:
+        compiled = self.statements[key].compile(dialect=_dialect)
+        query = PreparedQuery(
+            sql=compiled.string, params=tuple(compiled.positiontup or ())
+        )
+        self.compiled[key] = query
+        return query
+
+    def compile_all(self) -> list[str]:
+        """Compile every registered statement, returning the compiled keys."""
+        for key in self.statements:
+            self.compile(key)
+        return list(self.compiled)
+
+    def get(self, key: str) -> PreparedQuery:
+        return self.compiled.get(key) or self.compile(key)
+
+    async def fetchrow(self, executor, key: str, **values: Any):
+        """
+        Run a registered statement and return the first row.
+
+        Args:
+            executor: An asyncpg pool or connection.
+            key (str): The registered statement key.
+            **values: Values for the statement bind parameters.
+
+        Returns:
+            asyncpg.Record | None: The first row, or `None` when nothing matched.
+        """
+        query = self.get(key)
+        return await executor.fetchrow(query.sql, *query.args(values))
+
+    async def fetch(self, executor, key: str, **values: Any):
+        """
+        Run a registered statement and return all rows.
+
+        Args:
+            executor: An asyncpg pool or connection.
+            key (str): The registered statement key.
+            **values: Values for the statement bind parameters.
+
+        Returns:
+            list[asyncpg.Record]: The matching rows.
+        """
+        query = self.get(key)
+        return await executor.fetch(query.sql, *query.args(values))
+
+    def cursor(self, connection, key: str, prefetch: int, **values: Any):
+        """
+        Open a server-side cursor over a registered statement.
+
+        Args:
+            connection: An asyncpg connection inside a transaction.
+            key (str): The registered statement key.
+            prefetch (int): Number of rows fetched from the server per round trip.
+            **values: Values for the statement bind parameters.
+
+        Returns:
+            asyncpg.cursor.CursorFactory: An async iterable over the rows.
+        """
+        query = self.get(key)
+        return connection.cursor(query.sql, *query.args(values), prefetch=prefetch)
+
+
+def like_prefix(prefix: str) -> str:
+    """Escape LIKE wildcards in `prefix` and return the pattern matching values it starts."""
+    escaped = prefix.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"{escaped}%"
+
+
+def name_lookups(column: ColumnElement[str]) -> dict[str, Executable]:
+    """
+    Build fuzzy and prefix lookups over a text column with a `gin_trgm_ops` index.
+
+    `similar` matches values whose trigram similarity to `:q` reaches
+    `pg_trgm.similarity_threshold`, through the `%` operator the index supports.
+    `autocomplete` matches the `ILIKE :pattern` of `like_prefix`, which the same index
+    serves, ranked by similarity to `:prefix` so the closest completions come first.
+
+    Args:
+        column (ColumnElement[str]): The indexed column.
+
+    Returns:
+        dict[str, Executable]: The `similar` and `autocomplete` statements, both returning
+        `name` and `score` and limited by `:limit`.
+    """
+    limit = bindparam("limit", type_=Integer)
+    query = bindparam("q", type_=String)
+    prefix = bindparam("prefix", type_=String)
+    similar_score = func.similarity(column, query, type_=Float).label("score")
+    prefix_score = func.similarity(column, prefix, type_=Float).label("score")
+    return {
+        "similar": select(column.label("name"), similar_score)
+        .where(column.bool_op("%")(query))
+        .order_by(similar_score.desc(), column)
+        .limit(limit),
+        "autocomplete": select(column.label("name"), prefix_score)
+        .where(column.ilike(bindparam("pattern", type_=String)))
+        .order_by(prefix_score.desc(), column)
+        .limit(limit),
+    }
+
+
+statement_registry = StatementRegistry()
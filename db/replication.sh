@@ -0,0 +1,4 @@
+#!/bin/sh
+# Allow the streaming replica from replica-compose.yml to connect for replication.
+set -e
+echo "host replication all all scram-sha-256" >> "$PGDATA/pg_hba.conf"
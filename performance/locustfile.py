@@ -1,5 +1,11 @@
+import random
+
 from locust import HttpUser, between, task
 
+# Distinct names make every literal-SQL lookup a new query text, which is where
+# the prepared statement path should pull ahead on p50/p99.
+STUFF_NAMES = [f"string{i}" for i in range(1000)]
+
 
 class Stuff(HttpUser):
     wait_time = between(1, 3)
@@ -11,3 +17,24 @@ class Stuff(HttpUser):
     @task
     def find_stuff_with_pool(self):
         self.client.get("/v1/stuff/pool/string")
+
+
+class StuffLookupComparison(HttpUser):
+    """
+    Compare ORM session lookups with the prepared statement pool path.
+
+    Run with `locust -f performance/locustfile.py StuffLookupComparison` and compare
+    the 50%/99% columns of the two named request groups.
+    """
+
+    wait_time = between(0.1, 0.5)
+
+    @task
+    def find_stuff_orm(self):
+        name = random.choice(STUFF_NAMES)
+        self.client.get(f"/v1/stuff/{name}", name="/v1/stuff/[name] orm")
+
+    @task
+    def find_stuff_prepared(self):
+        name = random.choice(STUFF_NAMES)
+        self.client.get(f"/v1/stuff/pool/{name}", name="/v1/stuff/pool/[name] prepared")
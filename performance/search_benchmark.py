@@ -0,0 +1,69 @@
+"""
+Compare ranked full text search of Shakespeare paragraphs with an ILIKE scan.
+
+Run against a seeded database with `make docker-benchmark-search`, or directly with
+`python -m performance.search_benchmark --repeat 50`. Each term is searched `--repeat`
+times with both statements on one pooled connection, after a warm-up round, and the
+p50/p95 latencies in milliseconds are printed per term.
+
+The ILIKE baseline has the same filters and limit but no ranking, so it can stop at the
+first matching rows: common words flatter it, rare words show the cost of the full scan.
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+
+import app.models  # noqa: F401  registers the statements
+from app.database import DriverPool, engine
+from app.utils.statements import statement_registry
+
+TERMS = ["love", "king", "ghost", "murder most foul", "dagger", "quietus", "bodkin"]
+
+
+async def timed(connection, key: str, repeat: int, **values) -> tuple[list[float], int]:
+    samples = []
+    rows = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        rows = await statement_registry.fetch(connection, key, **values)
+        samples.append((time.perf_counter() - started) * 1000)
+    return samples, len(rows)
+
+
+def summary(samples: list[float]) -> str:
+    p50 = statistics.median(samples)
+    p95 = statistics.quantiles(samples, n=20)[-1] if len(samples) > 1 else p50
+    return f"p50 {p50:8.2f} ms  p95 {p95:8.2f} ms"
+
+
+async def main(terms: list[str], repeat: int, limit: int) -> None:
+    filters = {"work_id": None, "character": None, "genre": None, "limit": limit}
+    async with DriverPool(engine).acquire() as connection:
+        for term in terms:
+            await statement_registry.fetch(
+                connection, "paragraph.search", q=term, **filters
+            )
+            fts, fts_rows = await timed(
+                connection, "paragraph.search", repeat, q=term, **filters
+            )
+            ilike, ilike_rows = await timed(
+                connection,
+                "paragraph.search_ilike",
+                repeat,
+                pattern=f"%{term}%",
+                **filters,
+            )
+            print(f"{term!r:20} fts   {summary(fts)}  rows {fts_rows}")
+            print(f"{'':20} ilike {summary(ilike)}  rows {ilike_rows}")
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("terms", nargs="*", default=TERMS)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--limit", type=int, default=20)
+    arguments = parser.parse_args()
+    asyncio.run(main(arguments.terms, arguments.repeat, arguments.limit))
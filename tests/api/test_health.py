@@ -10,3 +10,23 @@ async def test_redis_health(client: AsyncClient):
     assert response.status_code == status.HTTP_200_OK
     # assert payload["name"] == response.json()["name"]
     # assert UUID(response.json()["id"])
+
+
+async def test_cache_stats(client: AsyncClient):
+    response = await client.get("/public/health/cache")
+    assert response.status_code == status.HTTP_200_OK
+    assert [cache["namespace"] for cache in response.json()["caches"]] == [
+        "stuff",
+        "nonsense",
+        "stuff.autocomplete",
+        "nonsense.autocomplete",
+        "shakespeare.related",
+    ]
+
+
+async def test_database_pool_stats(client: AsyncClient):
+    response = await client.get("/public/health/database")
+    assert response.status_code == status.HTTP_200_OK
+    assert {"size", "checked_out", "idle", "overflow", "checkouts"} <= set(
+        response.json()
+    )
@@ -1,5 +1,13 @@
+import hashlib
+import io
+from uuid import uuid4
+
+import anyio
+import pyarrow as pa
+import pyarrow.parquet as pq
 import pytest
 from anyio import Path
+from dirty_equals import IsPositiveFloat
 from fastapi import status
 from httpx import AsyncClient
 
@@ -23,4 +31,163 @@ async def test_import_animals(client: AsyncClient):
     )
 
     assert response.status_code == expected_status
-    assert response.json() == {"filename": "nonsense.xlsx", "nonsense_records": 10}
+    assert response.json() == {
+        "filename": "nonsense.xlsx",
+        "rows": 10,
+        "inserted": 10,
+        "rejected": 0,
+        "rejects_id": None,
+        "updated": 0,
+        "skipped": 0,
+        "sha256": hashlib.sha256(_bytes).hexdigest(),
+        "duplicate": False,
+        "batches": 1,
+        "seconds": IsPositiveFloat,
+        "rows_per_second": IsPositiveFloat,
+        "worker_peak_memory_mb": IsPositiveFloat,
+    }
+
+    # The same file is answered from the import ledger without being read again
+    response = await client.post(
+        "/nonsense/import",
+        files={"xlsx": ("nonsense.xlsx", _bytes)},
+        headers=headers,
+    )
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["duplicate"] is True
+    assert response.json()["inserted"] == 10
+
+    response = await client.post(
+        "/nonsense/import",
+        files={"xlsx": ("nonsense.xlsx", _bytes)},
+        headers=headers,
+        params={"batch_size": 4, "diff": True},
+    )
+    assert response.status_code == expected_status
+    assert response.json()["batches"] == 3
+    assert response.json()["skipped"] == 10
+
+
+async def test_import_diff_updates_changed_rows(client: AsyncClient):
+    names = [f"diff-{uuid4().hex}" for _ in range(3)]
+    body = "name,description\n" + "".join(f"{name},first\n" for name in names)
+    files = {"xlsx": ("feed.csv", body.encode())}
+    headers = {"Content-type": "multipart/form-data; boundary={}"}
+    response = await client.post("/nonsense/import", files=files, headers=headers)
+    assert response.json()["inserted"] == 3
+
+    body = body.replace(f"{names[0]},first", f"{names[0]},second")
+    body += f"diff-{uuid4().hex},new\n"
+    response = await client.post(
+        "/nonsense/import",
+        files={"xlsx": ("feed.csv", body.encode())},
+        headers=headers,
+        params={"diff": True},
+    )
+    assert {
+        key: response.json()[key] for key in ("inserted", "updated", "skipped")
+    } == {"inserted": 1, "updated": 1, "skipped": 2}
+
+    response = await client.get("/nonsense/", params={"name": names[0]})
+    assert response.json()["description"] == "second"
+
+
+async def test_import_csv_with_column_mapping(client: AsyncClient):
+    names = [f"csv-{uuid4().hex}" for _ in range(3)]
+    body = "title,description\n" + "".join(f"{name},imported\n" for name in names)
+    response = await client.post(
+        "/nonsense/import",
+        files={"xlsx": ("nonsense.csv", body.encode())},
+        headers={"Content-type": "multipart/form-data; boundary={}"},
+        params={"mapping": "title:name"},
+    )
+    assert response.status_code == status.HTTP_201_CREATED
+    assert response.json()["inserted"] == 3
+
+    response = await client.post(
+        "/nonsense/import",
+        files={"xlsx": ("nonsense.csv", body.encode())},
+        headers={"Content-type": "multipart/form-data; boundary={}"},
+        params={"mapping": "title"},
+    )
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+
+async def test_import_rejects(client: AsyncClient):
+    name = f"csv-{uuid4().hex}"
+    body = f"name,description\n {name} ,valid\n{name},duplicate\n,no name\n"
+    response = await client.post(
+        "/nonsense/import",
+        files={"xlsx": ("nonsense.csv", body.encode())},
+        headers={"Content-type": "multipart/form-data; boundary={}"},
+    )
+    assert response.json()["inserted"] == 1
+    assert response.json()["rejected"] == 2
+
+    response = await client.get(
+        f"/nonsense/import/rejects/{response.json()['rejects_id']}"
+    )
+    assert response.status_code == status.HTTP_200_OK
+    assert response.text.splitlines() == [
+        "row,name,description,reason",
+        f"2,{name},duplicate,duplicate name in file",
+        "3,,no name,name is required",
+    ]
+
+
+async def test_import_parquet(client: AsyncClient):
+    table = pa.table(
+        {
+            "name": [f"parquet-{uuid4().hex}" for _ in range(5)],
+            "description": ["imported"] * 5,
+        }
+    )
+    buffer = io.BytesIO()
+    pq.write_table(table, buffer, row_group_size=2)
+    response = await client.post(
+        "/nonsense/import",
+        files={"xlsx": ("nonsense.bin", buffer.getvalue())},
+        headers={"Content-type": "multipart/form-data; boundary={}"},
+    )
+    assert response.status_code == status.HTTP_201_CREATED
+    assert response.json()["inserted"] == 5
+
+
+@pytest.mark.parametrize("file_format", ["parquet", "ipc"])
+async def test_import_without_expected_columns(client: AsyncClient, file_format: str):
+    table = pa.table({"title": [f"{file_format}-{uuid4().hex}"]})
+    buffer = io.BytesIO()
+    if file_format == "parquet":
+        pq.write_table(table, buffer)
+    else:
+        with pa.ipc.new_file(buffer, table.schema) as writer:
+            writer.write_table(table)
+    response = await client.post(
+        "/nonsense/import",
+        files={"xlsx": ("nonsense.bin", buffer.getvalue())},
+        headers={"Content-type": "multipart/form-data; boundary={}"},
+    )
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+    assert "Missing columns ['name', 'description']" in response.json()["detail"]
+
+
+async def test_import_job(client: AsyncClient):
+    _bytes = await Path("tests/api/nonsense.xlsx").read_bytes()
+    response = await client.post(
+        "/nonsense/import/jobs",
+        files={"xlsx": ("nonsense.xlsx", _bytes)},
+        headers={"Content-type": "multipart/form-data; boundary={}"},
+    )
+    assert response.status_code == status.HTTP_202_ACCEPTED
+    job_id = response.json()["job_id"]
+
+    for _ in range(50):
+        response = await client.get(f"/nonsense/import/{job_id}")
+        if response.json()["status"] not in ("queued", "running"):
+            break
+        await anyio.sleep(0.1)
+    assert response.json()["status"] == "completed"
+    assert response.json()["rows_processed"] == 10
+
+    response = await client.get("/nonsense/import/unknown")
+    assert response.status_code == status.HTTP_404_NOT_FOUND
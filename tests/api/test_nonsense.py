@@ -0,0 +1,35 @@
+from uuid import uuid4
+
+import pytest
+from fastapi import status
+from httpx import AsyncClient
+from inline_snapshot import snapshot
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_merge_many_nonsense(client: AsyncClient):
+    names = [f"merge-{uuid4().hex}" for _ in range(3)]
+    payload = [{"name": name, "description": "first"} for name in names]
+    response = await client.post("/nonsense/merge_many", json=payload)
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json() == snapshot({"upserted": 3})
+
+    payload = [
+        {"name": names[0], "description": "stale"},
+        {"name": names[0], "description": "second"},
+    ]
+    response = await client.post("/nonsense/merge_many", json=payload)
+    assert response.json() == snapshot({"upserted": 1})
+
+    response = await client.get("/nonsense/", params={"name": names[0]})
+    assert response.json()["description"] == "second"
+
+
+async def test_search_nonsense(client: AsyncClient):
+    response = await client.get("/nonsense/search", params={"q": uuid4().hex})
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json() == snapshot([])
+
+    response = await client.get("/nonsense/search", params={"q": ""})
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
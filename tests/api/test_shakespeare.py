@@ -0,0 +1,95 @@
+import pytest
+from fastapi import status
+from httpx import AsyncClient
+from inline_snapshot import snapshot
+
+from app.services.concordance import Concordance, concordance
+from app.utils.pagination import encode_cursor
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_find_paragraph_page(client: AsyncClient):
+    response = await client.get(
+        "/shakespeare/",
+        params={"character": "Nobody", "fields": ["plain_text"], "limit": 10},
+    )
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json() == snapshot(
+        {"items": [], "next_cursor": None, "characters": {}, "works": {}}
+    )
+
+    response = await client.get(
+        "/shakespeare/", params={"character": "Nobody", "fields": ["unknown"]}
+    )
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+    response = await client.get(
+        "/shakespeare/",
+        params={"character": "Nobody", "cursor": encode_cursor("hamlet")},
+    )
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+async def test_search_paragraphs(client: AsyncClient):
+    response = await client.get(
+        "/shakespeare/search", params={"q": "quietus bodkin", "genre": "t"}
+    )
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json() == snapshot([])
+
+    response = await client.get("/shakespeare/search", params={"q": ""})
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+
+async def test_work_stats_etag(client: AsyncClient):
+    response = await client.get("/shakespeare/stats/works", params={"genre": "t"})
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json() == snapshot([])
+    etag = response.headers["etag"]
+    assert etag == snapshot('"work_stats-0"')
+
+    response = await client.get(
+        "/shakespeare/stats/works", headers={"If-None-Match": etag}
+    )
+    assert response.status_code == status.HTTP_304_NOT_MODIFIED
+    assert response.headers["etag"] == etag
+
+
+async def test_find_related_words(client: AsyncClient):
+    response = await client.get(
+        "/shakespeare/related", params={"word": "Philosophy", "mode": "sounds_like"}
+    )
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json() == snapshot(
+        {
+            "word": "Philosophy",
+            "mode": "sounds_like",
+            "code": "FLSF",
+            "source": "postgres",
+            "forms": [],
+            "total": 0,
+            "paragraphs": [],
+        }
+    )
+
+    response = await client.get(
+        "/shakespeare/related", params={"word": "loving", "mode": "stem"}
+    )
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+
+async def test_related_code_does_not_depend_on_the_concordance(
+    client: AsyncClient, monkeypatch: pytest.MonkeyPatch
+):
+    params = {"word": "Loving", "mode": "same_root"}
+    response = await client.get("/shakespeare/related", params=params)
+    assert response.json()["source"] == "postgres"
+    code = response.json()["code"]
+
+    # "loving" is in the corpus but not in `wordform`
+    index = Concordance.build([(1, "hamlet", 1, "Loving and loved.")], {})
+    monkeypatch.setattr(concordance, "index", index)
+    response = await client.get("/shakespeare/related", params=params)
+    assert response.json()["source"] == "memory"
+    assert response.json()["code"] == code
@@ -1,13 +1,20 @@
+import io
+from uuid import uuid4
+
+import orjson
+import pyarrow.parquet as pq
 import pytest
-from dirty_equals import IsUUID
+from dirty_equals import IsStr, IsUUID
 from fastapi import status
 from httpx import AsyncClient
 from inline_snapshot import snapshot
 from polyfactory.factories.pydantic_factory import ModelFactory
+from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.models import Stuff
+from app.models import Nonsense, Stuff, StuffFullOfNonsense
 from app.schemas.stuff import StuffSchema
+from app.utils.pagination import encode_cursor
 
 pytestmark = pytest.mark.anyio
 
@@ -65,6 +72,32 @@ async def test_delete_stuff(client: AsyncClient):
     response = await client.delete(f"/stuff/{name}")
     assert response.status_code == status.HTTP_200_OK
     assert response.json() == snapshot(True)
+    response = await client.delete(f"/stuff/{name}")
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+
+
+async def test_delete_stuff_with_nonsense(
+    client: AsyncClient, db_session: AsyncSession
+):
+    stuff = Stuff(**StuffFactory.build(factory_use_constructors=True).model_dump())
+    nonsense = Nonsense(id=uuid4(), name=uuid4().hex, description="why not")
+    db_session.add_all([stuff, nonsense])
+    await db_session.flush()
+    db_session.add(
+        StuffFullOfNonsense(stuff_id=stuff.id, nonsense_id=nonsense.id, but_why="yes")
+    )
+    await db_session.commit()
+    name = stuff.name
+
+    response = await client.delete(f"/stuff/{name}")
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json() == snapshot(True)
+    links = await db_session.scalars(
+        select(StuffFullOfNonsense).where(
+            StuffFullOfNonsense.nonsense_id == nonsense.id
+        )
+    )
+    assert links.all() == []
 
 
 async def test_update_stuff(client: AsyncClient):
@@ -90,3 +123,151 @@ async def test_update_stuff(client: AsyncClient):
         }
     )
     assert response.status_code == status.HTTP_200_OK
+
+
+async def test_add_many_stuff(client: AsyncClient):
+    stuff = [
+        StuffFactory.build(factory_use_constructors=True).model_dump(mode="json")
+        for _ in range(3)
+    ]
+    payload = [*stuff, {"name": "no description"}, stuff[0]]
+    response = await client.post("/stuff/add_many", json=payload)
+    assert response.status_code == status.HTTP_201_CREATED
+    assert response.json() == snapshot(
+        {
+            "inserted": 3,
+            "rejected": [
+                {
+                    "index": 3,
+                    "key": "no description",
+                    "reason": "description: Field required",
+                },
+                {
+                    "index": 4,
+                    "key": stuff[0]["name"],
+                    "reason": "duplicate name in payload",
+                },
+            ],
+        }
+    )
+    response = await client.post("/stuff/add_many", json=stuff[:1])
+    assert response.json() == snapshot(
+        {
+            "inserted": 0,
+            "rejected": [
+                {
+                    "index": 0,
+                    "key": stuff[0]["name"],
+                    "reason": "name already exists in happy_hog.stuff",
+                }
+            ],
+        }
+    )
+
+
+async def test_ingest_stuff_ndjson(client: AsyncClient):
+    stuff = [
+        StuffFactory.build(factory_use_constructors=True).model_dump(mode="json")
+        for _ in range(5)
+    ]
+    lines = [orjson.dumps(item) for item in stuff]
+    lines.insert(2, b"{not json")
+    lines.insert(4, b"")
+    lines.append(orjson.dumps({"name": "no description"}))
+    response = await client.post(
+        "/stuff/ingest",
+        params={"batch_size": 2},
+        content=b"\n".join(lines),
+        headers={"Content-Type": "application/x-ndjson"},
+    )
+    assert response.status_code == status.HTTP_201_CREATED
+    assert response.json() == snapshot(
+        {
+            "inserted": 5,
+            "rejected": [
+                {"index": 3, "key": None, "reason": IsStr(regex="invalid JSON.*")},
+                {
+                    "index": 8,
+                    "key": "no description",
+                    "reason": "description: Field required",
+                },
+            ],
+            "lines": 8,
+            "batches": 3,
+        }
+    )
+
+    response = await client.post("/stuff/ingest", json=stuff)
+    assert response.status_code == status.HTTP_415_UNSUPPORTED_MEDIA_TYPE
+
+
+async def test_list_stuff_pages(client: AsyncClient):
+    prefix = str(uuid4())
+    stuff = [{"name": f"{prefix}-{i}", "description": f"page {i}"} for i in range(3)]
+    await client.post("/stuff/add_many", json=stuff)
+
+    response = await client.get(
+        "/stuff/page", params={"cursor": encode_cursor(prefix), "limit": 2}
+    )
+    assert response.status_code == status.HTTP_200_OK
+    page = response.json()
+    assert [item["name"] for item in page["items"]] == [
+        stuff[0]["name"],
+        stuff[1]["name"],
+    ]
+    assert page["next_cursor"] == IsStr()
+
+    response = await client.get(
+        "/stuff/page", params={"cursor": page["next_cursor"], "limit": 2}
+    )
+    assert response.json()["items"][0] == snapshot(
+        {"id": IsUUID(4), "name": stuff[2]["name"], "description": "page 2"}
+    )
+
+    response = await client.get("/stuff/page", params={"cursor": "not a cursor"})
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+async def test_stuff_cache_invalidation(client: AsyncClient):
+    stuff = StuffFactory.build(factory_use_constructors=True).model_dump(mode="json")
+    await client.post("/stuff", json=stuff)
+    name = stuff["name"]
+    response = await client.get(f"/stuff/{name}")
+    assert response.json()["description"] == stuff["description"]
+
+    await client.patch(
+        f"/stuff/{name}", json={"name": name, "description": "cache is stale"}
+    )
+    response = await client.get(f"/stuff/{name}")
+    assert response.json()["description"] == "cache is stale"
+
+    await client.delete(f"/stuff/{name}")
+    response = await client.get(f"/stuff/{name}")
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+
+
+async def test_export_stuff_parquet(client: AsyncClient):
+    # The export reads through the shared pool, outside the test's rolled back transaction
+    response = await client.get(
+        "/stuff/export/parquet",
+        params={"columns": ["name", "description"], "filter": "name:like:string%"},
+    )
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers["content-type"] == "application/vnd.apache.parquet"
+    table = pq.read_table(io.BytesIO(response.content))
+    assert table.column_names == ["name", "description"]
+
+    response = await client.get("/stuff/export/csv", params={"columns": "unknown"})
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+
+async def test_autocomplete_stuff_is_cached(client: AsyncClient):
+    prefix = f"auto-{uuid4().hex}"
+    for _ in range(2):
+        response = await client.get("/stuff/autocomplete", params={"prefix": prefix})
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json() == snapshot([])
+
+    response = await client.get("/public/health/cache")
+    stats = {cache["namespace"]: cache for cache in response.json()["caches"]}
+    assert stats["stuff.autocomplete"]["hits"] >= 1
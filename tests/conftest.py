@@ -6,10 +6,18 @@ from httpx import ASGITransport, AsyncClient
 from sqlalchemy import text
 from sqlalchemy.exc import ProgrammingError
 
-from app.database import TestAsyncSessionFactory, engine, get_db, test_engine
+from app.database import (
+    DriverPool,
+    TestAsyncSessionFactory,
+    engine,
+    get_db,
+    get_primary_db,
+    get_read_db,
+    test_engine,
+)
 from app.main import app
 from app.models.base import Base
-from app.redis import get_redis
+from app.redis import get_cache, get_redis
 
 
 @pytest.fixture(
@@ -38,6 +46,8 @@ def _create_db_schema(conn) -> None:
         """Create a database schema if it doesn't exist."""
         conn.execute(text("CREATE SCHEMA IF NOT EXISTS happy_hog"))
         conn.execute(text("CREATE SCHEMA IF NOT EXISTS shakespeare"))
+        conn.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+        conn.execute(text("CREATE EXTENSION IF NOT EXISTS fuzzystrmatch"))
     except ProgrammingError:
         # This might be raised by databases that don't support `IF NOT EXISTS`
         # and the schema already exists. You can choose to ignore it.
@@ -95,5 +105,9 @@ async def client(db_session) -> AsyncGenerator[AsyncClient, Any]:
         transport=transport,
     ) as test_client:
         app.dependency_overrides[get_db] = override_get_db
+        app.dependency_overrides[get_read_db] = override_get_db
+        app.dependency_overrides[get_primary_db] = override_get_db
         app.redis = await get_redis()
+        app.cache = await get_cache()
+        app.postgres_pool = DriverPool(test_engine)
         yield test_client
@@ -0,0 +1,37 @@
+import asyncio
+
+import pytest
+from redis.exceptions import ConnectionError
+
+from app.services.cache import PrefixCache, stuff_cache
+
+pytestmark = pytest.mark.anyio
+
+
+class DownRedis:
+    async def delete(self, *keys):
+        raise ConnectionError("Redis is down")
+
+
+async def test_invalidate_survives_redis_errors():
+    await stuff_cache.invalidate(DownRedis(), "deleted")
+
+
+async def test_prefix_load_outlives_a_cancelled_initiator():
+    cache = PrefixCache(namespace="test", ttl=60, size=8)
+    released = asyncio.Event()
+
+    async def loader():
+        await released.wait()
+        return [{"name": "Hamlet"}]
+
+    initiator = asyncio.create_task(cache.get_or_load("Ham", 5, loader))
+    await asyncio.sleep(0)
+    waiter = asyncio.create_task(cache.get_or_load("ham", 5, loader))
+    await asyncio.sleep(0)
+    initiator.cancel()
+    await asyncio.sleep(0)
+    released.set()
+    assert await waiter == [{"name": "Hamlet"}]
+    assert initiator.cancelled()
+    assert cache.stats()["hits"] == 1
@@ -0,0 +1,67 @@
+from app.services.concordance import Concordance
+
+PARAGRAPHS = [
+    (1, "hamlet", 1, "To be, or not to be: that is the question."),
+    (2, "hamlet", 2, "Whether 'tis nobler in the mind to suffer"),
+    (3, "macbeth", 1, "To-morrow, and to-morrow, and to-morrow."),
+    (4, "macbeth", 2, "O worthiest cousin! Most noble Macbeth!"),
+]
+WORDFORMS = {"nobler": "nobl", "noble": "nobl"}
+
+
+def test_frequency_and_stems():
+    index = Concordance.build(PARAGRAPHS, WORDFORMS)
+    assert index.frequency("TO") == {
+        "word": "TO",
+        "forms": [{"form": "to", "count": 6}],
+        "count": 6,
+        "paragraphs": 3,
+    }
+    assert index.frequency("noble")["count"] == 1
+    assert index.frequency("noble", stem=True)["forms"] == [
+        {"form": "nobler", "count": 1},
+        {"form": "noble", "count": 1},
+    ]
+
+
+def test_concordance_lines():
+    index = Concordance.build(PARAGRAPHS, WORDFORMS)
+    total, lines = index.concordance("be", width=7, limit=1, offset=1)
+    assert total == 2
+    assert lines == [
+        {
+            "paragraph_id": 1,
+            "work_id": "hamlet",
+            "paragraph_num": 1,
+            "left": "not to",
+            "keyword": "be",
+            "right": ": that",
+        }
+    ]
+
+
+def test_cooccurrence_stays_in_paragraph(tmp_path):
+    Concordance.build(PARAGRAPHS, WORDFORMS).save(tmp_path)
+    index = Concordance.load(tmp_path)
+    assert index.source == "loaded"
+    assert index.cooccurrence("question", window=2, skip_top=0) == [
+        {"form": "is", "count": 1},
+        {"form": "the", "count": 1},
+    ]
+    assert index.cooccurrence("suffer", window=3, skip_top=0) == [
+        {"form": "the", "count": 1},
+        {"form": "mind", "count": 1},
+        {"form": "to", "count": 1},
+    ]
+
+
+def test_save_publishes_whole_builds(tmp_path):
+    first = Concordance.build(PARAGRAPHS, WORDFORMS)
+    first.save(tmp_path)
+    mapped = Concordance.load(tmp_path)
+    Concordance.build(PARAGRAPHS[:2], WORDFORMS).save(tmp_path)
+    Concordance.build(PARAGRAPHS[:1], WORDFORMS).save(tmp_path)
+    # The previous build is kept for workers still loading it, older ones are removed
+    assert len(list(tmp_path.glob("build-*"))) == 2
+    assert Concordance.load(tmp_path).paragraphs.num_rows == 1
+    assert mapped.frequency("to")["count"] == 6
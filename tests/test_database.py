@@ -0,0 +1,87 @@
+import pytest
+
+from app.database import (
+    CHECKED_OUT_AT,
+    ReplicaRouter,
+    RouteCheckoutStats,
+    route_checkout_stats,
+    session_scope,
+)
+
+pytestmark = pytest.mark.anyio
+
+
+class FakeSession:
+    def __init__(self, name: str, healthy: bool = True):
+        self.name = name
+        self.healthy = healthy
+        self.closed = False
+        self.committed = False
+        self.info = {}
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    async def commit(self):
+        self.committed = True
+
+    async def connection(self):
+        if not self.healthy:
+            raise OSError("connection refused")
+
+    async def close(self):
+        self.closed = True
+
+
+async def test_replica_router_round_robin_and_failover():
+    health = {"replica-0": True, "replica-1": True}
+
+    def factory(name):
+        return lambda: FakeSession(name, health[name])
+
+    router = ReplicaRouter(
+        primary=lambda: FakeSession("primary"),
+        replicas=[factory("replica-0"), factory("replica-1")],
+    )
+    names = [(await router.read_session()).name for _ in range(3)]
+    assert names == ["replica-0", "replica-1", "replica-0"]
+
+    health["replica-1"] = False
+    names = [(await router.read_session()).name for _ in range(3)]
+    assert names == ["replica-0", "replica-0", "replica-0"]
+
+    health["replica-0"] = False
+    router.down_until.clear()
+    assert (await router.read_session()).name == "primary"
+
+
+async def test_session_scope_skips_commit_for_read_only_and_records_hold():
+    route = "GET /test/session_scope"
+    session = FakeSession("primary")
+    async with session_scope(session, route, read_only=True):
+        pass
+    assert (session.committed, session.closed) == (False, True)
+    assert route_checkout_stats.summary()[route] == {
+        "sessions": 1,
+        "checkouts": 0,
+        "samples": 0,
+    }
+
+    session = FakeSession("primary")
+    async with session_scope(session, route) as db_session:
+        db_session.info[CHECKED_OUT_AT] = 0.0
+    assert session.committed
+    assert route_checkout_stats.summary()[route]["checkouts"] == 1
+
+
+def test_route_checkout_stats_summary():
+    stats = RouteCheckoutStats()
+    for seconds in (0.001, 0.002, None):
+        stats.record("GET /v1/stuff/{name}", seconds)
+    summary = stats.summary()["GET /v1/stuff/{name}"]
+    assert summary["sessions"] == 3
+    assert summary["checkouts"] == 2
+    assert summary["hold_ms_max"] == 2.0
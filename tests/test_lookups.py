@@ -0,0 +1,42 @@
+from app.services.lookups import ShakespeareCatalog
+
+CHARACTERS = [
+    {"id": "citizen1-cor", "name": "First Citizen", "abbrev": None, "speech_count": 9},
+    {"id": "citizen1-jc", "name": "First Citizen", "abbrev": None, "speech_count": 4},
+    {"id": "hamlet", "name": "Hamlet", "abbrev": "Ham", "speech_count": 358},
+]
+WORKS = [
+    {
+        "id": "hamlet",
+        "title": "Hamlet",
+        "long_title": "Tragedy of Hamlet, Prince of Denmark, The",
+        "year": 1600,
+        "genre_type": "t",
+    }
+]
+
+
+def test_catalog_maps_names_to_every_id():
+    catalog = ShakespeareCatalog.from_rows(CHARACTERS, WORKS)
+    assert catalog.character_ids["First Citizen"] == ("citizen1-cor", "citizen1-jc")
+    assert catalog.character_ids["Hamlet"] == ("hamlet",)
+    assert "Nobody" not in catalog.character_ids
+
+
+def test_catalog_enriches_page_rows():
+    catalog = ShakespeareCatalog.from_rows(CHARACTERS, WORKS)
+    enriched = catalog.enrich(
+        [{"work_id": "hamlet", "paragraph_num": 1, "character_id": "hamlet"}]
+    )
+    assert enriched["characters"] == {
+        "hamlet": {
+            "id": "hamlet",
+            "name": "Hamlet",
+            "abbrev": "Ham",
+            "speech_count": 358,
+        }
+    }
+    assert enriched["works"]["hamlet"]["year"] == 1600
+    assert (
+        catalog.enrich([{"work_id": "hamlet", "paragraph_num": 1}])["characters"] == {}
+    )
@@ -0,0 +1,50 @@
+import pytest
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.base import Base
+from app.services.seed import deferred_ddl, read_dump
+
+
+def test_read_dump_converts_inserts_to_copy_text(tmp_path):
+    path = tmp_path / "shakespeare_work.sql"
+    path.write_text(
+        "insert into shakespeare.work (id, title, long_title, year, genre_type, notes, "
+        "source, total_words, total_paragraphs)\n"
+        "values  ('winterstale', 'The Winter''s Tale', 'The Winter''s Tale', 1610, "
+        "'c', null, 'Moby', 24914, 812),\n"
+        "        ('sonnets', 'Sonnets', 'Sonnets', 1609, 's', 'tab\there\nline', "
+        "'Moby', 17515, 154);\n"
+    )
+    dump = read_dump(path)
+    assert dump.target == "shakespeare.work"
+    assert dump.rows == 2
+    assert dump.payload.decode().splitlines() == [
+        "winterstale\tThe Winter's Tale\tThe Winter's Tale\t1610\tc\t\\N\tMoby\t24914\t812",
+        "sonnets\tSonnets\tSonnets\t1609\ts\ttab\\there\\nline\tMoby\t17515\t154",
+    ]
+
+
+def test_read_dump_rejects_unknown_tables(tmp_path):
+    path = tmp_path / "shakespeare_poem.sql"
+    path.write_text("insert into shakespeare.poem (id) values (1);\n")
+    with pytest.raises(ValueError, match="unknown table"):
+        read_dump(path)
+
+
+@pytest.mark.anyio
+async def test_deferred_ddl_runs_under_the_stats_views(db_session: AsyncSession):
+    # The materialized views exist: they are created with the metadata
+    tables = [
+        Base.metadata.tables[f"shakespeare.{name}"]
+        for name in ("chapter", "character", "character_work", "wordform", "work")
+    ]
+    drop, build, link = deferred_ddl(tables)
+    for statement in drop:
+        await db_session.execute(text(statement))
+    for statements in build.values():
+        for statement in statements.values():
+            await db_session.execute(text(statement))
+    for statement in link.values():
+        await db_session.execute(text(statement))
+    await db_session.rollback()